@@ -0,0 +1,43 @@
+"""Add result_path and dedup_key to jobs for spooled deduplicated exports
+
+Revision ID: c3b7e41d9a06
+Revises: a8d5e0c3f172
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c3b7e41d9a06"
+down_revision = "a8d5e0c3f172"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("result_path", sa.String(length=500), nullable=True))
+    op.add_column("jobs", sa.Column("dedup_key", sa.String(length=64), nullable=True))
+    op.create_index(
+        "ix_jobs_dedup",
+        "jobs",
+        ["user_id", "kind", "dedup_key"],
+        unique=False,
+        postgresql_where=sa.text("dedup_key IS NOT NULL"),
+    )
+    op.create_index(
+        "ux_jobs_dedup_pending",
+        "jobs",
+        ["user_id", "kind", "dedup_key"],
+        unique=True,
+        postgresql_where=sa.text("dedup_key IS NOT NULL AND status IN ('QUEUED', 'RUNNING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_jobs_dedup_pending", table_name="jobs")
+    op.drop_index("ix_jobs_dedup", table_name="jobs")
+    op.drop_column("jobs", "dedup_key")
+    op.drop_column("jobs", "result_path")
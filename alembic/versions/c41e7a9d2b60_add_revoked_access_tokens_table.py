@@ -0,0 +1,65 @@
+"""Add revoked access tokens table
+
+Revision ID: c41e7a9d2b60
+Revises: 98927c5112d8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c41e7a9d2b60"
+down_revision = "98927c5112d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_access_tokens",
+        sa.Column("token_jti", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_revoked_access_tokens_id"), "revoked_access_tokens", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_revoked_access_tokens_token_jti"),
+        "revoked_access_tokens",
+        ["token_jti"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_revoked_access_tokens_user_id"),
+        "revoked_access_tokens",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_revoked_access_tokens_expires_at"),
+        "revoked_access_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_revoked_access_tokens_expires_at"), table_name="revoked_access_tokens")
+    op.drop_index(op.f("ix_revoked_access_tokens_user_id"), table_name="revoked_access_tokens")
+    op.drop_index(op.f("ix_revoked_access_tokens_token_jti"), table_name="revoked_access_tokens")
+    op.drop_index(op.f("ix_revoked_access_tokens_id"), table_name="revoked_access_tokens")
+    op.drop_table("revoked_access_tokens")
@@ -0,0 +1,33 @@
+"""Add data_version to users and groups
+
+Revision ID: d7a3f19c8e42
+Revises: c41e7a9d2b60
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d7a3f19c8e42"
+down_revision = "c41e7a9d2b60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "groups",
+        sa.Column("data_version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "data_version")
+    op.drop_column("users", "data_version")
@@ -0,0 +1,44 @@
+"""Add group_balances table
+
+Revision ID: e2b8c4d61f09
+Revises: d7a3f19c8e42
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e2b8c4d61f09"
+down_revision = "d7a3f19c8e42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "group_balances",
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("paid", sa.Numeric(14, 2), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("group_id", "user_id"),
+    )
+    # Начальные суммы - из уже существующих расходов групп
+    op.execute(
+        """
+        INSERT INTO group_balances (group_id, user_id, paid)
+        SELECT t.transaction_to_group, t.user_id, sum(round(t.amount::numeric, 2))
+        FROM transactions t
+        JOIN groups g ON g.id = t.transaction_to_group
+        WHERE t.type = 'EXPENSE'
+        GROUP BY t.transaction_to_group, t.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("group_balances")
@@ -0,0 +1,50 @@
+"""Add group foreign key and feed index to transactions
+
+Revision ID: f4a91c3e7b25
+Revises: e2b8c4d61f09
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f4a91c3e7b25"
+down_revision = "e2b8c4d61f09"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Транзакции удалённых групп отвязываются от группы, иначе внешний ключ не создать
+    op.execute(
+        """
+        UPDATE transactions t SET transaction_to_group = NULL
+        WHERE t.transaction_to_group IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM groups g WHERE g.id = t.transaction_to_group)
+        """
+    )
+    op.create_foreign_key(
+        "fk_transactions_transaction_to_group_groups",
+        "transactions",
+        "groups",
+        ["transaction_to_group"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index(
+        "ix_transactions_group_created_id",
+        "transactions",
+        ["transaction_to_group", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("transaction_to_group IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transactions_group_created_id", table_name="transactions")
+    op.drop_constraint(
+        "fk_transactions_transaction_to_group_groups", "transactions", type_="foreignkey"
+    )
@@ -0,0 +1,116 @@
+"""
+Прерывание тяжёлых запросов по таймауту и при отключении клиента.
+
+Endpoint помечается классом маршрута (request_timeout("report")), и его обработчик
+выполняется в группе задач вместе с наблюдателем за отключением клиента. Отмена
+доходит до ожидающего SQL запроса - asyncpg отправляет серверу запрос на отмену,
+а SQLAlchemy закрывает прерванное соединение и освобождает место в пуле, -
+и до отрисовки диаграммы, ожидающей свободного потока. Сессии чтения таких
+маршрутов получают statement_timeout того же класса (app/core/db.py), поэтому
+сервер прекращает запрос и сам, если отмена до него не дошла.
+"""
+
+from typing import Any, Awaitable, Callable, Coroutine
+
+import anyio
+from fastapi import Request, Response
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.exceptions import RequestTimeoutException
+from app.core.metrics import HTTP_REQUESTS_CANCELLED
+
+# Атрибут endpoint'а с классом маршрута для выбора таймаута
+REQUEST_TIMEOUT_ATTR = "__request_timeout_class__"
+
+# Код ответа для запроса, клиент которого отключился (ответ никто не получит,
+# код нужен для логов и метрик)
+CLIENT_CLOSED_REQUEST = 499
+
+# Наблюдать за отключением можно только у запросов без тела: тело читает endpoint
+_BODYLESS_METHODS = frozenset({"GET", "HEAD"})
+
+# SQLSTATE запроса, отменённого сервером по statement_timeout
+QUERY_CANCELED = "57014"
+
+
+def request_timeouts() -> dict[str, float]:
+    """Предельное время обработки по классам маршрутов"""
+    return {
+        "report": settings.REQUEST_TIMEOUT_REPORT_SECONDS,
+        "export": settings.REQUEST_TIMEOUT_EXPORT_SECONDS,
+    }
+
+
+def route_timeout(request: Request) -> float | None:
+    """Предельное время обработки маршрута запроса (None - без ограничения)"""
+    timeout_class = getattr(request.scope.get("endpoint"), REQUEST_TIMEOUT_ATTR, None)
+    if timeout_class is None:
+        return None
+    return request_timeouts()[timeout_class] or None
+
+
+def request_timeout(timeout_class: str) -> Callable[[Any], Any]:
+    """Пометить endpoint классом маршрута: report или export"""
+    if timeout_class not in request_timeouts():
+        raise ValueError(f"Неизвестный класс маршрута: {timeout_class}")
+
+    def decorator(endpoint: Any) -> Any:
+        setattr(endpoint, REQUEST_TIMEOUT_ATTR, timeout_class)
+        return endpoint
+
+    return decorator
+
+
+async def run_cancellable(
+    request: Request, call: Callable[[], Awaitable[Response]], timeout: float | None
+) -> Response:
+    """
+    Выполнить обработчик запроса, прервав его по истечении timeout секунд
+    или при отключении клиента.
+    """
+    response: Response | None = None
+    disconnected = False
+
+    async with anyio.create_task_group() as task_group:
+
+        async def watch_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message = await request.receive()
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    task_group.cancel_scope.cancel()
+                    return
+
+        if request.method in _BODYLESS_METHODS:
+            task_group.start_soon(watch_disconnect)
+
+        with anyio.move_on_after(timeout):
+            try:
+                response = await call()
+            except DBAPIError as e:
+                if getattr(e.orig, "sqlstate", None) != QUERY_CANCELED:
+                    raise
+                # Сервер прервал запрос по statement_timeout раньше срока запроса
+        task_group.cancel_scope.cancel()
+
+    if response is not None:
+        return response
+    if disconnected:
+        HTTP_REQUESTS_CANCELLED.labels("disconnect").inc()
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    HTTP_REQUESTS_CANCELLED.labels("timeout").inc()
+    raise RequestTimeoutException()
+
+
+def cancellable_handler(
+    handler: Callable[[Request], Awaitable[Response]], timeout_class: str
+) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+    """Обернуть обработчик маршрута в run_cancellable с таймаутом класса маршрута"""
+
+    async def cancellable(request: Request) -> Response:
+        timeout = request_timeouts()[timeout_class]
+        return await run_cancellable(request, lambda: handler(request), timeout or None)
+
+    return cancellable
@@ -0,0 +1,249 @@
+"""
+Сжатие ответов (gzip, brotli - если установлен пакет brotli)
+"""
+
+import zlib
+from typing import Any, Iterable, Protocol
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.timing import span
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - brotli - необязательная зависимость
+    brotli = None
+
+# Атрибут endpoint'а, которым помечаются маршруты, ответы которых не сжимаются
+SKIP_COMPRESSION_ATTR = "__skip_compression__"
+
+# Типы содержимого, которые уже сжаты или сжимаются плохо
+INCOMPRESSIBLE_TYPES = (
+    b"image/",
+    b"audio/",
+    b"video/",
+    b"application/zip",
+    b"application/gzip",
+    b"application/octet-stream",
+)
+
+
+def skip_compression(endpoint: Any) -> Any:
+    """Отключить сжатие ответов endpoint'а"""
+    setattr(endpoint, SKIP_COMPRESSION_ATTR, True)
+    return endpoint
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    """Разобрать заголовок Accept-Encoding в словарь {кодировка: q}"""
+    result: dict[str, float] = {}
+    for part in value.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        result[coding] = quality
+    return result
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    def finish(self) -> bytes:
+        ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits=31 - формат gzip (заголовок и CRC32)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(self._compressor.process(data))
+
+    def finish(self) -> bytes:
+        return bytes(self._compressor.finish())
+
+
+class CompressionMiddleware:
+    """
+    Middleware для сжатия ответов по заголовку Accept-Encoding.
+
+    Чистый ASGI: тело сжимается потоково, по мере отправки фрагментов, без
+    буферизации всего ответа. Ответы меньше minimum_size, уже сжатые ответы,
+    изображения и маршруты, помеченные skip_compression, отдаются как есть.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._select_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def _select_encoding(self, scope: Scope) -> str | None:
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        if not accept_encoding:
+            return None
+
+        accepted = parse_accept_encoding(accept_encoding)
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+        best: str | None = None
+        best_quality = 0.0
+        for coding in candidates:
+            quality = accepted.get(coding, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def create_compressor(self, encoding: str) -> _Compressor:
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressionResponder:
+    """Состояние сжатия одного ответа"""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, scope: Scope, send: Send, encoding: str
+    ) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = send
+        self.encoding = encoding
+        self.start_message: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if not self._should_compress(message):
+                self.passthrough = True
+                await self.downstream(message)
+                return
+            # Заголовки отправляем вместе с первым непустым фрагментом тела,
+            # когда станет понятно, превышает ли ответ порог
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start_message is None:
+            # Заголовки уже отправлены, сжимаем следующие фрагменты тела
+            assert self.compressor is not None
+            data = self.compressor.compress(body)
+            if not more_body:
+                data += self.compressor.finish()
+            if data or not more_body:
+                await self.downstream(
+                    {"type": "http.response.body", "body": data, "more_body": more_body}
+                )
+            return
+
+        if not body and more_body:
+            return
+
+        start_message, self.start_message = self.start_message, None
+        headers = start_message.get("headers", [])
+
+        if not more_body and len(body) < self.middleware.minimum_size:
+            self.passthrough = True
+            start_message["headers"] = _with_vary(headers)
+            await self.downstream(start_message)
+            await self.downstream(message)
+            return
+
+        with span("compress"):
+            self.compressor = self.middleware.create_compressor(self.encoding)
+            data = self.compressor.compress(body)
+            if not more_body:
+                data += self.compressor.finish()
+
+        headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+        headers.append((b"content-encoding", self.encoding.encode()))
+        if not more_body:
+            headers.append((b"content-length", str(len(data)).encode()))
+        start_message["headers"] = _with_vary(headers)
+        await self.downstream(start_message)
+        await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _should_compress(self, message: Message) -> bool:
+        status_code = message["status"]
+        if status_code < 200 or status_code in (204, 205, 206, 304):
+            return False
+        if getattr(self.scope.get("endpoint"), SKIP_COMPRESSION_ATTR, False):
+            return False
+        for name, value in message.get("headers", []):
+            name = name.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type" and value.lower().startswith(INCOMPRESSIBLE_TYPES):
+                return False
+        return True
+
+
+def _with_vary(headers: Iterable[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    """Добавить Accept-Encoding в заголовок Vary"""
+    result = []
+    found = False
+    for name, value in headers:
+        if name.lower() == b"vary":
+            found = True
+            if b"accept-encoding" not in value.lower():
+                value = value + b", Accept-Encoding"
+        result.append((name, value))
+    if not found:
+        result.append((b"vary", b"Accept-Encoding"))
+    return result
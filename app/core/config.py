@@ -1,7 +1,8 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator, Field
-from typing import List, Union, Any
+from typing import List, Literal, Union, Any
 import json
+import tempfile
 from pathlib import Path
 
 
@@ -53,6 +54,38 @@ class Settings(BaseSettings):
             )
         return str(v_str)  # type: ignore[no-any-return]
 
+    # Реплика для чтения (необязательно). Чтение уходит на основную БД, если реплика
+    # недоступна или отстаёт больше чем на DATABASE_READ_MAX_LAG_SECONDS
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_READ_CHECK_SECONDS: float = 5.0
+
+    @field_validator("DATABASE_READ_URL", mode="before")
+    @classmethod
+    def validate_database_read_url(cls, v: Any) -> str | None:
+        """Проверка формата DATABASE_READ_URL, если он задан"""
+        if v is None or (isinstance(v, str) and not v.strip()):
+            return None
+        v_str = str(v).strip()
+        if not v_str.startswith("postgresql+asyncpg://"):
+            raise ValueError(
+                "DATABASE_READ_URL должен начинаться с 'postgresql+asyncpg://'. "
+                f"Получено: {v_str[:50]}..."
+            )
+        return v_str
+
+    # Профиль движка БД (см. app/core/db_profiles.py) и точечные переопределения его параметров
+    DB_PROFILE: Literal["dev", "prod", "benchmark"] = "dev"
+    DB_ECHO: bool | None = None
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float | None = None
+    DB_POOL_RECYCLE: int | None = None
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int | None = None
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
+    DB_JIT: bool | None = None
+    DB_POOL_WARMUP: int | None = None
+
     # CORS
     CORS_ORIGINS: Union[str, List[str]] = "http://localhost:3000,http://localhost:8000"
 
@@ -103,6 +136,93 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Отзыв access токенов: список хранится в памяти каждого воркера
+    # и подгружается из таблицы revoked_access_tokens с указанным интервалом
+    ACCESS_TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    ACCESS_TOKEN_REVOCATION_CAPACITY: int = 100_000
+
+    # Кэш членства в группах в памяти воркера: изменения, сделанные другими воркерами,
+    # становятся видны не позже чем через MEMBERSHIP_CACHE_TTL_SECONDS
+    MEMBERSHIP_CACHE_TTL_SECONDS: float = 10.0
+    MEMBERSHIP_CACHE_CAPACITY: int = 100_000
+
+    # Ограничение попыток входа (token bucket в памяти воркера)
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 30
+    LOGIN_RATE_LIMIT_IP_BURST: int = 20
+    LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE: float = 5
+    LOGIN_RATE_LIMIT_USERNAME_BURST: int = 5
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100_000
+    # Адреса обратных прокси, которым доверяется X-Forwarded-For: за ними лимит по IP
+    # считается по адресу клиента из заголовка, а не по адресу прокси (через запятую)
+    TRUSTED_PROXIES: Union[str, List[str]] = ""
+
+    @field_validator("TRUSTED_PROXIES", mode="before")
+    @classmethod
+    def parse_trusted_proxies(cls, v: Any) -> List[str]:
+        """Парсинг TRUSTED_PROXIES из строки через запятую или списка"""
+        if isinstance(v, str):
+            return [address.strip() for address in v.split(",") if address.strip()]
+        return list(v or [])
+
+    # Сжатие ответов (brotli используется, если установлен пакет brotli)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Доля запросов (0..1), для которых добавляется заголовок Server-Timing; 0 - выключено
+    SERVER_TIMING_SAMPLE_RATE: float = 0.0
+
+    # Режим отладки: число SQL запросов в заголовках ответа и в логе, поиск N+1
+    DEBUG: bool = False
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Метрики в формате Prometheus на /metrics (каждый воркер отдаёт свои значения
+    # с меткой worker). METRICS_TOKEN - Bearer токен для доступа к /metrics
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str | None = None
+
+    # Предельное время обработки тяжёлых запросов по классам маршрутов
+    # (app/core/cancellation.py): report - аналитика и диаграммы, export - выгрузка транзакций
+    REQUEST_TIMEOUT_REPORT_SECONDS: float = 15.0
+    REQUEST_TIMEOUT_EXPORT_SECONDS: float = 60.0
+
+    # Максимум одновременных операций argon2 в пуле потоков
+    PASSWORD_HASH_MAX_THREADS: int = 4
+
+    # Импортировать matplotlib и построить кэш шрифтов в фоне при старте воркера,
+    # а не при первом запросе диаграммы
+    CHART_WARMUP_ON_STARTUP: bool = False
+
+    # Фоновые задачи (app/modules/jobs): исполнителей в каждом процессе приложения
+    # (0 - процесс только ставит задачи в очередь), опрос очереди, время захвата задачи
+    # воркером, после которого она возвращается в очередь, повторы с экспоненциальной
+    # задержкой и хранение завершённых задач с результатами
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_SECONDS: float = 300.0
+    JOB_REAP_INTERVAL_SECONDS: float = 30.0
+    JOB_RETENTION_HOURS: int = 24
+
+    # Выгрузки транзакций (POST /transactions/exports): каталог файлов на локальном диске
+    # процесса и срок их хранения; выгрузка с теми же фильтрами и данными в течение срока
+    # отдаёт уже готовый файл
+    EXPORT_SPOOL_DIR: str = str(Path(tempfile.gettempdir()) / "smart-spend-exports")
+    EXPORT_TTL_HOURS: int = 6
+
+    # Production запуск через gunicorn (gunicorn.conf.py)
+    WEB_BIND: str = "0.0.0.0:8000"
+    # Число воркеров; 0 - по числу доступных процессу CPU
+    WEB_CONCURRENCY: int = 0
+    # Перезапуск воркера после стольких запросов (плюс случайная добавка до jitter,
+    # чтобы воркеры не перезапускались одновременно), ограничивает рост памяти; 0 - выключено
+    WEB_MAX_REQUESTS: int = 10_000
+    WEB_MAX_REQUESTS_JITTER: int = 1_000
+    # Сколько ждать завершения текущих запросов после SIGTERM, с
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = 30
+
 
 def _check_env_file_exists() -> None:
     """Проверка наличия обязательного файла .env"""
@@ -2,9 +2,12 @@
 Инициализация ядра приложения
 """
 
+import asyncio
+from contextlib import AsyncExitStack
+
 from sqlalchemy import text
 
-from app.core.db import engine
+from app.core.db import engine, engine_profile
 from app.core.config import settings, Settings
 
 
@@ -20,6 +23,21 @@ async def init_db() -> None:
         await conn.execute(text("SELECT 1"))
 
 
+async def warm_up_pool() -> None:
+    """
+    Открыть pool_warmup соединений профиля одновременно в пуле основной БД
+    и вернуть их в пул. Сессии чтения GET и HEAD берут соединения из того же пула.
+
+    Вызывается при старте каждого воркера: соединения, унаследованные от мастера
+    gunicorn, использовать нельзя, а первые запросы не должны ждать подключения.
+    """
+    connections = min(engine_profile.pool_warmup, engine_profile.pool_size)
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+
+
 def get_settings() -> Settings:
     """Получение настроек приложения"""
     return settings
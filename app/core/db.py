@@ -1,16 +1,71 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator
 
+from fastapi import Request
+from sqlalchemy import Connection, event, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from app.core.cancellation import route_timeout
 from app.core.config import settings
+from app.core.db_profiles import resolve_engine_profile
+from app.core.metrics import DB_POOL_WAIT
+
+
+class _TimedAsyncAdaptedQueue(AsyncAdaptedQueue[Any]):
+    """Очередь свободных соединений пула, замеряющая ожидание соединения"""
+
+    def get(self, block: bool = True, timeout: float | None = None) -> Any:
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, замеряющий время ожидания свободного соединения.
+
+    Замеряется только ожидание в очереди пула: установка нового соединения
+    (при незаполненном пуле или сверх pool_size) в метрику не попадает.
+    """
+
+    _queue_class = _TimedAsyncAdaptedQueue
+
+
+# Параметры движка задаются профилем DB_PROFILE
+engine_profile = resolve_engine_profile(settings)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url, poolclass=TimedAsyncAdaptedQueuePool, **engine_profile.engine_kwargs()
+    )
+
+
+def _read_only(bind: AsyncEngine) -> AsyncEngine:
+    """
+    Тот же движок и тот же пул, но транзакции открываются как BEGIN READ ONLY:
+    запись, в том числе текстовым SQL, отклоняет PostgreSQL. Отдельного пула
+    для чтения нет - число соединений воркера ограничено pool_size + max_overflow.
+    """
+    return bind.execution_options(postgresql_readonly=True)
 
 
 # Создаем async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,  # Для разработки - показывает SQL запросы
-    pool_pre_ping=True,  # Проверка соединения перед использованием (рекомендуется для PostgreSQL)
-)
+engine = _create_engine(settings.DATABASE_URL)
+
+# Сессии GET и HEAD: пул основного движка, транзакции READ ONLY на стороне сервера
+read_only_engine = _read_only(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -20,11 +75,111 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+
+class ReadOnlySession(Session):
+    """
+    Сессия запросов только на чтение.
+
+    Транзакции открываются как BEGIN READ ONLY: запись, в том числе текстовым SQL,
+    отклоняет PostgreSQL. Запись через ORM отклоняется ещё до обращения к серверу.
+    """
+
+
+@event.listens_for(ReadOnlySession, "do_orm_execute")
+def _reject_dml(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise InvalidRequestError("Изменение данных в сессии только для чтения")
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session: Session, *args: Any) -> None:
+    if session.new or session.dirty or session.deleted:
+        raise InvalidRequestError("Изменение данных в сессии только для чтения")
+
+
+# Ключи Session.info: statement_timeout транзакции сессии чтения (мс),
+# признаки сессии только на чтение и сессии реплики
+STATEMENT_TIMEOUT_INFO = "statement_timeout_ms"
+READ_ONLY_INFO = "read_only"
+REPLICA_INFO = "replica"
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _set_statement_timeout(session: Session, transaction: Any, connection: Connection) -> None:
+    """Ограничить время запросов транзакции (SET LOCAL) по классу маршрута"""
+    timeout_ms = session.info.get(STATEMENT_TIMEOUT_INFO)
+    if timeout_ms:
+        connection.execute(
+            text("SELECT set_config('statement_timeout', :value, true)"), {"value": str(timeout_ms)}
+        )
+
+
+def read_only_session_info(request: Request) -> dict[str, Any]:
+    """Session.info сессии чтения: statement_timeout маршрутов с классом таймаута"""
+    timeout = route_timeout(request)
+    return {STATEMENT_TIMEOUT_INFO: int(timeout * 1000)} if timeout else {}
+
+
+def is_read_only_session(db: AsyncSession) -> bool:
+    """Сессия только на чтение: основной БД для GET/HEAD или реплики"""
+    return db.info.get(READ_ONLY_INFO) is True
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """Сессия реплики: данные могут отставать от основной БД"""
+    return db.info.get(REPLICA_INFO) is True
+
+
+def _read_only_sessionmaker(
+    bind: AsyncEngine, *, replica: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        autoflush=False,
+        expire_on_commit=False,
+        info={READ_ONLY_INFO: True, REPLICA_INFO: replica},
+    )
+
+
+ReadOnlySessionLocal = _read_only_sessionmaker(read_only_engine)
+
+# Необязательная реплика для чтения с теми же параметрами движка. Её пул открывает
+# соединения к серверу реплики и не расходует max_connections основной БД
+read_engine = _create_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+
+ReadSessionLocal = (
+    _read_only_sessionmaker(_read_only(read_engine), replica=True)
+    if read_engine is not None
+    else None
+)
+
+
+def all_engines() -> list[AsyncEngine]:
+    """Движки процесса со своими пулами: для счётчиков, метрик и закрытия пулов"""
+    return [item for item in (engine, read_engine) if item is not None]
+
+
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency для получения async сессии БД"""
+# Методы запросов, которые не изменяют данные
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency для получения async сессии БД.
+
+    Для GET и HEAD выдаётся сессия только на чтение без commit,
+    для остальных методов - обычная сессия с commit по завершении запроса.
+    """
+    if request.method in READ_ONLY_METHODS:
+        async with ReadOnlySessionLocal(info=read_only_session_info(request)) as read_only_session:
+            yield read_only_session
+        return
+
     async with AsyncSessionLocal() as session:
         try:
             yield session
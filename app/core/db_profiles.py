@@ -0,0 +1,133 @@
+"""
+Профили настроек движка БД (dev, prod, benchmark)
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+from app.core.config import Settings
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Параметры create_async_engine и сессии PostgreSQL"""
+
+    name: str
+    echo: bool
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+    # Размер кэша подготовленных выражений asyncpg на соединение (0 - выключен)
+    prepared_statement_cache_size: int
+    # statement_timeout PostgreSQL в миллисекундах (0 - без ограничения)
+    statement_timeout_ms: int
+    # JIT PostgreSQL: на коротких OLTP запросах компиляция обычно дороже выполнения
+    jit: bool
+    # Соединений, открываемых при старте воркера (не больше pool_size), - первые
+    # запросы после запуска или перезапуска воркера не ждут установки соединения
+    pool_warmup: int
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Аргументы для create_async_engine"""
+        server_settings = {
+            "statement_timeout": str(self.statement_timeout_ms),
+            "jit": "on" if self.jit else "off",
+        }
+        return {
+            "echo": self.echo,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": {
+                "prepared_statement_cache_size": self.prepared_statement_cache_size,
+                "server_settings": server_settings,
+            },
+        }
+
+    def describe(self) -> str:
+        """Краткое описание для лога при старте"""
+        return (
+            f"{self.name}: echo={self.echo}, pool_size={self.pool_size}, "
+            f"max_overflow={self.max_overflow}, pool_timeout={self.pool_timeout}s, "
+            f"pool_recycle={self.pool_recycle}s, pool_pre_ping={self.pool_pre_ping}, "
+            f"prepared_statement_cache_size={self.prepared_statement_cache_size}, "
+            f"statement_timeout={self.statement_timeout_ms}ms, jit={'on' if self.jit else 'off'}, "
+            f"pool_warmup={self.pool_warmup}"
+        )
+
+
+ENGINE_PROFILES: dict[str, EngineProfile] = {
+    # Локальная разработка: лог SQL, небольшой пул, без ограничения времени запросов
+    "dev": EngineProfile(
+        name="dev",
+        echo=True,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=-1,
+        pool_pre_ping=True,
+        prepared_statement_cache_size=100,
+        statement_timeout_ms=0,
+        jit=True,
+        pool_warmup=0,
+    ),
+    # Production: без лога SQL, пул под нагрузку, ограничение времени запросов
+    "prod": EngineProfile(
+        name="prod",
+        echo=False,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        prepared_statement_cache_size=500,
+        statement_timeout_ms=30_000,
+        jit=False,
+        pool_warmup=5,
+    ),
+    # Нагрузочные тесты: фиксированный пул без overflow и без pre-ping
+    "benchmark": EngineProfile(
+        name="benchmark",
+        echo=False,
+        pool_size=30,
+        max_overflow=0,
+        pool_timeout=5,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        prepared_statement_cache_size=1000,
+        statement_timeout_ms=0,
+        jit=False,
+        pool_warmup=30,
+    ),
+}
+
+
+def _override(value: T | None, default: T) -> T:
+    return default if value is None else value
+
+
+def resolve_engine_profile(settings: Settings) -> EngineProfile:
+    """Профиль из DB_PROFILE с учётом переопределений DB_* из настроек"""
+    profile = ENGINE_PROFILES[settings.DB_PROFILE]
+    return replace(
+        profile,
+        echo=_override(settings.DB_ECHO, profile.echo),
+        pool_size=_override(settings.DB_POOL_SIZE, profile.pool_size),
+        max_overflow=_override(settings.DB_MAX_OVERFLOW, profile.max_overflow),
+        pool_timeout=_override(settings.DB_POOL_TIMEOUT, profile.pool_timeout),
+        pool_recycle=_override(settings.DB_POOL_RECYCLE, profile.pool_recycle),
+        prepared_statement_cache_size=_override(
+            settings.DB_PREPARED_STATEMENT_CACHE_SIZE, profile.prepared_statement_cache_size
+        ),
+        statement_timeout_ms=_override(
+            settings.DB_STATEMENT_TIMEOUT_MS, profile.statement_timeout_ms
+        ),
+        jit=_override(settings.DB_JIT, profile.jit),
+        pool_warmup=_override(settings.DB_POOL_WARMUP, profile.pool_warmup),
+    )
@@ -1,10 +1,20 @@
-from fastapi import Depends
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable
+
+from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import ReadSessionLocal, get_db, read_only_session_info
 from app.core.exceptions import CredentialsException
+from app.core.metrics import DB_READ_SESSIONS
+from app.core.replica import replica_monitor
+from app.core.timing import span
 from app.modules.auth.service import auth_service
+from app.modules.groups.repository import group_repository
+from app.modules.users.models import User
+from app.modules.users.repository import user_repository
 
 security = HTTPBearer(auto_error=False)
 
@@ -17,4 +27,87 @@ async def get_current_user(
     if not credentials:
         raise CredentialsException(detail="Authorization header missing")
 
-    return await auth_service.get_user_from_token(db, credentials.credentials)
+    with span("auth"):
+        return await auth_service.get_user_from_token(db, credentials.credentials)
+
+
+@asynccontextmanager
+async def _read_session(
+    request: Request,
+    db: AsyncSession,
+    replica_is_current: Callable[[AsyncSession], Awaitable[bool]],
+) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия реплики, если она исправна и replica_is_current подтверждает, что на ней
+    уже есть нужные изменения, иначе - сессия основной БД db.
+    """
+    if ReadSessionLocal is None or not replica_monitor.healthy:
+        DB_READ_SESSIONS.labels("primary").inc()
+        yield db
+        return
+
+    async with ReadSessionLocal(info=read_only_session_info(request)) as session:
+        try:
+            use_replica = await replica_is_current(session)
+        except (OSError, SQLAlchemyError) as e:
+            replica_monitor.mark_unhealthy(e)
+            use_replica = False
+
+        DB_READ_SESSIONS.labels("replica" if use_replica else "primary").inc()
+        yield session if use_replica else db
+
+
+async def _user_is_replicated(replica: AsyncSession, user: User) -> bool:
+    """Версия данных пользователя на реплике не меньше, чем на основной БД"""
+    replica_version = await user_repository.get_data_version(replica, int(user.id))
+    return replica_version is not None and replica_version >= int(user.data_version)
+
+
+async def get_read_db(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для эндпоинтов, которые только читают данные.
+
+    Запросы уходят на реплику (DATABASE_READ_URL), если она исправна, отстаёт
+    не больше допустимого и уже содержит последние изменения текущего пользователя:
+    версия его данных на реплике не меньше, чем на основной БД. Иначе используется
+    сессия основной БД, уже открытая для аутентификации.
+    """
+
+    async def replica_is_current(replica: AsyncSession) -> bool:
+        return await _user_is_replicated(replica, current_user)
+
+    async with _read_session(request, db, replica_is_current) as session:
+        yield session
+
+
+async def get_group_read_db(
+    group_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для эндпоинтов, которые только читают данные группы group_id.
+
+    Данные группы меняют и другие участники (транзакции группы, состав, настройки),
+    поэтому кроме изменений текущего пользователя реплика должна содержать
+    версию данных группы не меньше, чем на основной БД. Пользователь не в группе -
+    основная БД: ошибку доступа обработчик вернёт по актуальным данным.
+    """
+    user_id = int(current_user.id)
+    primary_version: int | None = None
+    if ReadSessionLocal is not None and replica_monitor.healthy:
+        primary_version = await group_repository.get_data_version(db, group_id, user_id)
+
+    async def replica_is_current(replica: AsyncSession) -> bool:
+        if primary_version is None or not await _user_is_replicated(replica, current_user):
+            return False
+        replica_version = await group_repository.get_data_version(replica, group_id, user_id)
+        return replica_version is not None and replica_version >= primary_version
+
+    async with _read_session(request, db, replica_is_current) as session:
+        yield session
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Any, Generic, TypeVar, Optional
 from pydantic import BaseModel, Field
+from starlette.responses import Response
 
 T = TypeVar("T")
 
@@ -35,6 +36,12 @@ class StandardResponse(BaseModel, Generic[T]):
         }
 
 
+class StandardJSONResponse(Response):
+    """JSON-ответ с уже сериализованным телом (bytes передаются без изменений)"""
+
+    media_type = "application/json"
+
+
 def success_response(data: Any, code: int = 200) -> StandardResponse:
     """Helper функция для создания успешного ответа"""
     return StandardResponse(success=True, code=code, data=data, error=None)
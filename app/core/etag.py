@@ -0,0 +1,50 @@
+"""
+Условные GET запросы (ETag / If-None-Match) на основе версий данных
+"""
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+# Ответ с ETag всегда перепроверяется клиентом, но может отдаваться из его кэша после 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Сформировать слабый ETag из частей ключа.
+
+    Версия приложения входит в ключ, чтобы после релиза с изменённым форматом
+    ответов клиенты не получили 304 на устаревшее тело.
+    """
+    key = "-".join(str(part) for part in (settings.VERSION, *parts))
+    return f'W/"{key}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверить If-None-Match (слабое сравнение, RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+def check_not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Выставить ETag ответа и проверить If-None-Match.
+
+    Вызывается в endpoint'е до обращения к сервисам.
+
+    Returns:
+        Response | None: Ответ 304, если у клиента актуальная версия, иначе None -
+            тогда ETag уже выставлен в response и endpoint формирует тело как обычно.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
@@ -1,3 +1,4 @@
+import math
 from typing import Optional
 from fastapi import HTTPException, status
 
@@ -6,9 +7,13 @@ class AppException(HTTPException):
     """Базовое исключение приложения"""
 
     def __init__(
-        self, status_code: int, detail: str = "Произошла ошибка", error_code: Optional[str] = None
+        self,
+        status_code: int,
+        detail: str = "Произошла ошибка",
+        error_code: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
     ):
-        super().__init__(status_code=status_code, detail=detail)
+        super().__init__(status_code=status_code, detail=detail, headers=headers)
         self.error_code = error_code
 
 
@@ -48,6 +53,13 @@ class ValidationException(AppException):
         )
 
 
+class ConflictException(AppException):
+    """Состояние ресурса не позволяет выполнить запрос"""
+
+    def __init__(self, detail: str = "Конфликт состояния ресурса", error_code: str = "CONFLICT"):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail, error_code=error_code)
+
+
 class UserAlreadyExistsException(AppException):
     """Пользователь уже существует"""
 
@@ -70,3 +82,33 @@ class CredentialsException(AppException):
         super().__init__(
             status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, error_code=error_code
         )
+
+
+class TooManyRequestsException(AppException):
+    """Слишком много запросов"""
+
+    def __init__(
+        self,
+        detail: str = "Слишком много попыток. Повторите позже",
+        error_code: str = "TOO_MANY_REQUESTS",
+        retry_after: float = 1.0,
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            error_code=error_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+class RequestTimeoutException(AppException):
+    """Запрос не уложился в отведённое время"""
+
+    def __init__(
+        self,
+        detail: str = "Превышено время обработки запроса",
+        error_code: str = "REQUEST_TIMEOUT",
+    ):
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=detail, error_code=error_code
+        )
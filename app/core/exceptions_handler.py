@@ -18,7 +18,11 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
         timestamp=datetime.now(timezone.utc).isoformat(),
     )
 
-    return JSONResponse(status_code=exc.status_code, content=response.model_dump(exclude_none=True))
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=response.model_dump(exclude_none=True),
+        headers=exc.headers,
+    )
 
 
 async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
@@ -33,7 +37,11 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
         timestamp=datetime.now(timezone.utc).isoformat(),
     )
 
-    return JSONResponse(status_code=exc.status_code, content=response.model_dump(exclude_none=True))
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=response.model_dump(exclude_none=True),
+        headers=exc.headers,
+    )
 
 
 async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
@@ -0,0 +1,133 @@
+"""
+Отдача файлов с поддержкой Range: докачка прерванных загрузок и загрузка частями.
+"""
+
+import os
+from email.utils import formatdate
+from hashlib import md5
+from typing import Any
+
+import anyio
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+# Расширение ASGI для отдачи файла через sendfile без копирования в процесс
+ZERO_COPY_SEND = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(ValueError):
+    """Диапазон Range вне файла"""
+
+
+def parse_range(value: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Разобрать заголовок Range (RFC 9110 14.2) для файла размером size.
+
+    Поддерживается один диапазон: bytes=start-end, bytes=start- и bytes=-suffix.
+    Некорректный заголовок и несколько диапазонов игнорируются - отдаётся весь файл.
+
+    Returns:
+        tuple[int, int] | None: границы диапазона включительно или None - весь файл
+
+    Raises:
+        RangeNotSatisfiable: диапазон начинается за концом файла или файл пуст
+    """
+    if not value:
+        return None
+    unit, _, ranges = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, sep, last = ranges.strip().partition("-")
+    if not sep or not (first or last) or not (first + last).isdigit():
+        return None
+    if not first:
+        # Последние last байт; у пустого файла их нет
+        if int(last) == 0 or size == 0:
+            raise RangeNotSatisfiable(value)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(value)
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(FileResponse):
+    """
+    Файл целиком (200), его часть (206) или 416 для диапазона за концом файла.
+
+    If-Range с устаревшим ETag или датой изменения отменяет Range: файл изменился,
+    и докачивать его нельзя. Тело отправляется через sendfile, если сервер
+    поддерживает расширение ASGI zerocopysend, иначе - чтением частями в потоке.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        stat_result: os.stat_result,
+        range_header: str | None = None,
+        if_range: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        etag = f'"{md5(f"{stat_result.st_mtime}-{stat_result.st_size}".encode()).hexdigest()}"'
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        headers = {**kwargs.pop("headers", {}), "etag": etag, "accept-ranges": "bytes"}
+        super().__init__(path, headers=headers, stat_result=stat_result, **kwargs)
+
+        size = stat_result.st_size
+        self.byte_range = (0, size - 1)
+        if if_range is not None and if_range.strip() not in (etag, last_modified):
+            range_header = None
+        try:
+            requested = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            self.status_code = 416
+            self.byte_range = (0, -1)
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            return
+        if requested is not None:
+            self.status_code = 206
+            self.byte_range = requested
+            self.headers["content-range"] = f"bytes {requested[0]}-{requested[1]}/{size}"
+            self.headers["content-length"] = str(requested[1] - requested[0] + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers}
+        )
+        start, end = self.byte_range
+        count = end - start + 1
+        if self.send_header_only or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif ZERO_COPY_SEND in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": ZERO_COPY_SEND,
+                        "file": file.fileno(),
+                        "offset": start,
+                        "count": count,
+                        "more_body": False,
+                    }
+                )
+        else:
+            async with await anyio.open_file(self.path, "rb") as file:
+                await file.seek(start)
+                remaining = count
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send(
+                        {"type": "http.response.body", "body": chunk, "more_body": remaining > 0}
+                    )
+                if remaining > 0:
+                    # Файл укоротился во время отдачи - завершаем ответ
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
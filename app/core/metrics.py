@@ -0,0 +1,365 @@
+"""
+Метрики приложения в текстовом формате Prometheus.
+
+Реестр живёт в памяти каждого воркера и обновляется без блокировок:
+метрики изменяются из потока event loop, а отрисовка только читает значения.
+
+При нескольких воркерах gunicorn общего реестра нет: запрос /metrics обслуживает
+тот воркер, которому досталось соединение, и отдаёт только свои значения.
+Все ряды глобального реестра помечены меткой worker (pid процесса), чтобы значения
+разных воркеров не смешивались в один ряд со скачками счётчиков. Один scrape
+видит один воркер, поэтому для полной картины каждый воркер нужно опрашивать
+отдельно (например, WEB_CONCURRENCY=1 на контейнер), а агрегировать -
+sum without (worker) в Prometheus.
+"""
+
+import os
+import secrets
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# charset добавляет PlainTextResponse
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], *extra: str) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(pair for pair in extra if pair)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], Any] = {}
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _default(self) -> Any:
+        return self.labels()
+
+    def render(self, const: str = "") -> list[str]:
+        """const - постоянные метки реестра, уже в формате name="value" через запятую"""
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for key, child in list(self._children.items()):
+            lines.extend(self._render_child(key, child, const))
+        return lines
+
+    def _render_child(self, key: tuple[str, ...], child: Any, const: str) -> list[str]:
+        labels = _format_labels(self.labelnames, key, const)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """Монотонно возрастающий счётчик"""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """Значение, которое может как расти, так и уменьшаться"""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными границами корзин"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> Any:
+        return self._default().time()
+
+    def _render_child(self, key: tuple[str, ...], child: _HistogramValue, const: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, const, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, const, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{labels} {child.count}")
+        labels = _format_labels(self.labelnames, key, const)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса.
+
+    const_labels - метки, добавляемые ко всем рядам; вычисляются при каждой отрисовке,
+    поэтому pid воркера, созданного fork после импорта модуля, будет актуальным.
+    """
+
+    def __init__(self, const_labels: Callable[[], dict[str, str]] | None = None) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._const_labels = const_labels
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Добавить функцию, обновляющую метрики непосредственно перед отрисовкой"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Отрисовать все метрики в текстовом формате Prometheus"""
+        for collector in self._collectors:
+            collector()
+        labels = self._const_labels() if self._const_labels else {}
+        const = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render(const))
+        return "\n".join(lines) + "\n"
+
+
+def _worker_label() -> dict[str, str]:
+    return {"worker": str(os.getpid())}
+
+
+registry = MetricsRegistry(const_labels=_worker_label)
+
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge("http_requests_in_flight", "Число обрабатываемых запросов")
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Длительность обработки запроса",
+    ("method", "route", "status"),
+)
+DB_POOL_SIZE = registry.gauge("db_pool_size", "Размер пула соединений", ("pool",))
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "db_pool_checked_out", "Соединения, выданные из пула", ("pool",)
+)
+DB_POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Соединения сверх размера пула", ("pool",))
+DB_POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds",
+    "Время ожидания свободного соединения в очереди пула (без установки новых соединений)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_REPLICA_LAG = registry.gauge(
+    "db_replica_lag_seconds", "Отставание реплики для чтения по последней проверке"
+)
+DB_READ_SESSIONS = registry.counter(
+    "db_read_sessions_total", "Сессии для чтения по месту выполнения", ("target",)
+)
+HTTP_REQUESTS_CANCELLED = registry.counter(
+    "http_requests_cancelled_total",
+    "Запросы, прерванные из-за отключения клиента или по таймауту",
+    ("reason",),
+)
+CHART_RENDER_DURATION = registry.histogram(
+    "chart_render_duration_seconds", "Длительность отрисовки диаграммы", ("chart",)
+)
+PASSWORD_HASH_QUEUE_DEPTH = registry.gauge(
+    "password_hash_queue_depth", "Операции argon2, ожидающие или выполняющиеся в пуле потоков"
+)
+JOBS_PROCESSED = registry.counter(
+    "jobs_processed_total",
+    "Выполненные попытки фоновых задач по результату: succeeded, retry, failed",
+    ("kind", "outcome"),
+)
+JOB_DURATION = registry.histogram(
+    "job_duration_seconds",
+    "Длительность попытки фоновой задачи по результату: succeeded, retry, failed",
+    ("kind", "outcome"),
+)
+
+
+def register_pool_collector(pool: Any, name: str) -> None:
+    """
+    Снимать статистику пула соединений SQLAlchemy при каждой отрисовке метрик.
+
+    name - значение метки pool (primary, replica), чтобы пулы разных движков
+    не писали в один ряд.
+    """
+
+    def collect() -> None:
+        DB_POOL_SIZE.labels(name).set(pool.size())
+        DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+        DB_POOL_OVERFLOW.labels(name).set(max(pool.overflow(), 0))
+
+    registry.add_collector(collect)
+
+
+def metrics_authorized(authorization: str | None, token: str | None) -> bool:
+    """
+    Доступ к /metrics: без METRICS_TOKEN - открыт, иначе нужен заголовок
+    Authorization: Bearer <METRICS_TOKEN>.
+    """
+    if not token:
+        return True
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and secrets.compare_digest(
+        credentials.strip().encode(), token.encode()
+    )
+
+
+class MetricsMiddleware:
+    """
+    Middleware, замеряющее длительность запросов и число запросов в обработке.
+
+    В метку route попадает шаблон пути маршрута (/transactions/{transaction_id}),
+    а не фактический путь, чтобы число временных рядов оставалось ограниченным.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._route_paths: dict[Any, str] | None = None
+
+    def _route_path(self, scope: Scope) -> str:
+        if self._route_paths is None:
+            routes = getattr(scope.get("app"), "routes", [])
+            self._route_paths = {
+                route.endpoint: route.path for route in routes if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], self._route_path(scope), status_code
+            ).observe(time.perf_counter() - started)
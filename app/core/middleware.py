@@ -1,98 +1,151 @@
 from datetime import datetime
-from typing import Callable, Any, Awaitable
-from fastapi import Request
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import StreamingResponse, Response
+from typing import Any, Iterable
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.core.dto.response import StandardResponse
-import json
-import logging
-
-
-class StandardResponseMiddleware(BaseHTTPMiddleware):
-    """Middleware для форматирования успешных ответов в стандартизированный формат"""
-
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        response: Response = await call_next(request)
-
-        # Обрабатываем только успешные ответы (2xx)
-        if 200 <= response.status_code < 300:
-            # Пропускаем health check и root endpoint, а также документацию
-            if request.url.path in ["/", "/health", "/docs", "/openapi.json", "/redoc"]:
-                return response
-
-            # Пропускаем streaming responses
-            if isinstance(response, StreamingResponse):
-                return response
-
-            try:
-                data = None
-
-                # Для JSONResponse используем body напрямую
-                if isinstance(response, JSONResponse):
-                    try:
-                        # Получаем body из JSONResponse
-                        # JSONResponse имеет свойство body, которое возвращает bytes
-                        body: bytes = (
-                            response.body if hasattr(response, "body") and response.body else b""
-                        )
-
-                        # Проверяем, не является ли ответ уже стандартизированным
-                        content = body.decode() if body else "{}"
-                        if '"success"' in content and '"code"' in content:
-                            return response
-
-                        # Парсим JSON из ответа
-                        data = json.loads(content) if body else None
-                        logging.debug(f"Parsed data: {data}")
-                    except Exception as e:
-                        logging.error(f"Error reading JSONResponse body: {e}", exc_info=True)
-                        return Response(
-                            content=response.body if hasattr(response, "body") else b"",
-                            status_code=response.status_code,
-                            headers=dict(response.headers),
-                            media_type=response.media_type,
-                        )
-                else:
-                    # Для других типов ответов читаем body_iterator
-                    # body_iterator существует в runtime у всех Response в Starlette
-                    body = b""
-                    async for chunk in response.body_iterator:  # type: ignore[attr-defined]
-                        body += chunk
-
-                    try:
-                        data = json.loads(body.decode()) if body else None
-                    except json.JSONDecodeError:
-                        # Если не JSON, создаем новый Response без Content-Length
-                        headers = {
-                            k: v
-                            for k, v in response.headers.items()
-                            if k.lower() != "content-length"
-                        }
-                        return Response(
-                            content=body,
-                            status_code=response.status_code,
-                            media_type=response.media_type,
-                            headers=headers,
-                        )
-
-                # Форматируем в стандартизированный формат
-                standard_response: StandardResponse[Any] = StandardResponse(
-                    success=True,
-                    code=response.status_code,
-                    data=data,
-                    error=None,
-                    timestamp=datetime.utcnow().isoformat() + "Z",
-                )
-
-                # Создаем новый JSONResponse - FastAPI автоматически установит правильный Content-Length
-                response_content = standard_response.model_dump(exclude_none=True)
-                return JSONResponse(content=response_content, status_code=response.status_code)
-            except Exception as e:
-                # В случае ошибки возвращаем оригинальный ответ
-                logging.error(f"Error in StandardResponseMiddleware: {e}", exc_info=True)
-                return response
-
-        return response
+from app.core.timing import span
+
+# Пути, ответы которых не оборачиваются: health check, root endpoint и документация
+EXCLUDED_PATHS = frozenset({"/", "/health", "/docs", "/openapi.json", "/redoc"})
+
+# Ответ, сериализованный из StandardResponse, всегда начинается с первого поля модели
+ENVELOPE_PREFIX = b'{"success":'
+
+# Атрибут endpoint'а, которым помечаются маршруты, уже возвращающие StandardResponse
+ENVELOPED_ATTR = "__standard_response__"
+
+
+def mark_enveloped(endpoint: Any) -> Any:
+    """Пометить endpoint как возвращающий уже стандартизированный ответ"""
+    setattr(endpoint, ENVELOPED_ATTR, True)
+    return endpoint
+
+
+def mark_enveloped_routes(routes: Iterable[Any]) -> None:
+    """Пометить все маршруты, у которых response_model - StandardResponse[...]"""
+    for route in routes:
+        if not isinstance(route, APIRoute):
+            continue
+        model = route.response_model
+        if isinstance(model, type) and issubclass(model, StandardResponse):
+            mark_enveloped(route.endpoint)
+
+
+class StandardResponseMiddleware:
+    """
+    Middleware для форматирования успешных ответов в стандартизированный формат.
+
+    Чистый ASGI: тело ответа не декодируется и не парсится. Успешный JSON-ответ
+    оборачивается на пути отправки конкатенацией байтов
+    {"success":true,"code":...,"data": <тело> ,"timestamp":"..."}, в том числе
+    для потоковых ответов. Маршруты, помеченные mark_enveloped, и ответы,
+    уже начинающиеся с {"success":, пропускаются без изменений.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _EnvelopeResponder(scope, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _EnvelopeResponder:
+    """Состояние обёртки одного ответа"""
+
+    def __init__(self, scope: Scope, send: Send) -> None:
+        self.scope = scope
+        self.downstream = send
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.suffix = b""
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self.downstream(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if not self._should_wrap(message):
+                self.passthrough = True
+                await self.downstream(message)
+                return
+            # Заголовки отправляем вместе с первым непустым фрагментом тела,
+            # когда станет понятно, нужна ли обёртка
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start_message is None:
+            # Заголовки уже отправлены, идут следующие фрагменты тела
+            if not more_body:
+                body += self.suffix
+            await self.downstream(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+            return
+
+        if not body and more_body:
+            return
+
+        start_message, self.start_message = self.start_message, None
+        if body.startswith(ENVELOPE_PREFIX):
+            self.passthrough = True
+            await self.downstream(start_message)
+            await self.downstream(message)
+            return
+
+        with span("middleware"):
+            status_code = start_message["status"]
+            timestamp = datetime.utcnow().isoformat() + "Z"
+            if body:
+                prefix = b'{"success":true,"code":%d,"data":' % status_code
+            else:
+                # Пустое тело - поле data опускается, как при exclude_none
+                prefix = b'{"success":true,"code":%d' % status_code
+            self.suffix = b',"timestamp":"%s"}' % timestamp.encode()
+
+            start_message["headers"] = _with_content_length(
+                start_message.get("headers", []), len(prefix) + len(self.suffix)
+            )
+            body = prefix + body
+            if not more_body:
+                body += self.suffix
+
+        await self.downstream(start_message)
+        await self.downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _should_wrap(self, message: Message) -> bool:
+        status_code = message["status"]
+        if not 200 <= status_code < 300 or status_code in (204, 205):
+            return False
+        if getattr(self.scope.get("endpoint"), ENVELOPED_ATTR, False):
+            return False
+        for name, value in message.get("headers", []):
+            if name.lower() == b"content-type":
+                return bool(value.startswith(b"application/json"))
+        return False
+
+
+def _with_content_length(
+    headers: Iterable[tuple[bytes, bytes]], extra: int
+) -> list[tuple[bytes, bytes]]:
+    """Увеличить Content-Length на длину обёртки (если он был задан)"""
+    result = []
+    for name, value in headers:
+        if name.lower() == b"content-length":
+            value = str(int(value) + extra).encode()
+        result.append((name, value))
+    return result
@@ -0,0 +1,113 @@
+"""
+Подсчёт SQL запросов на запрос к API и поиск повторяющихся запросов (N+1)
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.sql_events import observe_statements
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Статистика SQL запросов в рамках одного запроса к API"""
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        # Текст запроса -> число выполнений. Параметры передаются отдельно,
+        # поэтому одинаковый текст означает один и тот же запрос с разными значениями
+        self.statements: Counter[str] = Counter()
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Запросы, выполненные не меньше threshold раз - вероятный N+1"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Считать SQL запросы, выполненные внутри блока"""
+    stats = QueryStats()
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+
+def _count_statement(statement: str, duration: float) -> None:
+    stats = _stats.get()
+    if stats is not None:
+        stats.add(statement, duration)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Подключить подсчёт запросов к движку"""
+    observe_statements(engine, _count_statement)
+
+
+class QueryCounterMiddleware:
+    """
+    Middleware режима отладки: добавляет в ответ заголовки X-DB-Query-Count
+    и X-DB-Query-Time-Ms, пишет статистику в лог и предупреждает
+    о запросах, повторённых не меньше n_plus_one_threshold раз.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 5) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", f"{stats.duration * 1000:.2f}".encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self._log(scope, stats)
+
+    def _log(self, scope: Scope, stats: QueryStats) -> None:
+        logger.info(
+            "%s %s: %d SQL запросов, %.2f мс",
+            scope["method"],
+            scope["path"],
+            stats.count,
+            stats.duration * 1000,
+        )
+        for statement, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(
+                "Возможный N+1 в %s %s: запрос выполнен %d раз: %s",
+                scope["method"],
+                scope["path"],
+                count,
+                " ".join(statement.split())[:200],
+            )
@@ -0,0 +1,167 @@
+"""
+Ограничение частоты запросов внутри процесса (token bucket)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+
+
+class _Shard:
+    """Часть таблиц ведер со своей блокировкой и LRU-порядком"""
+
+    __slots__ = ("lock", "buckets")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> (оставшиеся токены, время последнего пополнения)
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+
+class TokenBucketLimiter:
+    """
+    Шардированный token bucket.
+
+    Каждая проверка - O(1): поиск ведра в OrderedDict своего шарда и пересчёт
+    токенов по прошедшему времени. Память ограничена max_keys - при переполнении
+    шарда вытесняется ключ, к которому дольше всего не обращались.
+    """
+
+    def __init__(
+        self, rate_per_minute: float, burst: int, max_keys: int = 100_000, shards: int = 16
+    ) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.burst = float(burst)
+        self._shards = [_Shard() for _ in range(shards)]
+        self._max_keys_per_shard = max(1, max_keys // shards)
+
+    def _refill(self, shard: _Shard, key: str, now: float) -> float:
+        """Токены ведра ключа на момент now (вызывается под блокировкой шарда)"""
+        bucket = shard.buckets.get(key)
+        if bucket is None:
+            return self.burst
+        tokens, updated_at = bucket
+        return min(self.burst, tokens + (now - updated_at) * self.rate)
+
+    def _wait(self, tokens: float) -> float:
+        return (1.0 - tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def retry_after(self, key: str, now: float | None = None) -> float:
+        """
+        Проверить ключ, не списывая токен.
+
+        Returns:
+            float: 0, если токен есть, иначе через сколько секунд он появится.
+        """
+        now = time.monotonic() if now is None else now
+        shard = self._shards[hash(key) % len(self._shards)]
+
+        with shard.lock:
+            tokens = self._refill(shard, key, now)
+        return 0.0 if tokens >= 1.0 else self._wait(tokens)
+
+    def consume(self, key: str, now: float | None = None) -> float:
+        """
+        Списать один токен для ключа.
+
+        Returns:
+            float: 0, если запрос разрешён, иначе через сколько секунд появится токен.
+        """
+        now = time.monotonic() if now is None else now
+        shard = self._shards[hash(key) % len(self._shards)]
+
+        with shard.lock:
+            tokens = self._refill(shard, key, now)
+            if key in shard.buckets:
+                shard.buckets.move_to_end(key)
+            elif len(shard.buckets) >= self._max_keys_per_shard:
+                shard.buckets.popitem(last=False)
+
+            if tokens >= 1.0:
+                shard.buckets[key] = (tokens - 1.0, now)
+                return 0.0
+
+            shard.buckets[key] = (tokens, now)
+            return self._wait(tokens)
+
+    def __len__(self) -> int:
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    def reset(self) -> None:
+        """Сбросить все ведра"""
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+
+class LoginRateLimiter:
+    """Ограничение попыток входа по IP клиента и по имени пользователя"""
+
+    def __init__(self) -> None:
+        self.by_ip = TokenBucketLimiter(
+            rate_per_minute=settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+            burst=settings.LOGIN_RATE_LIMIT_IP_BURST,
+            max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+        )
+        self.by_username = TokenBucketLimiter(
+            rate_per_minute=settings.LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE,
+            burst=settings.LOGIN_RATE_LIMIT_USERNAME_BURST,
+            max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+        )
+
+    def check(self, client_ip: str | None, username: str) -> None:
+        """
+        Проверить попытку входа. Вызывается до любых запросов к БД и хэширования.
+
+        Токены списываются, только если попытку разрешают оба лимита: отклонённые
+        по IP попытки не расходуют лимит пользователя, и наоборот - иначе перебор
+        с одного адреса блокировал бы вход владельцу учётной записи.
+
+        Raises:
+            TooManyRequestsException: Если лимит по IP или по имени пользователя исчерпан.
+        """
+        ip_key = client_ip or "unknown"
+        username_key = username.strip().lower()
+        now = time.monotonic()
+        retry_after = max(
+            self.by_ip.retry_after(ip_key, now), self.by_username.retry_after(username_key, now)
+        )
+        if retry_after > 0:
+            raise TooManyRequestsException(retry_after=retry_after)
+
+        retry_after = max(
+            self.by_ip.consume(ip_key, now), self.by_username.consume(username_key, now)
+        )
+        if retry_after > 0:
+            # Другой поток успел списать последний токен между проверкой и списанием
+            raise TooManyRequestsException(retry_after=retry_after)
+
+    def reset(self) -> None:
+        self.by_ip.reset()
+        self.by_username.reset()
+
+
+def client_ip(request: Request) -> str | None:
+    """
+    Адрес клиента для лимитов.
+
+    Если запрос пришёл от доверенного прокси (TRUSTED_PROXIES), адрес берётся
+    из X-Forwarded-For: первый справа адрес, не принадлежащий доверенным прокси.
+    Левые части заголовка задаёт сам клиент, и доверять им нельзя.
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or peer not in settings.TRUSTED_PROXIES:
+        return peer
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for address in reversed([item.strip() for item in forwarded.split(",") if item.strip()]):
+        if address not in settings.TRUSTED_PROXIES:
+            return address
+    return peer
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -0,0 +1,83 @@
+"""
+Состояние реплики для чтения и политика допустимого отставания
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import DB_REPLICA_LAG
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики в секундах. Если реплика получила и применила весь WAL,
+# отставание нулевое, даже если на основной БД давно не было записей
+# (иначе now() - pg_last_xact_replay_timestamp() росло бы на простое).
+# Сервер не в режиме восстановления (обычный PostgreSQL вместо реплики) отстать не может.
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Периодическая проверка реплики.
+
+    Реплика считается пригодной для чтения, если последняя проверка прошла успешно
+    и отставание не превышает max_lag_seconds. До первой успешной проверки
+    и после ошибки соединения чтение идёт на основную БД.
+    """
+
+    def __init__(self, max_lag_seconds: float) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_seconds: float | None = None
+        self.healthy = False
+
+    async def check(self, session: AsyncSession) -> None:
+        """Измерить отставание реплики и обновить состояние"""
+        lag = float(await session.scalar(REPLICA_LAG_QUERY) or 0)
+        self.lag_seconds = lag
+        DB_REPLICA_LAG.set(lag)
+
+        healthy = lag <= self.max_lag_seconds
+        if healthy != self.healthy:
+            if healthy:
+                logger.info(f"Реплика доступна для чтения, отставание {lag:.1f} с")
+            else:
+                logger.warning(
+                    f"Реплика отстаёт на {lag:.1f} с (допустимо {self.max_lag_seconds} с), "
+                    f"чтение переключено на основную БД"
+                )
+        self.healthy = healthy
+
+    def mark_unhealthy(self, reason: object) -> None:
+        """Переключить чтение на основную БД до следующей успешной проверки"""
+        if self.healthy:
+            logger.warning(f"Реплика недоступна, чтение переключено на основную БД: {reason}")
+        self.healthy = False
+
+    async def run_check_loop(
+        self, session_factory: async_sessionmaker[AsyncSession], interval: float
+    ) -> None:
+        """Фоновая проверка реплики (запускается в lifespan приложения)"""
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.check(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.mark_unhealthy(e)
+            await asyncio.sleep(interval)
+
+
+replica_monitor = ReplicaMonitor(max_lag_seconds=settings.DATABASE_READ_MAX_LAG_SECONDS)
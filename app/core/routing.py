@@ -0,0 +1,103 @@
+"""
+Маршруты с однократной сериализацией StandardResponse
+"""
+
+import asyncio
+import functools
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.cancellation import REQUEST_TIMEOUT_ATTR, cancellable_handler
+from app.core.dto.response import StandardJSONResponse, StandardResponse
+from app.core.timing import span
+
+# Имя параметра, под которым FastAPI передаёт sub-response, если endpoint его не объявил
+_SUB_RESPONSE_PARAM = "__sub_response__"
+
+
+class StandardResponseRoute(APIRoute):
+    """
+    Маршрут для endpoint'ов с response_model=StandardResponse[...].
+
+    Стандартный путь FastAPI повторно валидирует возвращённый StandardResponse
+    по response_model, прогоняет его через jsonable_encoder и json.dumps.
+    Здесь конверт, собранный success_response, сериализуется один раз заранее
+    скомпилированным сериализатором pydantic-core (TypeAdapter.dump_json),
+    а endpoint сразу возвращает готовые байты.
+
+    Заголовки и код ответа, выставленные через параметр Response, сохраняются.
+
+    Обработчики endpoint'ов, помеченных request_timeout, прерываются по таймауту
+    класса маршрута и при отключении клиента.
+    """
+
+    _serialize_once = False
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if not self._serialize_once and self._is_standard_response():
+            self._serialize_once = True
+            self._wrap_endpoint()
+        handler = super().get_route_handler()
+        timeout_class = getattr(self.endpoint, REQUEST_TIMEOUT_ATTR, None)
+        if timeout_class is not None:
+            return cancellable_handler(handler, timeout_class)
+        return handler
+
+    def _is_standard_response(self) -> bool:
+        model = self.response_model
+        return (
+            isinstance(model, type)
+            and issubclass(model, StandardResponse)
+            and asyncio.iscoroutinefunction(self.dependant.call)
+        )
+
+    def _wrap_endpoint(self) -> None:
+        adapter: TypeAdapter[Any] = TypeAdapter(self.response_model)
+        data_type = self.response_model.__pydantic_generic_metadata__["args"]
+        data_model = data_type[0] if data_type else None
+        if not (isinstance(data_model, type) and issubclass(data_model, BaseModel)):
+            data_model = None
+
+        call = self.dependant.call
+        assert call is not None
+        response_param = self.dependant.response_param_name
+        if response_param is None:
+            # Просим FastAPI передать sub-response, чтобы не потерять выставленные в нём заголовки
+            response_param = self.dependant.response_param_name = _SUB_RESPONSE_PARAM
+            injected = True
+        else:
+            injected = False
+        default_status = self.status_code or 200
+
+        @functools.wraps(call)
+        async def endpoint(**values: Any) -> Any:
+            sub_response: Response | None = (
+                values.pop(response_param, None) if injected else values.get(response_param)
+            )
+            result = await call(**values)
+            if isinstance(result, Response):
+                return result
+
+            with span("serialize"):
+                if isinstance(result, StandardResponse) and (
+                    data_model is None or result.data is None or isinstance(result.data, data_model)
+                ):
+                    body = adapter.dump_json(result)
+                else:
+                    # Данные не совпадают со схемой напрямую (например, dict вместо модели) -
+                    # валидируем один раз, как это сделал бы FastAPI
+                    body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+            response = StandardJSONResponse(content=body, status_code=default_status)
+            if sub_response is not None:
+                if sub_response.status_code:
+                    response.status_code = sub_response.status_code
+                response.raw_headers.extend(
+                    header for header in sub_response.raw_headers if header[0] != b"content-length"
+                )
+            return response
+
+        self.dependant.call = endpoint
@@ -1,21 +1,37 @@
 from datetime import datetime, timedelta
+from functools import cache
 from typing import Optional, Any
 import hashlib
 from uuid import uuid4
-from jose import JWTError, jwt  # type: ignore[import-untyped]
-from passlib.context import CryptContext  # type: ignore[import-untyped]
-from passlib.exc import UnknownHashError  # type: ignore[import-untyped]
+from anyio import CapacityLimiter, to_thread
+
 from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_QUEUE_DEPTH
+
+# python-jose (с бэкендом cryptography) и passlib импортируются при первом использовании:
+# вместе они заметная часть времени импорта приложения
+
+
+@cache
+def pwd_context() -> Any:
+    """Контекст хэширования паролей argon2"""
+    from passlib.context import CryptContext  # type: ignore[import-untyped]
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+# Ограничитель потоков для argon2 создаётся лениво - ему нужен запущенный event loop
+_password_hash_limiter: CapacityLimiter | None = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Проверка пароля"""
+    from passlib.exc import UnknownHashError  # type: ignore[import-untyped]
+
     if not hashed_password or not plain_password:
         return False
     try:
-        return bool(pwd_context.verify(plain_password, hashed_password))
+        return bool(pwd_context().verify(plain_password, hashed_password))
     except UnknownHashError:
         # Если хэш не может быть идентифицирован, значит пароль в неправильном формате
         # Это может произойти, если пароль был создан с другой схемой хэширования
@@ -24,23 +40,56 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Хэширование пароля"""
-    return str(pwd_context.hash(password))
+    return str(pwd_context().hash(password))
+
 
+async def _run_password_hashing(func: Any, *args: str) -> Any:
+    """
+    Выполнить операцию argon2 в пуле потоков, не блокируя event loop.
+    Число одновременных операций ограничено PASSWORD_HASH_MAX_THREADS.
+    """
+    global _password_hash_limiter
+    if _password_hash_limiter is None:
+        _password_hash_limiter = CapacityLimiter(settings.PASSWORD_HASH_MAX_THREADS)
+
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    try:
+        return await to_thread.run_sync(func, *args, limiter=_password_hash_limiter)
+    finally:
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
 
-def create_access_token(data: dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Проверка пароля в пуле потоков"""
+    return bool(await _run_password_hashing(verify_password, plain_password, hashed_password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Хэширование пароля в пуле потоков"""
+    return str(await _run_password_hashing(get_password_hash, password))
+
+
+def create_access_token(
+    data: dict[str, Any], expires_delta: Optional[timedelta] = None, jti: str | None = None
+) -> str:
     """Создание JWT токена"""
+    from jose import jwt  # type: ignore[import-untyped]
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    # jti нужен для точечного отзыва токена до истечения exp
+    to_encode.update({"exp": expire, "type": "access", "jti": jti or str(uuid4())})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return str(encoded_jwt)
 
 
 def decode_access_token(token: str) -> Optional[dict[str, Any]]:
     """Декодирование JWT токена"""
+    from jose import JWTError, jwt  # type: ignore[import-untyped]
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return dict(payload) if payload else None
@@ -52,6 +101,8 @@ def create_refresh_token(
     data: dict[str, Any], expires_delta: Optional[timedelta] = None, jti: str | None = None
 ) -> tuple[str, str]:
     """Создание JWT refresh токена"""
+    from jose import jwt  # type: ignore[import-untyped]
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
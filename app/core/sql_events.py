@@ -0,0 +1,56 @@
+"""
+Замер SQL запросов движка для подсчёта запросов (query_counter) и этапа db
+в Server-Timing (timing): одна пара обработчиков событий на движок для всех потребителей
+"""
+
+import time
+from typing import Any, Callable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+
+# Получает текст запроса и длительность его выполнения в секундах
+StatementObserver = Callable[[str, float], None]
+
+# Ключ Connection.info: время начала выполняющихся запросов соединения
+_STARTED_AT = "statement_started_at"
+
+_observers: "WeakKeyDictionary[Engine, list[StatementObserver]]" = WeakKeyDictionary()
+
+
+def observe_statements(engine: Engine, observer: StatementObserver) -> None:
+    """
+    Вызывать observer после каждого SQL запроса движка.
+
+    Обработчики событий регистрируются на движке при первом вызове, повторное
+    подключение того же observer ничего не меняет.
+    """
+    observers = _observers.get(engine)
+    if observers is None:
+        observers = _observers[engine] = []
+        _listen(engine, observers)
+    if observer not in observers:
+        observers.append(observer)
+
+
+def _listen(engine: Engine, observers: list[StatementObserver]) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn: Any, *args: Any) -> None:
+        conn.info.setdefault(_STARTED_AT, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        started = conn.info.get(_STARTED_AT)
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()
+        for observer in observers:
+            observer(statement, duration)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: ExceptionContext) -> None:
+        # Запрос с ошибкой не доходит до after_cursor_execute
+        started = context.connection.info.get(_STARTED_AT) if context.connection else None
+        if started:
+            started.pop()
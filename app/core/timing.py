@@ -0,0 +1,148 @@
+"""
+Разбивка времени обработки запроса по этапам (заголовок Server-Timing)
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from types import TracebackType
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.sql_events import observe_statements
+
+
+class TimingRecorder:
+    """Накопленные длительности этапов одного запроса"""
+
+    __slots__ = ("started_at", "spans")
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        # name -> [суммарная длительность в секундах, число вызовов]
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, name: str, duration: float, count: int = 1) -> None:
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [duration, count]
+        else:
+            entry[0] += duration
+            entry[1] += count
+
+    def header_value(self) -> bytes:
+        """Сформировать значение заголовка Server-Timing"""
+        parts = []
+        for name, (duration, count) in self.spans.items():
+            part = f"{name};dur={duration * 1000:.2f}"
+            if name == "db":
+                part += f';desc="{int(count)} queries"'
+            parts.append(part)
+        parts.append(f"total;dur={(time.perf_counter() - self.started_at) * 1000:.2f}")
+        return ", ".join(parts).encode("latin-1")
+
+
+_recorder: ContextVar[TimingRecorder | None] = ContextVar("server_timing_recorder", default=None)
+
+
+class _Span:
+    __slots__ = ("name", "recorder", "started_at")
+
+    def __init__(self, name: str, recorder: TimingRecorder) -> None:
+        self.name = name
+        self.recorder = recorder
+        self.started_at = 0.0
+
+    def __enter__(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.recorder.add(self.name, time.perf_counter() - self.started_at)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str) -> _Span | _NullSpan:
+    """
+    Замерить этап обработки запроса.
+
+    Вне выбранного для замера запроса возвращает пустой контекстный менеджер,
+    поэтому накладные расходы сводятся к чтению contextvar.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(name, recorder)
+
+
+def record(name: str, duration: float, count: int = 1) -> None:
+    """Добавить длительность этапа, измеренную вызывающим кодом"""
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(name, duration, count)
+
+
+def _record_statement(statement: str, duration: float) -> None:
+    record("db", duration)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Учитывать SQL запросы движка в этапе db"""
+    observe_statements(engine, _record_statement)
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware, добавляющее заголовок Server-Timing.
+
+    Замеряется доля запросов, заданная sample_rate. Заголовок отправляется
+    вместе с началом ответа, поэтому учитывается только работа, выполненная
+    до отправки заголовков (для обычных ответов - вся обработка).
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self.sample_rate <= 0
+            or (self.sample_rate < 1 and random.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        recorder = TimingRecorder()
+        token = _recorder.set(recorder)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", recorder.header_value()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _recorder.reset(token)
@@ -1,42 +1,102 @@
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncIterator
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.core_module import init_db
-from app.core.db import engine
-from app.core.exceptions import AppException
+from app.core.core_module import init_db, warm_up_pool
+from app.core.db import AsyncSessionLocal, ReadSessionLocal, all_engines, engine, engine_profile
+from app.core.exceptions import AppException, CredentialsException
 from app.core.exceptions_handler import (
     app_exception_handler,
     http_exception_handler,
     sqlalchemy_error_handler,
 )
-from app.core.middleware import StandardResponseMiddleware
+from app.core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    metrics_authorized,
+    register_pool_collector,
+    registry as metrics_registry,
+)
+from app.core.middleware import StandardResponseMiddleware, mark_enveloped_routes
+from app.core.query_counter import QueryCounterMiddleware, instrument_engine as count_queries
+from app.core.replica import replica_monitor
+from app.core.timing import ServerTimingMiddleware, instrument_engine
 from sqlalchemy.exc import SQLAlchemyError
 from app.modules.users.router import router as users_router
 from app.modules.groups.router import router as groups_router
 from app.modules.analytics.router import router as analytics_router
+from app.modules.analytics.service import analytics_service
 from app.modules.auth.router import router as auth_router
+from app.modules.auth.revocation import access_token_revocation_list
 from app.modules.group_members.router import router as group_members_router
+from app.modules.jobs.router import router as jobs_router
+from app.modules.jobs.worker import job_worker
 from app.modules.transactions.router import router as transactions_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Инициализация при старте приложения"""
+    # Логгер uvicorn уже настроен на уровень INFO, корневой логгер - нет
+    logging.getLogger("uvicorn.error").info(f"Профиль движка БД {engine_profile.describe()}")
+
     # Инициализация БД
     try:
         await init_db()
+        await warm_up_pool()
     except Exception as e:
         # Логируем ошибку, но не падаем при старте
         # БД может быть недоступна при первом запуске
-        import logging
-
         logging.warning(f"Не удалось инициализировать БД при старте: {e}")
+
+    # Синхронизация списка отозванных access токенов в памяти воркера
+    revocation_sync = asyncio.create_task(
+        access_token_revocation_list.run_sync_loop(
+            AsyncSessionLocal, settings.ACCESS_TOKEN_REVOCATION_SYNC_SECONDS
+        )
+    )
+    background_tasks = [revocation_sync]
+
+    # Проверка отставания реплики для чтения
+    if ReadSessionLocal is not None:
+        background_tasks.append(
+            asyncio.create_task(
+                replica_monitor.run_check_loop(
+                    ReadSessionLocal, settings.DATABASE_READ_CHECK_SECONDS
+                )
+            )
+        )
+
+    # Исполнители фоновых задач из очереди jobs
+    if settings.JOB_WORKER_CONCURRENCY > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                job_worker.run(
+                    AsyncSessionLocal,
+                    settings.JOB_WORKER_CONCURRENCY,
+                    settings.JOB_POLL_INTERVAL_SECONDS,
+                    settings.JOB_REAP_INTERVAL_SECONDS,
+                )
+            )
+        )
+
+    # Прогрев matplotlib не задерживает приём запросов
+    if settings.CHART_WARMUP_ON_STARTUP:
+        background_tasks.append(asyncio.create_task(analytics_service.warm_up()))
     yield
     # Очистка при завершении
-    await engine.dispose()
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    for db_engine in all_engines():
+        await db_engine.dispose()
 
 
 app = FastAPI(
@@ -49,6 +109,14 @@ app = FastAPI(
 # Middleware для стандартизированного формата ответов (добавляем первым, чтобы выполнялся последним)
 app.add_middleware(StandardResponseMiddleware)
 
+# Сжатие ответов (выполняется после обёртки в стандартный формат)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
@@ -58,6 +126,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.DEBUG:
+    for db_engine in all_engines():
+        count_queries(db_engine.sync_engine)
+    app.add_middleware(
+        QueryCounterMiddleware, n_plus_one_threshold=settings.QUERY_N_PLUS_ONE_THRESHOLD
+    )
+
+if settings.METRICS_ENABLED:
+    for db_engine in all_engines():
+        register_pool_collector(db_engine.pool, "primary" if db_engine is engine else "replica")
+    app.add_middleware(MetricsMiddleware)
+
+# Server-Timing добавляем последним, чтобы замер охватывал все остальные middleware
+if settings.SERVER_TIMING_SAMPLE_RATE > 0:
+    for db_engine in all_engines():
+        instrument_engine(db_engine.sync_engine)
+    app.add_middleware(ServerTimingMiddleware, sample_rate=settings.SERVER_TIMING_SAMPLE_RATE)
+
 # Регистрация обработчиков исключений
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -70,6 +156,10 @@ app.include_router(groups_router, prefix=settings.API_V1_STR)
 app.include_router(group_members_router, prefix=settings.API_V1_STR)
 app.include_router(analytics_router, prefix=settings.API_V1_STR)
 app.include_router(transactions_router, prefix=settings.API_V1_STR)
+app.include_router(jobs_router, prefix=settings.API_V1_STR)
+
+# Маршруты с response_model=StandardResponse[...] middleware пропускает без изменений
+mark_enveloped_routes(app.routes)
 
 
 @app.get("/")
@@ -80,3 +170,12 @@ async def root() -> dict[str, str]:
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request) -> PlainTextResponse:
+        if not metrics_authorized(request.headers.get("authorization"), settings.METRICS_TOKEN):
+            raise CredentialsException(detail="Неверный токен метрик")
+        return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -1,32 +1,40 @@
 # Эндпоинты аналитики
 
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.cancellation import request_timeout
+from app.core.compression import skip_compression
 from app.core.dto.response import StandardResponse, success_response
-from app.core.dependencies import get_current_user
+from app.core.etag import check_not_modified, make_etag
+from app.core.routing import StandardResponseRoute
+from app.core.dependencies import get_current_user, get_group_read_db, get_read_db
 from app.modules.users.models import User
 from app.modules.analytics.schemas import AnalyticsResponse, GroupAnalyticsResponse
 from app.modules.analytics.service import analytics_service
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=StandardResponseRoute)
 
 
 @router.get(
     "",
     response_model=StandardResponse[AnalyticsResponse],
 )
+@request_timeout("report")
 async def get_analytics(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str
     | None = Query(
         None,
         description="Период в формате YYYY-MM (например, 2025-01) или 'month' для текущего месяца. Если не указан, используется текущий месяц",
     ),
-) -> StandardResponse[AnalyticsResponse]:
+) -> StandardResponse[AnalyticsResponse] | Response:
     """
     Получить аналитику по расходам за указанный период.
 
@@ -36,6 +44,14 @@ async def get_analytics(
     - expense: общий расход за период
     - by_category: расходы по категориям
     """
+    # Текущий месяц входит в ETag: без явного периода ответ меняется со сменой месяца
+    etag = make_etag(
+        "user", current_user.id, current_user.data_version, datetime.now().strftime("%Y-%m")
+    )
+    not_modified = check_not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
     result = await analytics_service.get_analytics(
         db=db,
         user_id=int(current_user.id),
@@ -45,7 +61,8 @@ async def get_analytics(
     return success_response(data=result)
 
 
-@router.get("/groups/{group_id}", response_model=GroupAnalyticsResponse)
+@router.get("/groups/{group_id}", response_model=StandardResponse[GroupAnalyticsResponse])
+@request_timeout("report")
 async def get_group_analytics(
     group_id: int,
     period: str
@@ -53,26 +70,30 @@ async def get_group_analytics(
         None,
         description="Период в формате YYYY-MM (например, 2025-01) или 'month' для текущего месяца. Если не указан, используется текущий месяц",
     ),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_group_read_db),
     current_user: User = Depends(get_current_user),
-) -> GroupAnalyticsResponse:
+) -> StandardResponse[GroupAnalyticsResponse]:
     """
     Получить аналитику по расходам в конкретной группе за указанный период
     """
-    return await analytics_service.get_group_analytics(
+    result = await analytics_service.get_group_analytics(
         db=db,
         user_id=int(current_user.id),
         group_id=group_id,
         period=period,
     )
 
+    return success_response(data=result)
+
 
 @router.get(
     "/chart",
     response_class=Response,
 )
+@skip_compression
+@request_timeout("report")
 async def get_expenses_chart(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     period: str
     | None = Query(
@@ -98,9 +119,11 @@ async def get_expenses_chart(
     "/chart/group/{group_id}",
     response_class=Response,
 )
+@skip_compression
+@request_timeout("report")
 async def get_group_chart(
     group_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_group_read_db),
     current_user: User = Depends(get_current_user),
     period: str
     | None = Query(
@@ -1,25 +1,67 @@
 # Расчёт аналитики и статистики
 
 import io
+import time
 from calendar import monthrange
 from datetime import datetime
+from functools import cache
+from types import ModuleType
+from typing import Any, Callable
 
+from anyio import CapacityLimiter, to_thread
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import CHART_RENDER_DURATION
+from app.core.timing import span
 from app.modules.analytics.schemas import AnalyticsResponse, GroupAnalyticsResponse
+from app.modules.group_members.service import group_member_service
 from app.modules.groups.repository import group_repository
 from app.modules.transactions.repository import transaction_repository
 
-import matplotlib
 
-matplotlib.use("Agg")  # Используем неинтерактивный бэкенд
-import matplotlib.pyplot as plt  # noqa: E402
+@cache
+def pyplot() -> ModuleType:
+    """
+    matplotlib.pyplot, импортируемый при первой отрисовке.
+
+    Импорт matplotlib занимает около половины времени импорта приложения,
+    а диаграммы нужны малой доле запросов.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")  # Используем неинтерактивный бэкенд
+    import matplotlib.pyplot as plt
+
+    return plt
 
 
 class AnalyticsService:
     """Сервис для расчета аналитики по транзакциям"""
 
+    def __init__(self) -> None:
+        self._render_limiter: CapacityLimiter | None = None
+
+    async def _render_chart(self, chart: str, render: Callable[..., bytes], *args: Any) -> bytes:
+        """
+        Отрисовать диаграмму в пуле потоков, не блокируя event loop.
+
+        pyplot хранит глобальное состояние, поэтому диаграммы рисуются по одной.
+        Отрисовка, ожидающая своей очереди, отменяется вместе с запросом.
+        """
+        if self._render_limiter is None:
+            self._render_limiter = CapacityLimiter(1)
+
+        def timed_render() -> tuple[bytes, float]:
+            started = time.perf_counter()
+            return render(*args), time.perf_counter() - started
+
+        with span("render"):
+            image, duration = await to_thread.run_sync(timed_render, limiter=self._render_limiter)
+        # Метрики обновляются только из потока event loop
+        CHART_RENDER_DURATION.labels(chart).observe(duration)
+        return image
+
     def _normalize_period(self, period: str | None) -> str:
         """
         Нормализует период в формат YYYY-MM.
@@ -124,8 +166,16 @@ class AnalyticsService:
             GroupAnalyticsResponse: Аналитика по группе
         """
         # Проверяем, состоит ли пользователь в группе
-        group = await group_repository.get_group(db=db, group_id=group_id, id_user=user_id)
+        is_member = await group_member_service.is_member(db, group_id, user_id)
 
+        if not is_member:
+            raise HTTPException(
+                status_code=403,
+                detail="Пользователь не является участником этой группы или группа не существует",
+            )
+
+        # Название группы (без загрузки участников)
+        group = await group_repository.get_group_by_id(db, group_id)
         if not group:
             raise HTTPException(
                 status_code=403,
@@ -170,8 +220,16 @@ class AnalyticsService:
             member_expenses=member_expenses,
         )
 
+    async def warm_up(self) -> None:
+        """
+        Импортировать matplotlib и отрисовать пустую диаграмму в пуле потоков:
+        построение кэша шрифтов не достаётся первому запросу диаграммы.
+        """
+        await self._render_chart("warmup", self._create_empty_chart, "")
+
     def _create_empty_chart(self, message: str) -> bytes:
         """Создает пустое изображение с сообщением"""
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(8, 8))
         ax.text(0.5, 0.5, message, ha="center", va="center", fontsize=16)
         ax.axis("off")
@@ -207,6 +265,10 @@ class AnalyticsService:
             period=period,
         )
 
+        return await self._render_chart("expenses", self._render_expenses_chart, analytics)
+
+    def _render_expenses_chart(self, analytics: AnalyticsResponse) -> bytes:
+        """Отрисовать круговую диаграмму расходов пользователя по категориям"""
         # Получаем нормализованный период из результата
         normalized_period = analytics.period
 
@@ -219,6 +281,7 @@ class AnalyticsService:
         amounts = list(analytics.by_category.values())
 
         # Создаем круговую диаграмму
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(10, 8))
 
         # Используем русские шрифты для корректного отображения
@@ -288,6 +351,13 @@ class AnalyticsService:
             period=period,
         )
 
+        chart_label = "group_member" if chart_type == "member" else "group_category"
+        return await self._render_chart(
+            chart_label, self._render_group_chart, analytics, chart_type
+        )
+
+    def _render_group_chart(self, analytics: GroupAnalyticsResponse, chart_type: str) -> bytes:
+        """Отрисовать диаграмму расходов группы по категориям или по участникам"""
         # Получаем нормализованный период из результата
         normalized_period = analytics.period
 
@@ -338,6 +408,7 @@ class AnalyticsService:
             )
 
         # Создаем круговую диаграмму
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(12, 10))
 
         plt.rcParams["font.sans-serif"] = ["DejaVu Sans", "Arial", "sans-serif"]
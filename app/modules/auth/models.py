@@ -18,3 +18,15 @@ class RefreshToken(BaseModel):
     is_revoked = Column(Boolean, default=False, nullable=False)
 
     user = relationship("User", back_populates="refresh_tokens")
+
+
+class RevokedAccessToken(BaseModel):
+    """Отозванный access токен (до истечения его срока действия)"""
+
+    __tablename__ = "revoked_access_tokens"
+
+    token_jti = Column(String(64), unique=True, nullable=False, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
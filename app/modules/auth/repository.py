@@ -1,9 +1,11 @@
 from datetime import datetime
+from typing import Sequence
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.auth.models import RefreshToken
+from app.modules.auth.models import RefreshToken, RevokedAccessToken
 
 
 class RefreshTokenRepository:
@@ -41,3 +43,41 @@ class RefreshTokenRepository:
 
 
 refresh_token_repository = RefreshTokenRepository()
+
+
+class RevokedAccessTokenRepository:
+    """Работа с отозванными access токенами"""
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        token_jti: str,
+        user_id: int,
+        expires_at: datetime,
+    ) -> None:
+        """
+        Записать отзыв токена. Повторный выход с тем же токеном (двойной клик,
+        повтор запроса клиентом) не нарушает уникальность token_jti.
+        """
+        await db.execute(
+            insert(RevokedAccessToken)
+            .values(token_jti=token_jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[RevokedAccessToken.token_jti])
+        )
+
+    async def list_active_since(
+        self, db: AsyncSession, *, created_after: datetime | None, now: datetime
+    ) -> Sequence[RevokedAccessToken]:
+        """
+        Получить ещё не истекшие отозванные токены, созданные после указанного момента.
+        Если created_after не указан, возвращаются все активные записи (первичная загрузка).
+        """
+        query = select(RevokedAccessToken).where(RevokedAccessToken.expires_at > now)
+        if created_after is not None:
+            query = query.where(RevokedAccessToken.created_at >= created_after)
+        result = await db.execute(query.order_by(RevokedAccessToken.created_at))
+        return result.scalars().all()
+
+
+revoked_access_token_repository = RevokedAccessTokenRepository()
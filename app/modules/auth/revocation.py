@@ -0,0 +1,145 @@
+"""
+Список отозванных access токенов в памяти воркера.
+
+Проверка выполняется без обращения к БД: фильтр Блума отсекает подавляющее
+большинство неотозванных токенов, а точное множество подтверждает попадание.
+Источником истины остаётся таблица revoked_access_tokens, которая
+периодически подгружается инкрементально.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.modules.auth.repository import revoked_access_token_repository
+
+logger = logging.getLogger(__name__)
+
+# Запас при инкрементальной подгрузке: created_at выставляется в начале транзакции,
+# поэтому запись может стать видимой позже, чем был сделан предыдущий срез
+SYNC_OVERLAP = timedelta(seconds=30)
+
+# Доля удалённых jti среди ключей фильтра Блума, после которой фильтр пересобирается.
+# Удалённые jti только повышают долю ложных срабатываний, которые отсекает точное
+# множество, поэтому пересобирать фильтр при каждом удалении не нужно
+BLOOM_REBUILD_STALE_SHARE = 0.25
+
+
+class BloomFilter:
+    """Фильтр Блума на bytearray с двойным хэшированием"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+
+class AccessTokenRevocationList:
+    """Фильтр Блума + точное множество jti отозванных access токенов"""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001) -> None:
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._revoked: dict[str, datetime] = {}
+        # Удалённые из _revoked jti, которые ещё остались в фильтре Блума
+        self._stale = 0
+        self._synced_at: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Проверить, отозван ли токен (O(1), без обращения к БД)"""
+        if jti not in self._bloom:
+            return False
+        return jti in self._revoked
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Добавить jti в локальный список"""
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        self._bloom.add(jti)
+        if len(self._revoked) > self._capacity:
+            # Фильтр переполнен - пересобираем с запасом, чтобы не рос процент ложных срабатываний
+            self._capacity *= 2
+            self._rebuild()
+
+    def prune(self, now: datetime | None = None) -> int:
+        """
+        Удалить истекшие записи. Истекший токен и так отклоняется проверкой exp,
+        поэтому хранить его дольше не нужно. Из фильтра Блума удалять нельзя -
+        фильтр пересобирается, когда удалённые записи составляют больше
+        BLOOM_REBUILD_STALE_SHARE его ключей или вместе с живыми превышают ёмкость.
+        """
+        now = now or datetime.now(timezone.utc)
+        expired = [jti for jti, expires_at in self._revoked.items() if expires_at <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        self._stale += len(expired)
+        keys = len(self._revoked) + self._stale
+        if self._stale > keys * BLOOM_REBUILD_STALE_SHARE or keys > self._capacity:
+            self._rebuild()
+        return len(expired)
+
+    def _rebuild(self) -> None:
+        bloom = BloomFilter(self._capacity, self._error_rate)
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+        self._stale = 0
+
+    async def sync(self, db: AsyncSession) -> int:
+        """Подгрузить новые записи из revoked_access_tokens. Возвращает число добавленных jti."""
+        now = datetime.now(timezone.utc)
+        created_after = self._synced_at - SYNC_OVERLAP if self._synced_at else None
+        rows = await revoked_access_token_repository.list_active_since(
+            db, created_after=created_after, now=now
+        )
+        before = len(self._revoked)
+        for row in rows:
+            self.add(str(row.token_jti), row.expires_at)  # type: ignore[arg-type]
+        self._synced_at = now
+        self.prune(now)
+        return max(len(self._revoked) - before, 0)
+
+    async def run_sync_loop(
+        self, session_factory: async_sessionmaker[AsyncSession], interval: float
+    ) -> None:
+        """Фоновая синхронизация с БД (запускается в lifespan приложения)"""
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.sync(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось синхронизировать отозванные access токены: {e}")
+            await asyncio.sleep(interval)
+
+
+access_token_revocation_list = AccessTokenRevocationList(
+    capacity=settings.ACCESS_TOKEN_REVOCATION_CAPACITY
+)
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, security
 from app.core.exceptions import CredentialsException
+from app.core.rate_limit import client_ip, login_rate_limiter
 from app.core.dto.response import StandardResponse, success_response
-from app.modules.auth.schemas import Token, Login, RefreshTokenRequest, PasswordChange
+from app.core.routing import StandardResponseRoute
+from app.modules.auth.schemas import (
+    Token,
+    Login,
+    LogoutRequest,
+    RefreshTokenRequest,
+    PasswordChange,
+)
 from app.modules.auth.service import auth_service
 from app.modules.users.models import User
 from app.modules.users.schemas import UserCreate
 from app.modules.users.service import user_service
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=StandardResponseRoute)
 
 
 @router.post(
@@ -29,11 +38,17 @@ async def register(
 
 
 @router.post("/login", response_model=StandardResponse[Token])
-async def login(login_data: Login, db: AsyncSession = Depends(get_db)) -> StandardResponse[Token]:
+async def login(
+    request: Request, login_data: Login, db: AsyncSession = Depends(get_db)
+) -> StandardResponse[Token]:
     """
     Авторизация пользователя.
     Возвращает access и refresh токены.
+
+    Попытки входа ограничены по IP клиента и по имени пользователя:
+    при превышении лимита возвращается 429 до обращения к БД и проверки пароля.
     """
+    login_rate_limiter.check(client_ip(request), login_data.username)
     user = await auth_service.authenticate_user(db, login_data.username, login_data.password)
     if not user:
         raise CredentialsException(detail="Неверное имя пользователя или пароль")
@@ -53,6 +68,30 @@ async def refresh_token(
     return success_response(data=tokens)
 
 
+@router.post("/logout", response_model=StandardResponse[dict])
+async def logout(
+    logout_data: LogoutRequest | None = Body(None),
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StandardResponse[dict]:
+    """
+    Выход из системы.
+    Отзывает текущий access токен до истечения его срока действия
+    и, если передан, refresh токен.
+    """
+    if not credentials:
+        raise CredentialsException(detail="Authorization header missing")
+
+    await auth_service.logout(
+        db=db,
+        user=current_user,
+        access_token=credentials.credentials,
+        refresh_token=logout_data.refresh_token if logout_data else None,
+    )
+    return success_response(data={"message": "Выход выполнен"})
+
+
 @router.post("/change-password", response_model=StandardResponse[dict])
 async def change_password(
     password_data: PasswordChange,
@@ -19,6 +19,11 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    """Схема для выхода из системы"""
+    refresh_token: str | None = Field(None, description="Refresh токен, который нужно отозвать")
+
+
 class PasswordChange(BaseModel):
     """Схема для смены пароля"""
     old_password: str = Field(..., description="Текущий пароль")
@@ -8,14 +8,18 @@ from app.core.config import settings
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    verify_password,
+    verify_password_async,
     decode_access_token,
     hash_token,
 )
 from app.modules.users.models import User
 from app.modules.users.service import user_service
 from app.core.exceptions import CredentialsException
-from app.modules.auth.repository import refresh_token_repository
+from app.modules.auth.repository import (
+    refresh_token_repository,
+    revoked_access_token_repository,
+)
+from app.modules.auth.revocation import access_token_revocation_list
 
 
 class AuthService:
@@ -32,7 +36,7 @@ class AuthService:
         if not user.hashed_password:
             return None
 
-        if not verify_password(password, user.hashed_password):  # type: ignore[arg-type]
+        if not await verify_password_async(password, user.hashed_password):  # type: ignore[arg-type]
             return None
 
         return user
@@ -112,6 +116,10 @@ class AuthService:
         if payload.get("type") != "access":
             raise CredentialsException(detail="Неподдерживаемый тип токена")
 
+        token_jti = payload.get("jti")
+        if token_jti and access_token_revocation_list.is_revoked(token_jti):
+            raise CredentialsException(detail="Access токен был отозван")
+
         username = payload.get("sub")
         if not username:
             raise CredentialsException(detail="Неверная структура токена")
@@ -122,5 +130,48 @@ class AuthService:
 
         return user
 
+    @staticmethod
+    async def revoke_access_token(db: AsyncSession, user: User, token: str) -> None:
+        """
+        Отозвать access токен до истечения его срока действия.
+        Изменения сессии фиксируются здесь же: текущий воркер узнаёт об отзыве сразу
+        после commit, остальные - при следующей синхронизации.
+        """
+        payload = decode_access_token(token)
+        if not payload or payload.get("type") != "access":
+            raise CredentialsException(detail="Недействительный access токен")
+
+        token_jti = payload.get("jti")
+        if not token_jti:
+            raise CredentialsException(detail="Токен не поддерживает отзыв")
+
+        expires_at = datetime.fromtimestamp(int(payload["exp"]), tz=timezone.utc)
+        await revoked_access_token_repository.create(
+            db,
+            token_jti=token_jti,
+            user_id=user.id,  # type: ignore[arg-type]
+            expires_at=expires_at,
+        )
+        await db.commit()
+        # Только после commit: при откате токен не должен считаться отозванным
+        access_token_revocation_list.add(token_jti, expires_at)
+
+    @staticmethod
+    async def logout(
+        db: AsyncSession, user: User, access_token: str, refresh_token: str | None = None
+    ) -> None:
+        """
+        Выход: отзыв текущего access токена и, если передан, refresh токена.
+        Оба отзыва фиксируются одним commit в revoke_access_token.
+        """
+        payload = decode_access_token(refresh_token) if refresh_token else None
+        token_jti = payload.get("jti") if payload else None
+        if token_jti:
+            token_record = await refresh_token_repository.get_by_jti(db, token_jti)
+            if token_record and token_record.user_id == user.id and not token_record.is_revoked:
+                await refresh_token_repository.revoke(db, token_record)
+
+        await AuthService.revoke_access_token(db, user, access_token)
+
 
 auth_service = AuthService()
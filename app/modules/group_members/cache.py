@@ -0,0 +1,64 @@
+"""
+Кэш членства в группах в памяти воркера.
+
+По бизнес-правилу пользователь состоит не более чем в одной группе
+(ограничение uq_group_members_user_id), поэтому кэш хранит соответствие
+user_id -> group_id (None - пользователь не состоит в группе).
+Изменения членства, выполненные текущим воркером, сбрасывают записи явно,
+изменения других воркеров становятся видны не позже чем через ttl секунд.
+"""
+
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class MembershipCache:
+    """LRU кэш user_id -> group_id с ограниченным временем жизни записей"""
+
+    def __init__(self, ttl: float = 10.0, capacity: int = 100_000) -> None:
+        self.ttl = ttl
+        self.capacity = capacity
+        # user_id -> (group_id, момент истечения по time.monotonic)
+        self._entries: OrderedDict[int, tuple[int | None, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, user_id: int) -> tuple[bool, int | None]:
+        """Найти группу пользователя в кэше. Возвращает (найдено, group_id)."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False, None
+        group_id, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return False, None
+        self._entries.move_to_end(user_id)
+        return True, group_id
+
+    def set(self, user_id: int, group_id: int | None) -> None:
+        """Запомнить группу пользователя"""
+        self._entries[user_id] = (group_id, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Сбросить записи пользователей (после изменения их членства)"""
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+
+    def invalidate_group(self, group_id: int) -> None:
+        """Сбросить записи всех участников группы (после удаления группы)"""
+        stale = [user_id for user_id, (cached, _) in self._entries.items() if cached == group_id]
+        self.invalidate(*stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+membership_cache = MembershipCache(
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS, capacity=settings.MEMBERSHIP_CACHE_CAPACITY
+)
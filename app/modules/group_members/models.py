@@ -8,7 +8,11 @@ class GroupMember(BaseModel):
     group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
-    __table_args__ = (UniqueConstraint("group_id", "user_id", name="uq_group_user"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "user_id", name="uq_group_user"),
+        # Пользователь состоит не более чем в одной группе (миграция 98927c5112d8)
+        UniqueConstraint("user_id", name="uq_group_members_user_id"),
+    )
 
     group = relationship("Group", back_populates="group_links")
     user = relationship("User", back_populates="group_links")
@@ -1,7 +1,26 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import (
+    BindParameter,
+    Integer,
+    Row,
+    any_,
+    exists,
+    func,
+    literal,
+    select,
+    delete,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from app.shared.mixins import CRUDMixin
 from .models import GroupMember
+from ..groups.models import Group
+from ..users.models import User
+
+
+def _id_array(ids: list[int]) -> BindParameter[list[int]]:
+    """Список ID одним параметром-массивом (для = ANY(...) и unnest(...))"""
+    return literal(ids, ARRAY(Integer))
 
 
 class GroupMemberRepository(CRUDMixin[GroupMember]):
@@ -30,6 +49,206 @@ class GroupMemberRepository(CRUDMixin[GroupMember]):
         q = await db.execute(select(GroupMember).where(GroupMember.user_id == user_id))
         return q.scalar_one_or_none() is not None
 
+    async def get_user_group_id(self, db: AsyncSession, user_id: int) -> int | None:
+        """
+        Получить ID группы пользователя без загрузки строк группы и участников.
+
+        Пользователь состоит не более чем в одной группе (uq_group_members_user_id).
+
+        Returns:
+            int | None: ID группы или None, если пользователь не состоит в группе
+        """
+        q = await db.execute(select(GroupMember.group_id).where(GroupMember.user_id == user_id))
+        return q.scalar_one_or_none()
+
+    async def add_member(
+        self, db: AsyncSession, group_id: int, user_id: int, requester_id: int
+    ) -> Row:
+        """
+        Добавить участника в группу одним запросом.
+
+        Вставка выполняется, только если группа существует, запрос делает её
+        владелец, пользователь существует и не состоит ни в одной группе.
+        Одновременные вставки разрешаются ограничениями uq_group_user
+        и uq_group_members_user_id (ON CONFLICT DO NOTHING). При успешной
+        вставке в том же запросе увеличивается версия данных группы.
+
+        Returns:
+            Row: (owner_id, user_exists, current_group_id, added) - владелец группы
+                 (None, если группы нет), существует ли пользователь, группа, в которой
+                 он уже состоит, и была ли выполнена вставка.
+        """
+        groups = Group.__table__
+        members = GroupMember.__table__
+        target_group = (
+            select(groups.c.id, groups.c.owner_id)
+            .where(groups.c.id == group_id)
+            .cte("target_group")
+        )
+        current_group = (
+            select(members.c.group_id).where(members.c.user_id == user_id).cte("current_group")
+        )
+        added = (
+            insert(members)
+            .from_select(
+                ["group_id", "user_id"],
+                select(target_group.c.id, literal(user_id)).where(
+                    target_group.c.owner_id == requester_id,
+                    literal(user_id) != requester_id,
+                    exists().where(User.id == user_id),
+                    ~exists(select(current_group.c.group_id)),
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(members.c.group_id)
+            .cte("added")
+        )
+        bumped = (
+            update(groups)
+            .where(groups.c.id.in_(select(added.c.group_id)))
+            .values(data_version=groups.c.data_version + 1, updated_at=groups.c.updated_at)
+            .returning(groups.c.id)
+            .cte("bumped")
+        )
+        result = await db.execute(
+            select(
+                select(target_group.c.owner_id).scalar_subquery().label("owner_id"),
+                exists().where(User.id == user_id).label("user_exists"),
+                select(current_group.c.group_id).scalar_subquery().label("current_group_id"),
+                exists(select(bumped.c.id)).label("added"),
+            )
+        )
+        return result.one()
+
+    async def remove_member(
+        self, db: AsyncSession, group_id: int, user_id: int, requester_id: int
+    ) -> Row:
+        """
+        Удалить участника из группы одним запросом.
+
+        Удаление выполняется, только если запрос делает владелец группы и удаляет
+        не себя. При успешном удалении в том же запросе увеличивается версия данных группы.
+
+        Returns:
+            Row: (owner_id, removed) - владелец группы (None, если группы нет)
+                 и было ли выполнено удаление.
+        """
+        groups = Group.__table__
+        members = GroupMember.__table__
+        target_group = select(groups.c.owner_id).where(groups.c.id == group_id).cte("target_group")
+        removed = (
+            delete(members)
+            .where(
+                members.c.group_id == group_id,
+                members.c.user_id == user_id,
+                literal(user_id) != requester_id,
+                exists().where(target_group.c.owner_id == requester_id),
+            )
+            .returning(members.c.group_id)
+            .cte("removed")
+        )
+        bumped = (
+            update(groups)
+            .where(groups.c.id.in_(select(removed.c.group_id)))
+            .values(data_version=groups.c.data_version + 1, updated_at=groups.c.updated_at)
+            .returning(groups.c.id)
+            .cte("bumped")
+        )
+        result = await db.execute(
+            select(
+                select(target_group.c.owner_id).scalar_subquery().label("owner_id"),
+                exists(select(bumped.c.id)).label("removed"),
+            )
+        )
+        return result.one()
+
+    async def lock_group_owner(self, db: AsyncSession, group_id: int) -> int | None:
+        """
+        Получить владельца группы, заблокировав строку группы до конца транзакции.
+
+        Блокировка упорядочивает пакетные изменения состава одной группы.
+
+        Returns:
+            int | None: ID владельца или None, если группы нет
+        """
+        q = await db.execute(select(Group.owner_id).where(Group.id == group_id).with_for_update())
+        return q.scalar_one_or_none()
+
+    async def get_existing_user_ids(self, db: AsyncSession, user_ids: list[int]) -> set[int]:
+        """Какие из пользователей существуют - один запрос id = ANY(...)"""
+        q = await db.execute(select(User.id).where(User.id == any_(_id_array(user_ids))))
+        return set(q.scalars().all())
+
+    async def get_memberships(self, db: AsyncSession, user_ids: list[int]) -> dict[int, int]:
+        """Группы пользователей, которые уже состоят в группах: {user_id: group_id}"""
+        q = await db.execute(
+            select(GroupMember.user_id, GroupMember.group_id).where(
+                GroupMember.user_id == any_(_id_array(user_ids))
+            )
+        )
+        return {user_id: group_id for user_id, group_id in q.all()}
+
+    async def add_members(self, db: AsyncSession, group_id: int, user_ids: list[int]) -> int:
+        """
+        Добавить пользователей в группу одной многострочной вставкой
+        и увеличить версию данных группы.
+
+        Строки, конфликтующие с uq_group_user или uq_group_members_user_id
+        (одновременное добавление в другую группу), пропускаются.
+
+        Returns:
+            int: Количество добавленных участников
+        """
+        groups = Group.__table__
+        members = GroupMember.__table__
+        added = (
+            insert(members)
+            .from_select(
+                ["group_id", "user_id"],
+                select(literal(group_id), func.unnest(_id_array(user_ids))),
+            )
+            .on_conflict_do_nothing()
+            .returning(members.c.user_id)
+            .cte("added")
+        )
+        bumped = (
+            update(groups)
+            .where(groups.c.id == group_id, exists(select(added.c.user_id)))
+            .values(data_version=groups.c.data_version + 1, updated_at=groups.c.updated_at)
+            .returning(groups.c.id)
+            .cte("bumped")
+        )
+        # Изменяющие CTE выполняются всегда, даже если основной запрос не читает их результат
+        result = await db.execute(select(func.count()).select_from(added).add_cte(bumped))
+        return result.scalar_one()
+
+    async def remove_members(
+        self, db: AsyncSession, group_id: int, user_ids: list[int]
+    ) -> list[int]:
+        """
+        Удалить пользователей из группы одним запросом и увеличить версию данных группы.
+
+        Returns:
+            list[int]: ID удалённых участников
+        """
+        groups = Group.__table__
+        members = GroupMember.__table__
+        removed = (
+            delete(members)
+            .where(members.c.group_id == group_id, members.c.user_id == any_(_id_array(user_ids)))
+            .returning(members.c.user_id)
+            .cte("removed")
+        )
+        bumped = (
+            update(groups)
+            .where(groups.c.id == group_id, exists(select(removed.c.user_id)))
+            .values(data_version=groups.c.data_version + 1, updated_at=groups.c.updated_at)
+            .returning(groups.c.id)
+            .cte("bumped")
+        )
+        result = await db.execute(select(removed.c.user_id).add_cte(bumped))
+        return list(result.scalars().all())
+
     async def remove(self, db: AsyncSession, group_id: int, user_id: int) -> None:
         await db.execute(
             delete(GroupMember)
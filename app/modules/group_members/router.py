@@ -4,11 +4,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.core.dependencies import get_current_user
 from app.core.dto.response import StandardResponse, success_response
-from .schemas import GroupMemberCreate, GroupMemberDelete, GroupMemberResponse
+from app.core.routing import StandardResponseRoute
+from .schemas import (
+    GroupMemberCreate,
+    GroupMemberDelete,
+    GroupMemberResponse,
+    GroupMembersBatch,
+    GroupMembersBatchResponse,
+)
 from .service import group_member_service
 from app.modules.users.models import User
 
-router = APIRouter(prefix="/group-members", tags=["group_members"])
+router = APIRouter(
+    prefix="/group-members", tags=["group_members"], route_class=StandardResponseRoute
+)
 
 
 @router.post("/add_member", response_model=StandardResponse[GroupMemberResponse])
@@ -41,3 +50,18 @@ async def remove_member(
         db=db, group_id=data.group_id, user_id=data.user_id, requester_id=int(current_user.id)
     )
     return success_response(data=result)
+
+
+@router.post("/batch", response_model=StandardResponse[GroupMembersBatchResponse])
+async def batch_members(
+    data: GroupMembersBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StandardResponse[GroupMembersBatchResponse]:
+    """
+    Добавить (action=add) или удалить (action=remove) список участников группы.
+    Все изменения выполняются в одной транзакции: при ошибке состав группы не меняется.
+    Только владелец группы может менять состав группы.
+    """
+    result = await group_member_service.batch(db=db, data=data, requester_id=int(current_user.id))
+    return success_response(data=result)
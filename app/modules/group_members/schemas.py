@@ -1,5 +1,11 @@
 # group_members/schemas.py
-from pydantic import BaseModel
+from typing import List, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+# Наибольшее количество пользователей в одном пакетном запросе
+MAX_BATCH_SIZE = 500
+
 
 class GroupMemberCreate(BaseModel):
     group_id: int
@@ -16,4 +22,21 @@ class GroupMemberResponse(BaseModel):
     user_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class GroupMembersBatch(BaseModel):
+    group_id: int
+    action: Literal["add", "remove"]
+    # ID пользователей, которых добавляем или удаляем (повторы отбрасываются)
+    user_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+    @field_validator("user_ids")
+    @classmethod
+    def unique_user_ids(cls, user_ids: List[int]) -> List[int]:
+        return list(dict.fromkeys(user_ids))
+
+class GroupMembersBatchResponse(BaseModel):
+    status: str
+    message: str = ""
+    group_id: int
+    user_ids: List[int]
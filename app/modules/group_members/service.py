@@ -1,10 +1,18 @@
+from typing import Iterable
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import is_replica_session
+
+from .cache import membership_cache
 from .repository import group_member_repository
-from .schemas import GroupMemberResponse
-from .models import GroupMember
-from ..groups.repository import group_repository  # Импортируем репозиторий групп
-from ..users.service import user_service
+from .schemas import GroupMemberResponse, GroupMembersBatch, GroupMembersBatchResponse
+
+USER_IN_ANOTHER_GROUP = (
+    "Пользователь уже состоит в другой группе. "
+    "Один пользователь может состоять только в одной группе."
+)
 
 
 class GroupMemberService:
@@ -21,12 +29,28 @@ class GroupMemberService:
         """
         return await group_member_repository.user_in_any_group(db, user_id)
 
-    async def add_owner(self, db: AsyncSession, group_id: int, user_id: int) -> GroupMember:
-        exists = await group_member_repository.exists(db, group_id, user_id)
-        if exists:
-            raise HTTPException(400, "Пользователь уже в группе")
+    async def get_user_group_id(self, db: AsyncSession, user_id: int) -> int | None:
+        """
+        ID группы пользователя (None - не состоит в группе).
 
-        return await group_member_repository.create(db, {"group_id": group_id, "user_id": user_id})
+        Один запрос к group_members без загрузки группы и её участников.
+        Кэш членства используют и чтение, и запросы на изменение данных: изменения
+        членства в этом воркере сбрасывают его записи, в других - видны не позже TTL.
+        Кэш заполняется только по основной БД: реплика может отставать,
+        и устаревшее членство прожило бы в кэше весь TTL.
+        """
+        if is_replica_session(db):
+            return await group_member_repository.get_user_group_id(db, user_id)
+        found, cached_group_id = membership_cache.lookup(user_id)
+        if found:
+            return cached_group_id
+        group_id = await group_member_repository.get_user_group_id(db, user_id)
+        membership_cache.set(user_id, group_id)
+        return group_id
+
+    async def is_member(self, db: AsyncSession, group_id: int, user_id: int) -> bool:
+        """Проверить, состоит ли пользователь в группе"""
+        return await self.get_user_group_id(db, user_id) == group_id
 
     async def add(
         self, db: AsyncSession, group_id: int, user_id: int, requester_id: int
@@ -44,39 +68,34 @@ class GroupMemberService:
             requester_id: ID пользователя, который делает запрос (должен быть владельцем)
         """
         try:
-            # Проверяем, является ли requester владельцем группы
-            group = await group_repository.get_group_by_id(db, group_id)
-            if not group:
+            # Все проверки, вставка и увеличение версии группы - один запрос.
+            # Бизнес-правило "один пользователь - одна группа" гарантируют ограничения
+            # uq_group_user и uq_group_members_user_id
+            result = await group_member_repository.add_member(db, group_id, user_id, requester_id)
+
+            if result.owner_id is None:
                 raise HTTPException(404, "Группа не найдена")
 
-            if group.owner_id != requester_id:
+            if result.owner_id != requester_id:
                 raise HTTPException(403, "Только владелец группы может добавлять участников")
 
-            # Проверяем, не является ли user_id самим владельцем (он уже должен быть в группе)
+            # Владелец уже является участником своей группы
             if user_id == requester_id:
                 raise HTTPException(400, "Владелец уже является участником")
 
-            user_exists = await user_service.get_user_by_id(db, user_id)
-            if not user_exists:
+            if not result.user_exists:
                 raise HTTPException(400, "Пользователь не существует")
 
-            # Бизнес-правило: проверяем, не состоит ли пользователь уже в какой-либо группе
-            # Один пользователь может состоять только в одной группе (семейный бюджет)
-            user_in_any_group = await group_member_repository.user_in_any_group(db, user_id)
-            if user_in_any_group:
-                raise HTTPException(
-                    400,
-                    "Пользователь уже состоит в другой группе. Один пользователь может состоять только в одной группе.",
-                )
-
-            # Проверяем, не состоит ли пользователь уже в этой группе (дополнительная проверка)
-            exists = await group_member_repository.exists(db, group_id, user_id)
-            if exists:
+            if result.current_group_id == group_id:
                 raise HTTPException(400, "Пользователь уже в группе")
 
-            # Добавляем участника в группу
-            await group_member_repository.create(db, {"group_id": group_id, "user_id": user_id})
+            # Пользователь состоит в другой группе - по данным запроса или по конфликту
+            # вставки с одновременным добавлением в другую группу
+            if result.current_group_id is not None or not result.added:
+                raise HTTPException(400, USER_IN_ANOTHER_GROUP)
+
             await db.commit()
+            membership_cache.invalidate(user_id)
 
             # Возвращаем Pydantic модель вместо SQLAlchemy объекта
             return GroupMemberResponse(
@@ -105,25 +124,26 @@ class GroupMemberService:
             requester_id: ID пользователя, который делает запрос (должен быть владельцем)
         """
         try:
-            # Проверяем, является ли requester владельцем группы
-            group = await group_repository.get_group_by_id(db, group_id)
-            if not group:
+            # Проверка прав, удаление и увеличение версии группы - один запрос
+            result = await group_member_repository.remove_member(
+                db, group_id, user_id, requester_id
+            )
+
+            if result.owner_id is None:
                 raise HTTPException(404, "Группа не найдена")
 
-            if group.owner_id != requester_id:
+            if result.owner_id != requester_id:
                 raise HTTPException(403, "Только владелец группы может удалять участников")
 
             # Проверяем, не пытается ли владелец удалить себя
             if user_id == requester_id:
                 raise HTTPException(400, "Владелец не может удалить себя из группы")
 
-            # Проверяем, состоит ли пользователь в группе
-            exists = await group_member_repository.exists(db, group_id, user_id)
-            if not exists:
+            if not result.removed:
                 raise HTTPException(400, "Пользователь не состоит в группе")
 
-            await group_member_repository.remove(db, group_id, user_id)
             await db.commit()
+            membership_cache.invalidate(user_id)
 
             return GroupMemberResponse(
                 status="success",
@@ -138,5 +158,100 @@ class GroupMemberService:
             await db.rollback()
             raise HTTPException(500, "Ошибка при удалении участника из группы")
 
+    async def batch(
+        self, db: AsyncSession, data: GroupMembersBatch, requester_id: int
+    ) -> GroupMembersBatchResponse:
+        """
+        Добавить или удалить список пользователей в одной транзакции.
+
+        Проверки выполняются для всего списка сразу (id = ANY(...)), вставка
+        и удаление - многострочные. Если хотя бы один пользователь не проходит
+        проверку, состав группы не меняется.
+
+        Args:
+            db: Асинхронная сессия БД
+            data: ID группы, действие (add/remove) и список ID пользователей
+            requester_id: ID пользователя, который делает запрос (должен быть владельцем)
+        """
+        try:
+            # Строка группы блокируется до конца транзакции: пакетные изменения
+            # состава одной группы не пересекаются
+            owner_id = await group_member_repository.lock_group_owner(db, data.group_id)
+            if owner_id is None:
+                raise HTTPException(404, "Группа не найдена")
+
+            if data.action == "add":
+                message = await self._batch_add(db, data, owner_id, requester_id)
+            else:
+                message = await self._batch_remove(db, data, owner_id, requester_id)
+
+            await db.commit()
+            membership_cache.invalidate(*data.user_ids)
+
+            return GroupMembersBatchResponse(
+                status="success", message=message, group_id=data.group_id, user_ids=data.user_ids
+            )
+        except HTTPException:
+            await db.rollback()
+            raise
+        except Exception:
+            await db.rollback()
+            raise HTTPException(500, "Ошибка при изменении состава группы")
+
+    async def _batch_add(
+        self, db: AsyncSession, data: GroupMembersBatch, owner_id: int, requester_id: int
+    ) -> str:
+        if owner_id != requester_id:
+            raise HTTPException(403, "Только владелец группы может добавлять участников")
+
+        if requester_id in data.user_ids:
+            raise HTTPException(400, "Владелец уже является участником")
+
+        existing = await group_member_repository.get_existing_user_ids(db, data.user_ids)
+        missing = [user_id for user_id in data.user_ids if user_id not in existing]
+        if missing:
+            raise HTTPException(400, f"Пользователи не существуют: {_format_ids(missing)}")
+
+        memberships = await group_member_repository.get_memberships(db, data.user_ids)
+        already = [
+            user_id for user_id, group_id in memberships.items() if group_id == data.group_id
+        ]
+        if already:
+            raise HTTPException(400, f"Пользователи уже в группе: {_format_ids(already)}")
+        if memberships:
+            raise HTTPException(400, f"{USER_IN_ANOTHER_GROUP} ID: {_format_ids(memberships)}")
+
+        # Меньше строк, чем запрошено - кого-то одновременно добавили в другую группу
+        added = await group_member_repository.add_members(db, data.group_id, data.user_ids)
+        if added != len(data.user_ids):
+            raise HTTPException(400, USER_IN_ANOTHER_GROUP)
+
+        return f"Пользователи добавлены в группу: {added}"
+
+    async def _batch_remove(
+        self, db: AsyncSession, data: GroupMembersBatch, owner_id: int, requester_id: int
+    ) -> str:
+        if owner_id != requester_id:
+            raise HTTPException(403, "Только владелец группы может удалять участников")
+
+        if requester_id in data.user_ids:
+            raise HTTPException(400, "Владелец не может удалить себя из группы")
+
+        # Проверка членства - по результату DELETE ... RETURNING: кого не удалили,
+        # тот не состоял в группе, и вся транзакция откатывается
+        removed = await group_member_repository.remove_members(db, data.group_id, data.user_ids)
+        removed_ids = set(removed)
+        not_members = [user_id for user_id in data.user_ids if user_id not in removed_ids]
+        if not_members:
+            raise HTTPException(
+                400, f"Пользователи не состоят в группе: {_format_ids(not_members)}"
+            )
+
+        return f"Пользователи удалены из группы: {len(removed)}"
+
+
+def _format_ids(user_ids: Iterable[int]) -> str:
+    return ", ".join(str(user_id) for user_id in user_ids)
+
 
 group_member_service = GroupMemberService()
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
+from app.core.db import Base
 from app.modules.group_members.models import GroupMember
 from app.shared.base_model import BaseModel
 
@@ -11,6 +12,8 @@ class Group(BaseModel):
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     owner_id = Column(Integer,nullable=False)
+    # Версия данных группы (состав, название, транзакции группы) - основа ETag для условных GET
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     group_links = relationship(
         "GroupMember",
@@ -18,3 +21,18 @@ class Group(BaseModel):
     )
 
     members = relationship("User", secondary=GroupMember.__table__, back_populates="groups")
+
+
+class GroupBalance(Base):
+    """
+    Сколько участник заплатил за группу: сумма его расходов с transaction_to_group.
+
+    Обновляется инкрементально при создании, изменении и удалении транзакций,
+    поэтому расчёт долей и взаиморасчётов не перечитывает транзакции группы.
+    """
+
+    __tablename__ = "group_balances"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    paid = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
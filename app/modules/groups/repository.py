@@ -1,10 +1,28 @@
+from decimal import Decimal
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    Row,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import selectinload
 
-from app.modules.groups.models import Group
+from app.modules.groups.models import Group, GroupBalance
 from app.modules.group_members.models import GroupMember
 from app.modules.groups.schemas import GroupCreate, GroupUpdate
+from app.modules.transactions.models import Transaction
+from app.modules.users.models import User
 from app.shared.mixins import CRUDMixin
 from typing import Optional
 
@@ -82,22 +100,50 @@ class GroupRepository(CRUDMixin[Group]):
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
-    async def create_group(self, db: AsyncSession, data: GroupCreate, owner_id: int) -> Group:
+    async def create_with_owner(
+        self, db: AsyncSession, data: GroupCreate, owner_id: int
+    ) -> Optional[Row]:
         """
-        Создать новую группу.
+        Создать группу и добавить в неё владельца одним запросом.
+
+        Группа не создаётся, если владелец уже состоит в какой-либо группе.
+        При одновременном создании второй запрос нарушит ограничение
+        uq_group_members_user_id и будет отменён целиком, вместе со вставкой группы.
 
         Args:
             db (AsyncSession): Асинхронная сессия БД.
-            data (GroupCreate): Pydantic-схема с данными для создания группы.
+            data (GroupCreate): Данные для создания группы.
             owner_id (int): ID владельца группы.
 
         Returns:
-            Group: Созданный объект группы (еще не закоммиченный).
+            Row | None: (group_id, owner_id, username) созданной группы и её владельца
+                        или None, если владелец уже состоит в группе.
         """
-        group = Group(name=data.name, owner_id=owner_id)
-        db.add(group)
-        await db.flush()  # Получаем ID, но не коммитим - commit будет в сервисе
-        return group
+        groups = Group.__table__
+        members = GroupMember.__table__
+        new_group = (
+            insert(groups)
+            .from_select(
+                ["name", "owner_id"],
+                select(literal(data.name), literal(owner_id)).where(
+                    ~exists().where(members.c.user_id == owner_id)
+                ),
+            )
+            .returning(groups.c.id, groups.c.owner_id)
+            .cte("new_group")
+        )
+        new_member = (
+            insert(members)
+            .from_select(["group_id", "user_id"], select(new_group.c.id, new_group.c.owner_id))
+            .returning(members.c.group_id, members.c.user_id)
+            .cte("new_member")
+        )
+        result = await db.execute(
+            select(
+                new_member.c.group_id, new_member.c.user_id.label("owner_id"), User.username
+            ).join(User, User.id == new_member.c.user_id)
+        )
+        return result.one_or_none()
 
     async def update_group(
         self, db: AsyncSession, group_id: int, data: GroupUpdate, user_id: int
@@ -167,11 +213,116 @@ class GroupRepository(CRUDMixin[Group]):
         if not group:
             return False
 
+        # Транзакции группы отвяжутся от неё (ON DELETE SET NULL) - данные их авторов
+        # меняются, поэтому их версии данных (ETag) увеличиваются
+        await db.execute(
+            update(User)
+            .where(
+                User.id.in_(
+                    select(Transaction.user_id).where(Transaction.transaction_to_group == group_id)
+                )
+            )
+            .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        )
+
         # Удаляем саму группу
         await db.execute(delete(Group).where(Group.id == group_id))
         await db.flush()  # Применяем изменения, но не коммитим - commit будет в сервисе
 
         return True
 
+    async def get_data_version(self, db: AsyncSession, group_id: int, user_id: int) -> int | None:
+        """
+        Получить версию данных группы, если пользователь состоит в ней.
+
+        Returns:
+            int | None: Версия данных или None, если группа не найдена
+                        или пользователь не состоит в ней.
+        """
+        result = await db.execute(
+            select(Group.data_version)
+            .join(GroupMember, GroupMember.group_id == Group.id)
+            .where(Group.id == group_id, GroupMember.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def bump_data_version(self, db: AsyncSession, group_id: int) -> None:
+        """Увеличить версию данных группы (в рамках текущей транзакции)"""
+        await db.execute(
+            update(Group)
+            .where(Group.id == group_id)
+            .values(data_version=Group.data_version + 1, updated_at=Group.updated_at)
+        )
+
+
+class GroupBalanceRepository:
+    """Репозиторий сумм, заплаченных участниками за группу"""
+
+    async def apply_deltas(self, db: AsyncSession, deltas: dict[tuple[int, int], Decimal]) -> None:
+        """
+        Изменить суммы участников одним запросом (в рамках текущей транзакции).
+
+        Args:
+            deltas: {(group_id, user_id): изменение суммы}. Изменения для удалённых
+                    групп пропускаются.
+        """
+        rows = values(
+            column("group_id", Integer),
+            column("user_id", Integer),
+            column("paid", Numeric(14, 2)),
+            name="deltas",
+        ).data([(group_id, user_id, delta) for (group_id, user_id), delta in deltas.items()])
+        stmt = postgresql.insert(GroupBalance).from_select(
+            ["group_id", "user_id", "paid"],
+            select(rows.c.group_id, rows.c.user_id, rows.c.paid).where(
+                exists().where(Group.id == rows.c.group_id)
+            ),
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[GroupBalance.group_id, GroupBalance.user_id],
+                set_={"paid": GroupBalance.paid + stmt.excluded.paid},
+            )
+        )
+
+    async def get_participants(self, db: AsyncSession, group_id: int) -> list[Row]:
+        """
+        Участники взаиморасчётов группы одним запросом: текущие участники
+        и бывшие, за которыми осталась ненулевая сумма.
+
+        Returns:
+            list[Row]: (user_id, username, paid, is_member), отсортированные по user_id
+        """
+        participants = (
+            select(GroupMember.user_id)
+            .where(GroupMember.group_id == group_id)
+            .union(
+                select(GroupBalance.user_id).where(
+                    GroupBalance.group_id == group_id, GroupBalance.paid != 0
+                )
+            )
+            .subquery("participants")
+        )
+        result = await db.execute(
+            select(
+                User.id.label("user_id"),
+                User.username,
+                func.coalesce(GroupBalance.paid, 0).label("paid"),
+                (GroupMember.user_id.isnot(None)).label("is_member"),
+            )
+            .join(participants, participants.c.user_id == User.id)
+            .outerjoin(
+                GroupMember,
+                (GroupMember.user_id == User.id) & (GroupMember.group_id == group_id),
+            )
+            .outerjoin(
+                GroupBalance,
+                (GroupBalance.user_id == User.id) & (GroupBalance.group_id == group_id),
+            )
+            .order_by(User.id)
+        )
+        return list(result.all())
+
 
 group_repository = GroupRepository()
+group_balance_repository = GroupBalanceRepository()
@@ -1,32 +1,52 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_group_read_db
 from app.core.dto.response import StandardResponse, success_response
+from app.core.etag import check_not_modified, make_etag
+from app.core.exceptions import NotFoundException
+from app.core.routing import StandardResponseRoute
 from app.modules.groups.service import group_service
 from app.modules.groups.schemas import (
     GroupResponse,
     GroupCreate,
+    GroupSettlementResponse,
     GroupsResponseCreate,
     GroupUpdate,
 )
+from app.modules.transactions.schemas import GroupTransactionFeedResponse
+from app.modules.transactions.service import transaction_service
 from app.modules.users.models import User
 
-router = APIRouter(prefix="/group", tags=["groups"])
+router = APIRouter(prefix="/group", tags=["groups"], route_class=StandardResponseRoute)
 
 
 @router.get("/{group_id}", response_model=StandardResponse[GroupResponse])
 async def get_group(
     group_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> StandardResponse[GroupResponse]:
+    db: AsyncSession = Depends(get_group_read_db),
+) -> StandardResponse[GroupResponse] | Response:
     """
     Получить информацию о группе по её идентификатору.
 
     Пользователь может получить информацию только о группах, в которых он является участником.
     """
+    data_version = await group_service.get_group_data_version(
+        db=db, group_id=group_id, id_user=int(current_user.id)
+    )
+    if data_version is not None:
+        not_modified = check_not_modified(
+            request, response, make_etag("group", group_id, data_version)
+        )
+        if not_modified:
+            return not_modified
+
     group = await group_service.get_group_service(
         db=db, group_id=group_id, id_user=int(current_user.id)
     )
@@ -34,6 +54,74 @@ async def get_group(
     return success_response(data=group)
 
 
+@router.get("/{group_id}/settlement", response_model=StandardResponse[GroupSettlementResponse])
+async def get_group_settlement(
+    group_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_group_read_db),
+) -> StandardResponse[GroupSettlementResponse]:
+    """
+    Кто кому сколько должен в группе.
+
+    Расходы группы делятся поровну между текущими участниками. Возвращаются балансы
+    участников и минимальный набор переводов, закрывающий все долги.
+    Доступно только участникам группы.
+    """
+    settlement = await group_service.get_settlement_service(
+        db=db, group_id=group_id, id_user=int(current_user.id)
+    )
+
+    return success_response(data=settlement)
+
+
+@router.get(
+    "/{group_id}/transactions", response_model=StandardResponse[GroupTransactionFeedResponse]
+)
+async def get_group_transactions(
+    group_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_group_read_db),
+    member_id: int | None = Query(None, description="Только транзакции этого участника"),
+    category: str | None = Query(None, description="Фильтр по категории"),
+    date_from: date | None = Query(None, description="Начальная дата (YYYY-MM-DD)"),
+    date_to: date | None = Query(None, description="Конечная дата (YYYY-MM-DD)"),
+    cursor: str | None = Query(None, description="next_cursor предыдущей страницы"),
+    limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+) -> StandardResponse[GroupTransactionFeedResponse] | Response:
+    """
+    Лента транзакций группы, от новых к старым.
+
+    Пагинация по курсору: следующая страница запрашивается с cursor=next_cursor.
+    Доступно только участникам группы.
+    """
+    # Версия данных группы меняется с каждой транзакцией группы и заодно
+    # подтверждает, что пользователь состоит в группе
+    data_version = await group_service.get_group_data_version(
+        db=db, group_id=group_id, id_user=int(current_user.id)
+    )
+    if data_version is None:
+        raise NotFoundException(detail="Группа не найдена или у пользователя нет доступа к ней")
+
+    not_modified = check_not_modified(request, response, make_etag("group", group_id, data_version))
+    if not_modified:
+        return not_modified
+
+    feed = await transaction_service.list_group_transactions(
+        db=db,
+        group_id=group_id,
+        member_id=member_id,
+        category=category,
+        date_from=date_from,
+        date_to=date_to,
+        cursor=cursor,
+        limit=limit,
+    )
+
+    return success_response(data=feed)
+
+
 @router.post("/create", response_model=StandardResponse[GroupsResponseCreate])
 async def create_group(
     data: GroupCreate,
@@ -65,3 +65,41 @@ class UserGroupsResponse(BaseModel):
     groups: List[GroupShort]
     class Config:
         from_attributes = True
+
+
+class MemberBalance(BaseModel):
+    """
+    Баланс участника во взаиморасчётах группы
+
+        paid (float): Сколько участник заплатил за группу
+        share (float): Его доля расходов группы
+        balance (float): paid - share; > 0 - участнику должны, < 0 - должен он
+        is_member (bool): Состоит ли в группе сейчас (бывшие участники доли не несут)
+    """
+    user_id: int
+    username: str
+    paid: float
+    share: float
+    balance: float
+    is_member: bool
+
+
+class SettlementTransfer(BaseModel):
+    """Перевод, закрывающий долг"""
+    from_user_id: int
+    to_user_id: int
+    amount: float
+
+
+class GroupSettlementResponse(BaseModel):
+    """
+    Кто кому сколько должен в группе
+
+        total_expense (float): Все расходы группы
+        balances (list): Балансы участников
+        transfers (list): Минимальный набор переводов для взаиморасчёта
+    """
+    group_id: int
+    total_expense: float
+    balances: List[MemberBalance]
+    transfers: List[SettlementTransfer]
@@ -3,9 +3,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.core.exceptions import NotFoundException, ValidationException
-from .repository import group_repository
+from app.shared.utils import violated_constraint
+from .repository import group_balance_repository, group_repository
 from .schemas import (
     GroupResponse,
+    GroupSettlementResponse,
+    MemberBalance,
+    SettlementTransfer,
     UserRead,
     GroupShort,
     UserGroupsResponse,
@@ -13,10 +17,26 @@ from .schemas import (
     GroupsResponseCreate,
     GroupUpdate,
 )
-from ..group_members.service import group_member_service
+from .settlement import net_balances, settle
+from ..group_members.cache import membership_cache
+
+USER_ALREADY_IN_GROUP = (
+    "Пользователь уже состоит в группе. Один пользователь может состоять только в одной группе."
+)
 
 
 class GroupService:
+    async def get_group_data_version(
+        self, db: AsyncSession, group_id: int, id_user: int
+    ) -> int | None:
+        """
+        Получить версию данных группы для ETag (одним запросом, без загрузки участников).
+
+        Returns:
+            int | None: Версия или None, если группа не найдена или пользователь не состоит в ней.
+        """
+        return await group_repository.get_data_version(db, group_id, id_user)
+
     async def get_group_service(
         self, db: AsyncSession, group_id: int, id_user: int
     ) -> GroupResponse:
@@ -74,6 +94,53 @@ class GroupService:
 
         return UserGroupsResponse(groups=groups_response)
 
+    async def get_settlement_service(
+        self, db: AsyncSession, group_id: int, id_user: int
+    ) -> GroupSettlementResponse:
+        """
+        Получить балансы участников группы и переводы для взаиморасчёта.
+
+        Суммы, заплаченные участниками, хранятся в group_balances и обновляются
+        вместе с транзакциями, поэтому расчёт - один запрос и O(n log n)
+        по числу участников, без чтения транзакций группы.
+
+        Args:
+            db (AsyncSession): Асинхронная сессия БД.
+            group_id (int): ID группы.
+            id_user (int): ID пользователя, запрашивающего взаиморасчёт.
+
+        Raises:
+            HTTPException: Если группа не найдена или пользователь не состоит в ней.
+        """
+        participants = await group_balance_repository.get_participants(db, group_id)
+
+        if not any(row.user_id == id_user and row.is_member for row in participants):
+            raise HTTPException(404, "Группа не найдена или у пользователя нет доступа к ней")
+
+        paid = {row.user_id: round(row.paid * 100) for row in participants}
+        members = [row.user_id for row in participants if row.is_member]
+        balances = net_balances(paid, members)
+
+        return GroupSettlementResponse(
+            group_id=group_id,
+            total_expense=sum(paid.values()) / 100,
+            balances=[
+                MemberBalance(
+                    user_id=row.user_id,
+                    username=row.username,
+                    paid=paid[row.user_id] / 100,
+                    share=(paid[row.user_id] - balances[row.user_id]) / 100,
+                    balance=balances[row.user_id] / 100,
+                    is_member=row.is_member,
+                )
+                for row in participants
+            ],
+            transfers=[
+                SettlementTransfer(from_user_id=debtor, to_user_id=creditor, amount=amount / 100)
+                for debtor, creditor, amount in settle(balances)
+            ],
+        )
+
     async def create_group_service(
         self, db: AsyncSession, data: GroupCreate, owner_id: int
     ) -> GroupsResponseCreate:
@@ -93,46 +160,23 @@ class GroupService:
 
         Raises:
             ValidationException: Если пользователь уже состоит в группе.
-            NotFoundException: Если группа не найдена после создания.
         """
-        # Бизнес-правило: проверяем, не состоит ли пользователь уже в какой-либо группе
-        # Один пользователь может состоять только в одной группе (семейный бюджет)
-        user_in_group = await group_member_service.user_in_any_group(db, owner_id)
-        if user_in_group:
-            raise ValidationException(
-                detail="Пользователь уже состоит в группе. Один пользователь может состоять только в одной группе."
-            )
-
         try:
-            # Создаем группу (без commit - только flush для получения ID)
-            group = await group_repository.create_group(db, data, owner_id)
-
-            # Добавляем владельца в группу как участника (без commit)
-            await group_member_service.add_owner(db=db, group_id=int(group.id), user_id=owner_id)
+            # Группа и участник-владелец создаются одним запросом. Бизнес-правило
+            # "один пользователь - одна группа" проверяется в том же запросе
+            # и гарантируется ограничением uq_group_members_user_id
+            created = await group_repository.create_with_owner(db, data, owner_id)
+            if created is None:
+                raise ValidationException(detail=USER_ALREADY_IN_GROUP)
 
             # Коммитим всю транзакцию (группа + участник)
             await db.commit()
-
-            # Обновляем объект из БД
-            await db.refresh(group)
-
-            # Получаем группу со списком участников
-            group_with_members = await group_repository.get_with_members(
-                db=db, group_id=int(group.id)
-            )
-            if not group_with_members:
-                raise NotFoundException(detail="Группа не найдена после создания")
-
-            # Формируем список участников
-            members = [
-                UserRead(id=member.id, username=member.username)
-                for member in group_with_members.members
-            ]
+            membership_cache.invalidate(owner_id)
 
             return GroupsResponseCreate(
-                id=int(group_with_members.id),
-                owner_id=int(group_with_members.owner_id),
-                members=members,
+                id=created.group_id,
+                owner_id=created.owner_id,
+                members=[UserRead(id=created.owner_id, username=created.username)],
             )
         except (NotFoundException, ValidationException):
             # Пробрасываем кастомные исключения как есть
@@ -146,9 +190,12 @@ class GroupService:
             elif e.status_code == 400:
                 raise ValidationException(detail=str(e.detail))
             raise e
-        except IntegrityError:
+        except IntegrityError as e:
             # Ошибки целостности данных БД
             await db.rollback()
+            if violated_constraint(e) == "uq_group_members_user_id":
+                # Одновременно создана другая группа с этим владельцем
+                raise ValidationException(detail=USER_ALREADY_IN_GROUP)
             raise ValidationException(
                 detail="Ошибка при создании группы. Возможно, пользователь уже состоит в другой группе."
             )
@@ -195,6 +242,8 @@ class GroupService:
                     detail="Группа не найдена или у вас нет прав на её редактирование",
                 )
 
+            await group_repository.bump_data_version(db, group_id)
+
             # Коммитим транзакцию
             await db.commit()
 
@@ -241,6 +290,7 @@ class GroupService:
 
             # Коммитим транзакцию
             await db.commit()
+            membership_cache.invalidate_group(group_id)
 
             return {"message": "Группа успешно удалена"}
 
@@ -0,0 +1,54 @@
+"""
+Взаиморасчёты группы: равные доли расходов и минимальный набор переводов.
+
+Все суммы - в копейках (int), чтобы балансы сходились до копейки.
+"""
+
+import heapq
+
+
+def net_balances(paid: dict[int, int], members: list[int]) -> dict[int, int]:
+    """
+    Чистые балансы участников: заплачено минус равная доля расходов группы.
+
+    Расходы делятся поровну между текущими участниками (members). Бывшие участники
+    в paid доли не несут - им возвращается заплаченное. Копейки, которые не делятся
+    поровну, достаются участникам с меньшими ID, поэтому сумма балансов равна нулю.
+
+    Returns:
+        dict[int, int]: {user_id: баланс}; > 0 - участнику должны, < 0 - должен он
+    """
+    total = sum(paid.values())
+    share, remainder = divmod(total, len(members)) if members else (0, 0)
+    balances = dict(paid)
+    for index, user_id in enumerate(sorted(members)):
+        balances[user_id] = balances.get(user_id, 0) - share - (1 if index < remainder else 0)
+    return balances
+
+
+def settle(balances: dict[int, int]) -> list[tuple[int, int, int]]:
+    """
+    Переводы, закрывающие все балансы, жадно по двум кучам за O(n log n).
+
+    На каждом шаге наибольший должник переводит наибольшему кредитору меньшую
+    из двух сумм, и хотя бы один из них выбывает - переводов не больше n - 1.
+
+    Returns:
+        list[tuple[int, int, int]]: (от кого, кому, сумма)
+    """
+    creditors = [(-amount, user_id) for user_id, amount in balances.items() if amount > 0]
+    debtors = [(amount, user_id) for user_id, amount in balances.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
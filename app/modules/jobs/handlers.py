@@ -0,0 +1,62 @@
+"""
+Обработчики фоновых задач по типам.
+
+Обработчик получает сессию БД и задачу (параметры - в job.payload) и возвращает
+результат, который сохраняется в задаче и отдаётся GET /jobs/{id}/result.
+Большой результат обработчик пишет в файл и возвращает путь к нему вместо содержимого.
+"""
+
+from typing import Awaitable, Callable, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.analytics.service import analytics_service
+from app.modules.jobs.models import Job
+from app.modules.transactions.exports import export_path, write_export
+from app.modules.transactions.service import transaction_service
+
+
+class JobResult(NamedTuple):
+    """Результат задачи: содержимое или путь к файлу с ним, тип и имя файла для скачивания"""
+
+    content: bytes | None
+    media_type: str
+    filename: str | None = None
+    path: str | None = None
+
+
+JobHandler = Callable[[AsyncSession, Job], Awaitable[JobResult]]
+
+
+class JobKindSpec(NamedTuple):
+    """Обработчик типа задачи и приоритет его задач в очереди (больше - раньше)"""
+
+    handler: JobHandler
+    priority: int
+
+
+async def export_transactions(db: AsyncSession, job: Job) -> JobResult:
+    csv_content = await transaction_service.export_transactions_to_csv(
+        db=db,
+        user_id=int(job.user_id),
+        category=job.payload.get("category"),
+        date_from=job.payload.get("date_from"),
+        date_to=job.payload.get("date_to"),
+    )
+    path = export_path(int(job.id))
+    await write_export(path, csv_content.encode("utf-8"))
+    return JobResult(None, "text/csv", "transactions.csv", path=str(path))
+
+
+async def render_expenses_chart(db: AsyncSession, job: Job) -> JobResult:
+    chart_bytes = await analytics_service.get_expenses_chart(
+        db=db, user_id=int(job.user_id), period=job.payload.get("period")
+    )
+    return JobResult(chart_bytes, "image/png", "expenses.png")
+
+
+# Диаграмму пользователь обычно ждёт на экране, выгрузку - скачивает позже
+JOB_KINDS: dict[str, JobKindSpec] = {
+    "transactions_export": JobKindSpec(export_transactions, priority=0),
+    "expenses_chart": JobKindSpec(render_expenses_chart, priority=10),
+}
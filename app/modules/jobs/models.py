@@ -0,0 +1,89 @@
+import enum
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, LargeBinary, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func, text
+
+from app.shared.base_model import BaseModel
+
+
+class JobStatus(enum.Enum):
+    """Состояние фоновой задачи"""
+
+    QUEUED = "queued"  # Ждёт выполнения (в том числе повторной попытки после run_at)
+    RUNNING = "running"  # Захвачена воркером до locked_until
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"  # Попытки исчерпаны или ошибка не исправится повтором
+
+
+class Job(BaseModel):
+    """
+    Фоновая задача в очереди на PostgreSQL.
+
+    Воркеры всех процессов приложения захватывают задачи через FOR UPDATE SKIP LOCKED.
+    Захват действует до locked_until: если воркер не завершил задачу к этому времени
+    (процесс упал или перезапущен), задача возвращается в очередь.
+    """
+
+    __tablename__ = "jobs"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict, server_default=text("'{}'::jsonb"))
+    status: Column[JobStatus] = Column(
+        Enum(JobStatus), nullable=False, default=JobStatus.QUEUED, server_default="QUEUED"
+    )
+    # Больше - раньше
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False)
+    # Не раньше этого времени задача может быть захвачена (отложенный повтор)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(Text, nullable=True)
+    # Mapped, а не Column: атрибут передаётся в defer() при выборке без результата
+    result: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    result_media_type = Column(String(100), nullable=True)
+    result_filename = Column(String(255), nullable=True)
+    # Большой результат пишется в файл на диске процесса, а не в result
+    result_path = Column(String(500), nullable=True)
+    # Хэш параметров задачи и версии данных: одинаковые задачи не выполняются повторно
+    dedup_key = Column(String(64), nullable=True)
+
+
+# Захват: следующие готовые задачи по приоритету и времени без сортировки
+Index(
+    "ix_jobs_queue",
+    Job.priority.desc(),
+    Job.run_at,
+    Job.id,
+    postgresql_where=text("status = 'QUEUED'"),
+)
+
+# Возврат в очередь задач с истёкшим захватом
+Index("ix_jobs_running_locked_until", Job.locked_until, postgresql_where=text("status = 'RUNNING'"))
+
+# Поиск задачи с теми же параметрами для повторного использования
+Index(
+    "ix_jobs_dedup",
+    Job.user_id,
+    Job.kind,
+    Job.dedup_key,
+    postgresql_where=text("dedup_key IS NOT NULL"),
+)
+
+# Не больше одной невыполненной задачи с теми же параметрами: одновременные запросы
+# не ставят дубликаты (INSERT ... ON CONFLICT DO NOTHING по этому индексу)
+PENDING_DEDUP_WHERE = text("dedup_key IS NOT NULL AND status IN ('QUEUED', 'RUNNING')")
+Index(
+    "ux_jobs_dedup_pending",
+    Job.user_id,
+    Job.kind,
+    Job.dedup_key,
+    unique=True,
+    postgresql_where=PENDING_DEDUP_WHERE,
+)
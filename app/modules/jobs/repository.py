@@ -0,0 +1,248 @@
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from sqlalchemy.sql import func
+
+from app.modules.jobs.models import PENDING_DEDUP_WHERE, Job, JobStatus
+
+# Ошибка задачи, воркер которой не завершил её до окончания захвата
+LEASE_EXPIRED_ERROR = "Истекло время захвата задачи воркером"
+
+
+class JobRepository:
+    """Работа с очередью фоновых задач"""
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        kind: str,
+        payload: dict[str, Any],
+        priority: int,
+        max_attempts: int,
+    ) -> Job:
+        job = Job(
+            user_id=user_id,
+            kind=kind,
+            payload=payload,
+            status=JobStatus.QUEUED,
+            priority=priority,
+            attempts=0,
+            max_attempts=max_attempts,
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+        return job
+
+    async def create_unique(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        kind: str,
+        payload: dict[str, Any],
+        priority: int,
+        max_attempts: int,
+        dedup_key: str,
+    ) -> Job | None:
+        """
+        Поставить задачу, если невыполненной задачи с тем же dedup_key нет.
+
+        Одним INSERT ... ON CONFLICT DO NOTHING по уникальному индексу
+        ux_jobs_dedup_pending: одновременные запросы не ставят дубликаты.
+
+        Returns:
+            Job | None: новая задача или None, если такая задача уже в очереди
+        """
+        result = await db.execute(
+            insert(Job)
+            .values(
+                user_id=user_id,
+                kind=kind,
+                payload=payload,
+                dedup_key=dedup_key,
+                status=JobStatus.QUEUED,
+                priority=priority,
+                attempts=0,
+                max_attempts=max_attempts,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Job.user_id, Job.kind, Job.dedup_key],
+                index_where=PENDING_DEDUP_WHERE,
+            )
+            .returning(Job)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_for_user(
+        self, db: AsyncSession, *, job_id: int, user_id: int, with_result: bool = False
+    ) -> Job | None:
+        """Задача пользователя; результат (bytea) загружается только по запросу"""
+        query = select(Job).where(Job.id == job_id, Job.user_id == user_id)
+        if not with_result:
+            query = query.options(defer(Job.result))
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def find_reusable(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        kind: str,
+        dedup_key: str,
+        finished_after: datetime,
+    ) -> Job | None:
+        """Последняя задача с теми же параметрами: ещё не выполненная или выполненная недавно"""
+        result = await db.execute(
+            select(Job)
+            .options(defer(Job.result))
+            .where(
+                Job.user_id == user_id,
+                Job.kind == kind,
+                Job.dedup_key == dedup_key,
+                Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+                | ((Job.status == JobStatus.SUCCEEDED) & (Job.finished_at > finished_after)),
+            )
+            .order_by(Job.id.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def claim(self, db: AsyncSession, *, limit: int, lease: timedelta) -> Sequence[Job]:
+        """
+        Захватить до limit готовых задач по приоритету одним UPDATE.
+
+        Строки, заблокированные другими воркерами, пропускаются (SKIP LOCKED), поэтому
+        воркеры всех процессов не ждут друг друга и не получают одну задачу дважды.
+        """
+        ready = (
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+            .order_by(Job.priority.desc(), Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(Job)
+            .where(Job.id.in_(ready))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_until=func.now() + lease,
+                updated_at=func.now(),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalars().all()
+
+    def _owned(self, job: Job) -> Any:
+        """
+        Условие: задача всё ещё захвачена этой попыткой. Если захват истёк и задачу
+        взял другой воркер, результат старой попытки отбрасывается.
+        """
+        return (
+            (Job.id == job.id) & (Job.status == JobStatus.RUNNING) & (Job.attempts == job.attempts)
+        )
+
+    async def complete(
+        self,
+        db: AsyncSession,
+        job: Job,
+        *,
+        content: bytes | None,
+        media_type: str,
+        filename: str | None,
+        path: str | None = None,
+    ) -> bool:
+        result = await db.execute(
+            update(Job)
+            .where(self._owned(job))
+            .values(
+                status=JobStatus.SUCCEEDED,
+                result=content,
+                result_path=path,
+                result_media_type=media_type,
+                result_filename=filename,
+                error=None,
+                locked_until=None,
+                finished_at=func.now(),
+                updated_at=func.now(),
+            )
+        )
+        return bool(result.rowcount)
+
+    async def fail(
+        self, db: AsyncSession, job: Job, *, error: str, retry_in: timedelta | None
+    ) -> bool:
+        """Вернуть задачу в очередь с задержкой retry_in или, если None, завершить с ошибкой"""
+        values: dict[str, Any] = {"error": error, "locked_until": None, "updated_at": func.now()}
+        if retry_in is None:
+            values.update(status=JobStatus.FAILED, finished_at=func.now())
+        else:
+            values.update(status=JobStatus.QUEUED, run_at=func.now() + retry_in)
+        result = await db.execute(update(Job).where(self._owned(job)).values(**values))
+        return bool(result.rowcount)
+
+    async def release(self, db: AsyncSession, job: Job) -> bool:
+        """Вернуть прерванную задачу в очередь, не засчитывая попытку (остановка воркера)"""
+        result = await db.execute(
+            update(Job)
+            .where(self._owned(job))
+            .values(
+                status=JobStatus.QUEUED,
+                attempts=Job.attempts - 1,
+                locked_until=None,
+                updated_at=func.now(),
+            )
+        )
+        return bool(result.rowcount)
+
+    async def requeue_expired(self, db: AsyncSession) -> int:
+        """
+        Вернуть в очередь задачи, захват которых истёк (воркер упал или завис);
+        задачи без оставшихся попыток завершаются с ошибкой.
+        """
+        expired = (Job.status == JobStatus.RUNNING) & (Job.locked_until < func.now())
+        failed = await db.execute(
+            update(Job)
+            .where(expired, Job.attempts >= Job.max_attempts)
+            .values(
+                status=JobStatus.FAILED,
+                error=LEASE_EXPIRED_ERROR,
+                locked_until=None,
+                finished_at=func.now(),
+                updated_at=func.now(),
+            )
+        )
+        requeued = await db.execute(
+            update(Job)
+            .where(expired)
+            .values(
+                status=JobStatus.QUEUED,
+                error=LEASE_EXPIRED_ERROR,
+                locked_until=None,
+                run_at=func.now(),
+                updated_at=func.now(),
+            )
+        )
+        return int(failed.rowcount) + int(requeued.rowcount)
+
+    async def delete_finished_before(self, db: AsyncSession, cutoff: datetime) -> int:
+        """Удалить завершённые задачи вместе с результатами"""
+        result = await db.execute(
+            delete(Job).where(
+                Job.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]), Job.finished_at < cutoff
+            )
+        )
+        return int(result.rowcount)
+
+
+job_repository = JobRepository()
@@ -0,0 +1,43 @@
+import math
+import os
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundException
+from app.core.files import RangeFileResponse
+from app.modules.jobs.models import Job
+
+
+def poll_after() -> str:
+    """Через сколько секунд имеет смысл снова запросить состояние задачи (Retry-After)"""
+    return str(max(1, math.ceil(settings.JOB_POLL_INTERVAL_SECONDS)))
+
+
+def job_result_response(job: Job, request: Request) -> Response:
+    """
+    Результат выполненной задачи: содержимое из БД или файл на диске
+    с поддержкой Range для докачки.
+    """
+    headers = {}
+    if job.result_filename:
+        headers["Content-Disposition"] = f'attachment; filename="{job.result_filename}"'
+    if job.result_path is None:
+        return Response(content=job.result, media_type=str(job.result_media_type), headers=headers)
+    try:
+        stat_result = os.stat(job.result_path)
+    except FileNotFoundError:
+        raise NotFoundException(
+            detail="Файл результата удалён по истечении срока хранения",
+            error_code="RESULT_EXPIRED",
+        )
+    return RangeFileResponse(
+        job.result_path,
+        stat_result=stat_result,
+        range_header=request.headers.get("range"),
+        if_range=request.headers.get("if-range"),
+        media_type=str(job.result_media_type),
+        headers=headers,
+        method=request.method,
+    )
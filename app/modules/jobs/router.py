@@ -0,0 +1,75 @@
+# Эндпоинты фоновых задач
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.compression import skip_compression
+from app.core.db import get_db
+from app.core.dependencies import get_current_user
+from app.core.dto.response import StandardResponse, success_response
+from app.core.routing import StandardResponseRoute
+from app.modules.jobs.models import JobStatus
+from app.modules.jobs.results import job_result_response, poll_after
+from app.modules.jobs.schemas import JobCreate, JobResponse
+from app.modules.jobs.service import job_service
+from app.modules.users.models import User
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=StandardResponseRoute)
+
+
+@router.post(
+    "",
+    response_model=StandardResponse[JobResponse],
+    status_code=202,
+)
+async def create_job(
+    job_in: JobCreate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StandardResponse[JobResponse]:
+    """
+    Поставить тяжёлую операцию в очередь и сразу ответить 202.
+
+    Состояние задачи - по ссылке из заголовка Location, результат -
+    GET /jobs/{job_id}/result после перехода в статус succeeded.
+    """
+    job = await job_service.enqueue(db, user_id=int(current_user.id), job_in=job_in)
+    response.headers["Location"] = f"{request.url.path}/{job.id}"
+    response.headers["Retry-After"] = poll_after()
+    return success_response(data=JobResponse.model_validate(job), code=202)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=StandardResponse[JobResponse],
+)
+async def get_job(
+    job_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StandardResponse[JobResponse]:
+    """Получить состояние задачи (только своей)"""
+    job = await job_service.get_job(db, job_id=job_id, user_id=int(current_user.id))
+    if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+        response.headers["Retry-After"] = poll_after()
+    return success_response(data=JobResponse.model_validate(job))
+
+
+@router.get(
+    "/{job_id}/result",
+    response_class=Response,
+)
+@skip_compression
+async def get_job_result(
+    job_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Скачать результат выполненной задачи (CSV, PNG); 409 - задача не выполнена"""
+    job = await job_service.get_result(db, job_id=job_id, user_id=int(current_user.id))
+    return job_result_response(job, request)
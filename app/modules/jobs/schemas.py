@@ -0,0 +1,74 @@
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.modules.jobs.models import JobStatus
+
+# Типы задач (обработчики - app/modules/jobs/handlers.py)
+JobKind = Literal["transactions_export", "expenses_chart"]
+
+# Параметры, которые принимает каждый тип задачи
+KIND_PARAMS: dict[str, frozenset[str]] = {
+    "transactions_export": frozenset({"category", "date_from", "date_to"}),
+    "expenses_chart": frozenset({"period"}),
+}
+
+
+class JobCreate(BaseModel):
+    """Схема постановки фоновой задачи"""
+
+    kind: JobKind = Field(
+        ...,
+        description="Тип задачи: transactions_export - CSV выгрузка транзакций, "
+        "expenses_chart - диаграмма расходов по категориям",
+    )
+    period: Optional[str] = Field(
+        None,
+        pattern=r"^(\d{4}-\d{2}|month)$",
+        description="expenses_chart: период YYYY-MM или 'month' (по умолчанию текущий месяц)",
+    )
+    category: Optional[str] = Field(
+        None, max_length=50, description="transactions_export: фильтр по категории"
+    )
+    date_from: Optional[date] = Field(None, description="transactions_export: начальная дата")
+    date_to: Optional[date] = Field(None, description="transactions_export: конечная дата")
+
+    @model_validator(mode="after")
+    def check_params_match_kind(self) -> "JobCreate":
+        """Параметры другого типа задачи отклоняются при постановке, а не при выполнении"""
+        unexpected = self.payload().keys() - KIND_PARAMS[self.kind]
+        if unexpected:
+            raise ValueError(
+                f"Параметры {', '.join(sorted(unexpected))} не применимы к задаче {self.kind}"
+            )
+        return self
+
+    def payload(self) -> dict[str, Any]:
+        """Параметры задачи для сохранения в JSONB (без типа и незаданных полей)"""
+        return self.model_dump(mode="json", exclude={"kind"}, exclude_none=True)
+
+    def dedup_key(self, data_version: int) -> str:
+        """Ключ одинаковых задач: тип, параметры и версия данных пользователя"""
+        key = json.dumps([self.kind, self.payload(), data_version], sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+
+class JobResponse(BaseModel):
+    """Схема ответа с состоянием фоновой задачи"""
+
+    id: int
+    kind: str
+    status: JobStatus
+    priority: int
+    attempts: int = Field(description="Начатые попытки выполнения")
+    max_attempts: int
+    error: Optional[str] = Field(None, description="Ошибка последней неудачной попытки")
+    created_at: datetime
+    run_at: datetime = Field(description="Не раньше этого времени задача будет выполнена")
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
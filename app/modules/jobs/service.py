@@ -0,0 +1,111 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import ConflictException, NotFoundException
+from app.modules.jobs.handlers import JOB_KINDS
+from app.modules.jobs.models import Job, JobStatus
+from app.modules.jobs.repository import job_repository
+from app.modules.jobs.schemas import JobCreate
+
+
+class JobService:
+    """Постановка фоновых задач и получение их состояния и результата"""
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        job_in: JobCreate,
+    ) -> Job:
+        """Поставить задачу в очередь; выполнит её любой процесс приложения"""
+        return await job_repository.create(
+            db,
+            user_id=user_id,
+            kind=job_in.kind,
+            payload=job_in.payload(),
+            priority=JOB_KINDS[job_in.kind].priority,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+        )
+
+    async def enqueue_unique(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        job_in: JobCreate,
+        data_version: int,
+        max_age: timedelta,
+    ) -> tuple[Job, bool]:
+        """
+        Поставить задачу, если такой же нет: с теми же параметрами при той же версии
+        данных пользователя - ещё не выполненной или выполненной за последние max_age,
+        файл результата которой ещё на диске.
+
+        Returns:
+            tuple[Job, bool]: задача и признак, что она поставлена сейчас
+        """
+        dedup_key = job_in.dedup_key(data_version)
+        finished_after = datetime.now(timezone.utc) - max_age
+        job = await job_repository.find_reusable(
+            db,
+            user_id=user_id,
+            kind=job_in.kind,
+            dedup_key=dedup_key,
+            finished_after=finished_after,
+        )
+        if job is not None and (job.result_path is None or os.path.exists(job.result_path)):
+            return job, False
+        created = await job_repository.create_unique(
+            db,
+            user_id=user_id,
+            kind=job_in.kind,
+            payload=job_in.payload(),
+            priority=JOB_KINDS[job_in.kind].priority,
+            max_attempts=settings.JOB_MAX_ATTEMPTS,
+            dedup_key=dedup_key,
+        )
+        if created is not None:
+            return created, True
+
+        # Такую же задачу только что поставил параллельный запрос
+        job = await job_repository.find_reusable(
+            db,
+            user_id=user_id,
+            kind=job_in.kind,
+            dedup_key=dedup_key,
+            finished_after=finished_after,
+        )
+        if job is None:
+            raise ConflictException(
+                detail="Такая же задача ставится в очередь, повторите запрос",
+                error_code="JOB_CONFLICT",
+            )
+        return job, False
+
+    async def get_job(self, db: AsyncSession, *, job_id: int, user_id: int) -> Job:
+        job = await job_repository.get_for_user(db, job_id=job_id, user_id=user_id)
+        if job is None:
+            raise NotFoundException(detail="Задача не найдена")
+        return job
+
+    async def get_result(self, db: AsyncSession, *, job_id: int, user_id: int) -> Job:
+        """Задача с результатом; результат есть только у успешно выполненной задачи"""
+        job = await job_repository.get_for_user(
+            db, job_id=job_id, user_id=user_id, with_result=True
+        )
+        if job is None:
+            raise NotFoundException(detail="Задача не найдена")
+        if job.status == JobStatus.FAILED:
+            raise ConflictException(
+                detail=f"Задача завершилась с ошибкой: {job.error}", error_code="JOB_FAILED"
+            )
+        if job.status != JobStatus.SUCCEEDED:
+            raise ConflictException(detail="Задача ещё не выполнена", error_code="JOB_NOT_READY")
+        return job
+
+
+job_service = JobService()
@@ -0,0 +1,182 @@
+"""
+Исполнители фоновых задач внутри процессов приложения.
+
+Каждый процесс запускает JOB_WORKER_CONCURRENCY исполнителей (lifespan), которые
+захватывают задачи из таблицы jobs через FOR UPDATE SKIP LOCKED - очередь
+масштабируется вместе с числом процессов без внешнего брокера.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import anyio
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.metrics import JOB_DURATION, JOBS_PROCESSED
+from app.modules.jobs.handlers import JOB_KINDS
+from app.modules.jobs.models import Job
+from app.modules.jobs.repository import job_repository
+from app.modules.transactions.exports import purge_expired_exports
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Задержка перед повтором после attempts неудачных попыток: экспоненциальная, с потолком"""
+    seconds = settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.JOB_RETRY_MAX_SECONDS))
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Ошибку запроса (4xx: нет доступа, неверные параметры) и неверные параметры
+    обработчика (TypeError, ValidationError) повтор не исправит
+    """
+    if isinstance(error, (TypeError, ValidationError)):
+        return False
+    return not (isinstance(error, HTTPException) and error.status_code < 500)
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return str(error) or type(error).__name__
+
+
+class JobWorker:
+    """Исполнители фоновых задач процесса"""
+
+    async def process(self, session_factory: async_sessionmaker[AsyncSession], job: Job) -> None:
+        """
+        Выполнить захваченную задачу и сохранить результат или ошибку.
+
+        Обработчик ограничен временем захвата: после него задачу может взять
+        другой воркер. При остановке процесса задача возвращается в очередь.
+        """
+        spec = JOB_KINDS.get(str(job.kind))
+        started = time.perf_counter()
+        try:
+            if spec is None:
+                raise HTTPException(422, f"Неизвестный тип задачи: {job.kind}")
+            async with session_factory() as session:
+                with anyio.fail_after(settings.JOB_VISIBILITY_TIMEOUT_SECONDS):
+                    result = await spec.handler(session, job)
+        except asyncio.CancelledError:
+            await asyncio.shield(self._release(session_factory, job))
+            raise
+        except Exception as e:
+            retry = is_retryable(e) and job.attempts < job.max_attempts
+            logger.warning(
+                f"Задача {job.id} ({job.kind}), попытка {job.attempts}/{job.max_attempts}: "
+                f"{_error_message(e)}"
+            )
+            async with session_factory() as session:
+                await job_repository.fail(
+                    session,
+                    job,
+                    error=_error_message(e),
+                    retry_in=retry_delay(int(job.attempts)) if retry else None,
+                )
+                await session.commit()
+            outcome = "retry" if retry else "failed"
+            JOB_DURATION.labels(job.kind, outcome).observe(time.perf_counter() - started)
+            JOBS_PROCESSED.labels(job.kind, outcome).inc()
+            return
+
+        async with session_factory() as session:
+            stored = await job_repository.complete(
+                session,
+                job,
+                content=result.content,
+                media_type=result.media_type,
+                filename=result.filename,
+                path=result.path,
+            )
+            await session.commit()
+        if not stored:
+            logger.warning(f"Задача {job.id} выполнена после истечения захвата, результат отброшен")
+        JOB_DURATION.labels(job.kind, "succeeded").observe(time.perf_counter() - started)
+        JOBS_PROCESSED.labels(job.kind, "succeeded").inc()
+
+    async def _release(self, session_factory: async_sessionmaker[AsyncSession], job: Job) -> None:
+        try:
+            async with session_factory() as session:
+                await job_repository.release(session, job)
+                await session.commit()
+        except Exception as e:
+            # Задача вернётся в очередь по истечении захвата
+            logger.warning(f"Не удалось вернуть задачу {job.id} в очередь: {e}")
+
+    async def claim(self, session_factory: async_sessionmaker[AsyncSession]) -> Job | None:
+        async with session_factory() as session:
+            jobs = await job_repository.claim(
+                session,
+                limit=1,
+                lease=timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS),
+            )
+            await session.commit()
+        return jobs[0] if jobs else None
+
+    async def _work_loop(
+        self, session_factory: async_sessionmaker[AsyncSession], poll_interval: float
+    ) -> None:
+        while True:
+            try:
+                job = await self.claim(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось получить задачу из очереди: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(poll_interval)
+                continue
+            # Пока очередь не пуста, следующая задача захватывается без паузы
+            await self.process(session_factory, job)
+
+    async def reap(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """
+        Вернуть в очередь задачи с истёкшим захватом, удалить старые завершённые
+        и просроченные файлы выгрузок на диске этого процесса.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.JOB_RETENTION_HOURS)
+        async with session_factory() as session:
+            requeued = await job_repository.requeue_expired(session)
+            await job_repository.delete_finished_before(session, cutoff)
+            await session.commit()
+        await anyio.to_thread.run_sync(purge_expired_exports)
+        if requeued:
+            logger.warning(f"Задач с истёкшим захватом: {requeued}")
+
+    async def _reap_loop(
+        self, session_factory: async_sessionmaker[AsyncSession], interval: float
+    ) -> None:
+        while True:
+            try:
+                await self.reap(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Не удалось обслужить очередь задач: {e}")
+            await asyncio.sleep(interval)
+
+    async def run(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        poll_interval: float,
+        reap_interval: float,
+    ) -> None:
+        """Фоновая обработка очереди (запускается в lifespan приложения)"""
+        await asyncio.gather(
+            self._reap_loop(session_factory, reap_interval),
+            *(self._work_loop(session_factory, poll_interval) for _ in range(concurrency)),
+        )
+
+
+job_worker = JobWorker()
@@ -0,0 +1,50 @@
+"""
+Файлы выгрузок транзакций на локальном диске (EXPORT_SPOOL_DIR).
+
+Выгрузку пишет фоновая задача, отдаёт GET /transactions/exports/{id} с поддержкой
+Range. Файлы старше EXPORT_TTL_HOURS удаляются при обслуживании очереди задач.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import anyio
+
+from app.core.config import settings
+
+
+def export_path(job_id: int) -> Path:
+    return Path(settings.EXPORT_SPOOL_DIR) / f"transactions-{job_id}.csv"
+
+
+def _write(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+    # Загрузка не увидит недописанный файл
+    os.replace(tmp_path, path)
+
+
+async def write_export(path: Path, content: bytes) -> None:
+    """Записать выгрузку атомарно (в пуле потоков, не блокируя цикл событий)"""
+    await anyio.to_thread.run_sync(_write, path, content)
+
+
+def purge_expired_exports(now: float | None = None) -> int:
+    """Удалить файлы выгрузок старше EXPORT_TTL_HOURS; возвращает число удалённых"""
+    spool_dir = Path(settings.EXPORT_SPOOL_DIR)
+    if not spool_dir.is_dir():
+        return 0
+    cutoff = (now if now is not None else time.time()) - settings.EXPORT_TTL_HOURS * 3600
+    removed = 0
+    for path in spool_dir.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            # Удалён другим процессом
+            continue
+    return removed
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Text, Enum, Integer, ForeignKey
+from sqlalchemy import Column, String, Float, Text, Enum, Integer, ForeignKey, Index
 import enum
 from app.shared.base_model import BaseModel
 
@@ -22,7 +22,10 @@ class Transaction(BaseModel):
     type: Column[TransactionType] = Column(
         Enum(TransactionType), nullable=False, default=TransactionType.EXPENSE
     )
-    transaction_to_group = Column(Integer, nullable=True)
+    # При удалении группы транзакции остаются у пользователей, но без группы
+    transaction_to_group = Column(
+        Integer, ForeignKey("groups.id", ondelete="SET NULL"), nullable=True
+    )
 
     user_id = Column(
         Integer,
@@ -30,5 +33,13 @@ class Transaction(BaseModel):
         nullable=False,
     )
 
-    # Если позже понадобится связь с группой:
-    # group_id = Column(Integer, ForeignKey("groups.id"), nullable=True)
+
+# Лента транзакций группы: фильтр по группе и keyset-пагинация
+# по (created_at, id) в порядке убывания без сортировки
+Index(
+    "ix_transactions_group_created_id",
+    Transaction.transaction_to_group,
+    Transaction.created_at.desc(),
+    Transaction.id.desc(),
+    postgresql_where=Transaction.transaction_to_group.isnot(None),
+)
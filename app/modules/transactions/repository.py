@@ -3,7 +3,7 @@
 from typing import Sequence, Dict
 from datetime import datetime, time
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.transactions.models import Transaction, TransactionType
@@ -40,13 +40,22 @@ class TransactionRepository:
         *,
         transaction_id: int,
         user_id: int,
+        for_update: bool = False,
     ) -> Transaction | None:
-        result = await db.execute(
-            select(Transaction).where(
-                Transaction.id == transaction_id,
-                Transaction.user_id == user_id,
-            )
+        """
+        Получить транзакцию пользователя.
+
+        for_update блокирует строку до конца транзакции (SELECT ... FOR UPDATE):
+        одновременное изменение или удаление той же транзакции ждёт и читает уже
+        новые значения, поэтому изменения group_balances не считаются от старой суммы.
+        """
+        query = select(Transaction).where(
+            Transaction.id == transaction_id,
+            Transaction.user_id == user_id,
         )
+        if for_update:
+            query = query.with_for_update().execution_options(populate_existing=True)
+        result = await db.execute(query)
         return result.scalar_one_or_none()
 
     async def list(
@@ -87,6 +96,53 @@ class TransactionRepository:
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def list_group_feed(
+        self,
+        db: AsyncSession,
+        *,
+        group_id: int,
+        filters: TransactionFilters | None = None,
+        member_id: int | None = None,
+        after: tuple[datetime, int] | None = None,
+        limit: int = 20,
+    ) -> Sequence[Transaction]:
+        """
+        Лента транзакций группы с keyset-пагинацией.
+
+        Порядок (created_at, id) по убыванию совпадает с индексом
+        ix_transactions_group_created_id, поэтому страница читается из индекса
+        без сортировки и без OFFSET - сколько бы страниц ни было пролистано.
+
+        Args:
+            member_id: Только транзакции этого участника
+            after: (created_at, id) последней транзакции предыдущей страницы
+        """
+        query = select(Transaction).where(Transaction.transaction_to_group == group_id)
+
+        if filters:
+            if filters.category:
+                query = query.where(Transaction.category == filters.category)
+            if filters.date_from:
+                date_from_dt = datetime.combine(filters.date_from, time.min)
+                query = query.where(Transaction.created_at >= date_from_dt)
+            if filters.date_to:
+                date_to_dt = datetime.combine(filters.date_to, time.max)
+                query = query.where(Transaction.created_at <= date_to_dt)
+
+        if member_id is not None:
+            query = query.where(Transaction.user_id == member_id)
+
+        if after is not None:
+            query = query.where(
+                tuple_(Transaction.created_at, Transaction.id)
+                < tuple_(literal(after[0]), literal(after[1]))
+            )
+
+        query = query.order_by(Transaction.created_at.desc(), Transaction.id.desc()).limit(limit)
+
+        result = await db.execute(query)
+        return result.scalars().all()
+
     async def list_all(
         self,
         db: AsyncSession,
@@ -1,24 +1,41 @@
 # app/modules/transactions/router.py
 
 
-from fastapi import APIRouter, Depends, Query
+from datetime import timedelta
+
+from fastapi import APIRouter, Body, Depends, Query, Request
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cancellation import request_timeout
+from app.core.compression import skip_compression
+from app.core.config import settings
 from app.core.db import get_db
 from app.core.dto.response import StandardResponse, success_response
+from app.core.etag import check_not_modified, make_etag
+from app.core.routing import StandardResponseRoute
 from app.core.exceptions import NotFoundException
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
 from app.modules.users.models import User
+from app.modules.jobs.models import JobStatus
+from app.modules.jobs.results import job_result_response, poll_after
+from app.modules.jobs.schemas import JobCreate, JobResponse
+from app.modules.jobs.service import job_service
 from app.modules.transactions.schemas import (
     TransactionCreate,
+    TransactionExportCreate,
     TransactionUpdate,
     TransactionResponse,
     PaginatedTransactionResponse,
 )
 from app.modules.transactions.service import transaction_service
 
-router = APIRouter(prefix="/transactions", tags=["transactions"])
+router = APIRouter(prefix="/transactions", tags=["transactions"], route_class=StandardResponseRoute)
+
+
+def _user_etag(user: User) -> str:
+    """ETag данных пользователя: меняется при каждой записи его транзакций"""
+    return make_etag("user", user.id, user.data_version)
 
 
 @router.post(
@@ -46,15 +63,21 @@ async def create_transaction(
     response_model=StandardResponse[PaginatedTransactionResponse],
 )
 async def list_transactions(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     category: str | None = Query(None, description="Фильтр по категории"),
     date_from: str | None = Query(None, description="Начальная дата (YYYY-MM-DD)"),
     date_to: str | None = Query(None, description="Конечная дата (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="Номер страницы"),
     page_size: int = Query(20, ge=1, le=100, description="Размер страницы"),
-) -> StandardResponse[PaginatedTransactionResponse]:
+) -> StandardResponse[PaginatedTransactionResponse] | Response:
     """Получить список транзакций текущего пользователя с фильтрами и пагинацией"""
+    not_modified = check_not_modified(request, response, _user_etag(current_user))
+    if not_modified:
+        return not_modified
+
     result = await transaction_service.list_transactions(
         db=db,
         user_id=int(current_user.id),
@@ -72,8 +95,9 @@ async def list_transactions(
     "/export",
     response_class=Response,
 )
+@request_timeout("export")
 async def export_transactions(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     category: str | None = Query(None, description="Фильтр по категории"),
     date_from: str | None = Query(None, description="Начальная дата (YYYY-MM-DD)"),
@@ -97,16 +121,85 @@ async def export_transactions(
     )
 
 
+@router.post(
+    "/exports",
+    response_model=StandardResponse[JobResponse],
+    status_code=202,
+)
+async def create_export(
+    request: Request,
+    response: Response,
+    export_in: TransactionExportCreate = Body(
+        default_factory=lambda: TransactionExportCreate(category=None, date_from=None, date_to=None)
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StandardResponse[JobResponse]:
+    """
+    Поставить выгрузку транзакций в CSV в очередь и сразу ответить 202.
+
+    Файл скачивается по ссылке из заголовка Location после выполнения выгрузки.
+    Повторный запрос с теми же фильтрами, пока транзакции не менялись, возвращает
+    существующую выгрузку (200, если файл уже готов).
+    """
+    job_in = JobCreate(
+        kind="transactions_export",
+        **export_in.model_dump(),
+    )
+    job, _ = await job_service.enqueue_unique(
+        db,
+        user_id=int(current_user.id),
+        job_in=job_in,
+        data_version=int(current_user.data_version),
+        max_age=timedelta(hours=settings.EXPORT_TTL_HOURS),
+    )
+    response.headers["Location"] = f"{request.url.path}/{job.id}"
+    if job.status == JobStatus.SUCCEEDED:
+        response.status_code = 200
+        return success_response(data=JobResponse.model_validate(job))
+    response.headers["Retry-After"] = poll_after()
+    return success_response(data=JobResponse.model_validate(job), code=202)
+
+
+@router.get(
+    "/exports/{export_id}",
+    response_class=Response,
+)
+@skip_compression
+async def download_export(
+    export_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """
+    Скачать выгрузку транзакций; поддерживаются Range и If-Range для докачки.
+
+    409 - выгрузка ещё не готова (состояние - GET /jobs/{export_id}) или завершилась
+    с ошибкой, 404 - файл удалён по истечении EXPORT_TTL_HOURS.
+    """
+    job = await job_service.get_result(db, job_id=export_id, user_id=int(current_user.id))
+    if job.kind != "transactions_export":
+        raise NotFoundException(detail="Выгрузка не найдена")
+    return job_result_response(job, request)
+
+
 @router.get(
     "/{transaction_id}",
     response_model=StandardResponse[TransactionResponse],
 )
 async def get_transaction(
     transaction_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
-) -> StandardResponse[TransactionResponse]:
+) -> StandardResponse[TransactionResponse] | Response:
     """Получить транзакцию по id (только свою)"""
+    not_modified = check_not_modified(request, response, _user_etag(current_user))
+    if not_modified:
+        return not_modified
+
     tx = await transaction_service.get_transaction(
         db=db,
         transaction_id=transaction_id,
@@ -134,6 +227,7 @@ async def update_transaction(
         db=db,
         transaction_id=transaction_id,
         user_id=int(current_user.id),
+        for_update=True,
     )
     if not tx:
         raise NotFoundException(detail="Транзакция не найдена")
@@ -161,6 +255,7 @@ async def delete_transaction(
         db=db,
         transaction_id=transaction_id,
         user_id=int(current_user.id),
+        for_update=True,
     )
     if not tx:
         raise NotFoundException(detail="Транзакция не найдена")
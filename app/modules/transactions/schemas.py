@@ -80,6 +80,14 @@ class TransactionFilters(BaseModel):
     )
 
 
+class TransactionExportCreate(BaseModel):
+    """Схема постановки выгрузки транзакций в CSV"""
+
+    category: Optional[str] = Field(None, max_length=50, description="Фильтр по категории")
+    date_from: Optional[date] = Field(None, description="Начальная дата (включительно)")
+    date_to: Optional[date] = Field(None, description="Конечная дата (включительно)")
+
+
 class PaginationParams(BaseModel):
     """Параметры пагинации"""
 
@@ -107,3 +115,12 @@ class PaginatedTransactionResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class GroupTransactionFeedResponse(BaseModel):
+    """Страница ленты транзакций группы"""
+
+    items: List[TransactionResponse] = Field(description="Транзакции группы, от новых к старым")
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (None - это последняя страница)"
+    )
@@ -1,28 +1,82 @@
 # app/modules/transactions/service.py
 
+import base64
+import binascii
 import csv
 import io
-from datetime import datetime
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.groups.repository import group_repository
-from app.modules.transactions.models import Transaction
+from app.core.exceptions import ValidationException
+
+from app.modules.group_members.service import group_member_service
+from app.modules.groups.repository import group_balance_repository, group_repository
+from app.modules.transactions.models import Transaction, TransactionType
 from app.modules.transactions.repository import transaction_repository
 from app.modules.transactions.schemas import (
     TransactionCreate,
     TransactionUpdate,
     TransactionFilters,
+    GroupTransactionFeedResponse,
     PaginationParams,
     PaginatedTransactionResponse,
     TransactionResponse,
 )
+from app.modules.users.repository import user_repository
+
+
+def _group_expense(tx: Transaction) -> dict[tuple[int, int], Decimal]:
+    """Вклад транзакции в сумму, заплаченную участником за группу"""
+    if not tx.transaction_to_group or tx.type != TransactionType.EXPENSE:
+        return {}
+    amount = Decimal(str(tx.amount)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return {(int(tx.transaction_to_group), int(tx.user_id)): amount}  # type: ignore[arg-type]
+
+
+def _encode_cursor(tx: Transaction) -> str:
+    """Курсор ленты: (created_at, id) последней транзакции страницы"""
+    raw = f"{tx.created_at.isoformat()}|{tx.id}"  # type: ignore[union-attr]
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, tx_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(tx_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationException(detail="Некорректный курсор страницы")
 
 
 class TransactionService:
     """Сервис для работы с транзакциями"""
 
+    async def _update_group_balances(
+        self,
+        db: AsyncSession,
+        before: dict[tuple[int, int], Decimal],
+        after: dict[tuple[int, int], Decimal],
+    ) -> None:
+        """Перенести изменение вклада транзакции в group_balances (одним запросом)"""
+        deltas = {
+            key: after.get(key, Decimal(0)) - before.get(key, Decimal(0))
+            for key in before.keys() | after.keys()
+        }
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if deltas:
+            await group_balance_repository.apply_deltas(db, deltas)
+
+    async def _bump_data_versions(
+        self, db: AsyncSession, user_id: int, *group_ids: int | None
+    ) -> None:
+        """Увеличить версии данных пользователя и затронутых групп (для ETag)"""
+        await user_repository.bump_data_version(db, user_id)
+        for group_id in {group_id for group_id in group_ids if group_id}:
+            await group_repository.bump_data_version(db, group_id)
+
     async def create_transaction(
         self,
         db: AsyncSession,
@@ -33,20 +87,23 @@ class TransactionService:
         # Проверяем, указана ли группа
         if transaction_in.transaction_to_group:
             # Проверяем, состоит ли пользователь в указанной группе
-            group = await group_repository.get_group(
-                db=db, group_id=transaction_in.transaction_to_group, id_user=user_id
+            is_member = await group_member_service.is_member(
+                db, transaction_in.transaction_to_group, user_id
             )
 
-            if not group:
+            if not is_member:
                 raise HTTPException(
                     status_code=403,
                     detail=f"Пользователь не является участником группы {transaction_in.transaction_to_group} или группа не существует",
                 )
-        return await transaction_repository.create(
+        tx = await transaction_repository.create(
             db=db,
             obj_in=transaction_in,
             user_id=user_id,
         )
+        await self._update_group_balances(db, {}, _group_expense(tx))
+        await self._bump_data_versions(db, user_id, transaction_in.transaction_to_group)
+        return tx
 
     async def get_transaction(
         self,
@@ -54,11 +111,14 @@ class TransactionService:
         *,
         transaction_id: int,
         user_id: int,
+        for_update: bool = False,
     ) -> Transaction | None:
+        """for_update - перед изменением или удалением: строка блокируется до commit"""
         return await transaction_repository.get(
             db=db,
             transaction_id=transaction_id,
             user_id=user_id,
+            for_update=for_update,
         )
 
     async def list_transactions(
@@ -128,6 +188,43 @@ class TransactionService:
             pages=pages,
         )
 
+    async def list_group_transactions(
+        self,
+        db: AsyncSession,
+        *,
+        group_id: int,
+        member_id: int | None = None,
+        category: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> GroupTransactionFeedResponse:
+        """
+        Страница ленты транзакций группы (доступ к группе проверяется в роутере).
+
+        Запрашивается на одну транзакцию больше limit: если она есть, возвращается
+        курсор следующей страницы. Общее количество не считается - COUNT по всей
+        группе стоил бы дороже самой страницы.
+        """
+        filters = TransactionFilters(category=category, date_from=date_from, date_to=date_to)
+        transactions = await transaction_repository.list_group_feed(
+            db=db,
+            group_id=group_id,
+            filters=filters,
+            member_id=member_id,
+            after=_decode_cursor(cursor) if cursor else None,
+            limit=limit + 1,
+        )
+
+        items = transactions[:limit]
+        next_cursor = _encode_cursor(items[-1]) if len(transactions) > limit else None
+
+        return GroupTransactionFeedResponse(
+            items=[TransactionResponse.model_validate(tx) for tx in items],
+            next_cursor=next_cursor,
+        )
+
     async def update_transaction(
         self,
         db: AsyncSession,
@@ -141,20 +238,27 @@ class TransactionService:
             user_id = int(db_obj.user_id)  # Получаем ID пользователя из существующей транзакции
 
             if transaction_in.transaction_to_group:
-                group = await group_repository.get_group(
-                    db=db, group_id=transaction_in.transaction_to_group, id_user=user_id
+                is_member = await group_member_service.is_member(
+                    db, transaction_in.transaction_to_group, user_id
                 )
 
-                if not group:
+                if not is_member:
                     raise HTTPException(
                         status_code=403,
                         detail=f"Пользователь не является участником группы {transaction_in.transaction_to_group}",
                     )
-        return await transaction_repository.update(
+        previous_group = db_obj.transaction_to_group
+        previous_expense = _group_expense(db_obj)
+        tx = await transaction_repository.update(
             db=db,
             db_obj=db_obj,
             obj_in=transaction_in,
         )
+        await self._update_group_balances(db, previous_expense, _group_expense(tx))
+        await self._bump_data_versions(
+            db, int(tx.user_id), previous_group, tx.transaction_to_group  # type: ignore[arg-type]
+        )
+        return tx
 
     async def delete_transaction(
         self,
@@ -162,7 +266,11 @@ class TransactionService:
         *,
         db_obj: Transaction,
     ) -> None:
+        user_id, group_id = int(db_obj.user_id), db_obj.transaction_to_group
+        expense = _group_expense(db_obj)
         await transaction_repository.delete(db=db, db_obj=db_obj)
+        await self._update_group_balances(db, expense, {})
+        await self._bump_data_versions(db, user_id, group_id)  # type: ignore[arg-type]
 
     async def export_transactions_to_csv(
         self,
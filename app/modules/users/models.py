@@ -1,5 +1,5 @@
 # ORM-модель пользователя
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import BigInteger, Column, String, Boolean
 from sqlalchemy.orm import relationship
 
 from app.shared.base_model import BaseModel
@@ -15,6 +15,8 @@ class User(BaseModel):
     full_name = Column(String(200), nullable=True)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Версия данных пользователя (транзакции, аналитика) - основа ETag для условных GET
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     refresh_tokens = relationship(
         "RefreshToken", back_populates="user", cascade="all, delete-orphan", lazy="selectin"
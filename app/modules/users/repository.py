@@ -1,6 +1,6 @@
 # CRUD и работа с БД для пользователей
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.modules.users.models import User
 from app.shared.mixins import CRUDMixin
 
@@ -21,6 +21,24 @@ class UserRepository(CRUDMixin[User]):
         result = await db.execute(select(User).filter(User.email == email))
         return result.scalar_one_or_none()
 
+    async def get_data_version(self, db: AsyncSession, user_id: int) -> int | None:
+        """Получить версию данных пользователя"""
+        result = await db.execute(select(User.data_version).where(User.id == user_id))
+        return result.scalar_one_or_none()
+
+    async def bump_data_version(self, db: AsyncSession, user_id: int) -> None:
+        """
+        Увеличить версию данных пользователя (в рамках текущей транзакции).
+
+        updated_at передаётся явно, чтобы не сработал onupdate - смена версии
+        не является изменением профиля.
+        """
+        await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        )
+
 
 # Создаем экземпляр репозитория для использования
 user_repository = UserRepository()
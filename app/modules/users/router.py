@@ -4,11 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.core.exceptions import NotFoundException
 from app.core.dto.response import StandardResponse, success_response
+from app.core.routing import StandardResponseRoute
 from app.modules.users.service import user_service
 from app.modules.users.schemas import UserResponse
 from app.core.dependencies import get_current_user
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=StandardResponseRoute)
 
 
 @router.get("/me", response_model=StandardResponse[UserResponse])
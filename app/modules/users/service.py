@@ -3,7 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.users.models import User
 from app.modules.users.repository import user_repository
 from app.modules.users.schemas import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.core.exceptions import UserAlreadyExistsException, CredentialsException
 
 
@@ -37,7 +37,7 @@ class UserService:
         if user:
             raise UserAlreadyExistsException(detail="Имя пользователя уже зарегистрировано")
 
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash_async(user_in.password)
 
         user_data = {
             "email": user_in.email,
@@ -58,11 +58,11 @@ class UserService:
         if not user.hashed_password:
             raise CredentialsException(detail="Пароль не установлен для этого пользователя")
 
-        if not verify_password(old_password, str(user.hashed_password)):
+        if not await verify_password_async(old_password, str(user.hashed_password)):
             raise CredentialsException(detail="Неверный текущий пароль")
 
         # Хэшируем новый пароль
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await get_password_hash_async(new_password)
 
         # Обновляем пароль
         updated_user = await user_repository.update(
@@ -22,3 +22,15 @@ def safe_get(data: dict[str, Any], *keys: str, default: Any = None) -> Any:
         if result is None:
             return default
     return result
+
+
+def violated_constraint(error: Exception) -> str | None:
+    """
+    Имя ограничения БД, нарушение которого вызвало IntegrityError.
+
+    asyncpg передаёт имя в исходном исключении (constraint_name), SQLAlchemy
+    сохраняет его в цепочке: IntegrityError.orig.__cause__.
+    """
+    orig = getattr(error, "orig", None)
+    cause = getattr(orig, "__cause__", None)
+    return getattr(cause, "constraint_name", None) or getattr(orig, "constraint_name", None)
@@ -0,0 +1 @@
+"""Бенчмарки Smart Spend (запускаются вручную: python -m benchmarks.<name>)"""
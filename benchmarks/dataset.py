@@ -0,0 +1,338 @@
+"""
+Генератор синтетического набора данных для проверки индексов, аналитики и экспорта на объёме.
+
+Пользователи, группы, участники групп и транзакции загружаются через COPY asyncpg
+одной транзакцией - миллионы строк за минуты вместо дней через POST /transactions.
+Распределения перекошены, как в реальных данных: активность пользователей
+и популярность категорий - по закону Ципфа, суммы - логнормальные со своей медианой
+у каждой категории. Часть расходов участников групп относится к группе, для них
+заполняется group_balances.
+
+Данные детерминированы: одинаковые --seed, размеры и --end дают те же строки
+(ID смещаются на уже существующие в таблицах, поэтому набор можно дозагружать).
+Все пользователи получают пароль DATASET_PASSWORD - под ними можно входить
+из benchmarks.loadtest.
+
+Нужна БД с применёнными миграциями, URL берётся из DATABASE_URL.
+
+Запуск: python -m benchmarks.dataset [--users 10000] [--groups 1000] [--group-size 5]
+                                     [--transactions 1000000] [--seed 42] [--truncate]
+
+Из других бенчмарков: await load_dataset(conn, DatasetConfig(transactions=100_000))
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Iterator
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+
+DATASET_PASSWORD = "dataset-password"
+
+# Категории расходов по убыванию популярности и медиана суммы в рублях
+EXPENSE_CATEGORIES: dict[str, float] = {
+    "Продукты": 900,
+    "Транспорт": 250,
+    "Кафе": 700,
+    "Дом": 2500,
+    "Развлечения": 1500,
+    "Здоровье": 2000,
+    "Одежда": 3500,
+    "Подарки": 3000,
+    "Связь": 600,
+    "Путешествия": 25000,
+}
+INCOME_CATEGORIES: dict[str, float] = {"Зарплата": 80000, "Подработка": 15000, "Кешбэк": 300}
+
+TABLES = ("group_balances", "transactions", "group_members", "groups", "users")
+
+
+@dataclass
+class DatasetConfig:
+    """Размер и форма набора данных"""
+
+    users: int = 10_000
+    groups: int = 1_000
+    # Участников в группе; пользователь состоит не более чем в одной группе
+    group_size: int = 5
+    transactions: int = 1_000_000
+    seed: int = 42
+    # Показатели закона Ципфа: 0 - равномерно, больше - сильнее перекос
+    user_skew: float = 1.0
+    category_skew: float = 1.2
+    # Разброс сумм (sigma логнормального распределения)
+    amount_sigma: float = 0.8
+    income_share: float = 0.1
+    # Доля расходов участника группы, отнесённых к группе
+    group_share: float = 0.3
+    days: int = 365
+    end: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+    )
+    batch_size: int = 50_000
+
+    def __post_init__(self) -> None:
+        if self.groups * self.group_size > self.users:
+            raise ValueError(
+                f"Участников групп ({self.groups} x {self.group_size}) больше, "
+                f"чем пользователей ({self.users})"
+            )
+
+
+def zipf_cum_weights(count: int, skew: float) -> list[float]:
+    """Накопленные веса рангов 1..count по закону Ципфа для random.choices"""
+    return list(accumulate(1 / rank**skew for rank in range(1, count + 1)))
+
+
+def generate_users(config: DatasetConfig, first_id: int) -> Iterator[tuple]:
+    password_hash = get_password_hash(DATASET_PASSWORD)
+    created_from = config.end - timedelta(days=config.days)
+    rng = random.Random(f"{config.seed}:users")
+    for user_id in range(first_id, first_id + config.users):
+        username = f"ds{config.seed}_{user_id}"
+        created_at = created_from + timedelta(seconds=rng.uniform(0, 86400))
+        yield (
+            user_id,
+            username,
+            f"{username}@dataset.example.com",
+            f"Пользователь {user_id}",
+            password_hash,
+            True,
+            0,
+            created_at,
+        )
+
+
+def assign_groups(config: DatasetConfig, first_user_id: int, first_group_id: int) -> dict[int, int]:
+    """Участники групп: {user_id: group_id}, первые group_size пользователей группы - подряд"""
+    rng = random.Random(f"{config.seed}:groups")
+    user_ids = list(range(first_user_id, first_user_id + config.users))
+    rng.shuffle(user_ids)
+    return {
+        user_ids[i]: first_group_id + i // config.group_size
+        for i in range(config.groups * config.group_size)
+    }
+
+
+def generate_groups(
+    config: DatasetConfig, first_group_id: int, membership: dict[int, int]
+) -> Iterator[tuple]:
+    owners: dict[int, int] = {}
+    for user_id, group_id in membership.items():
+        owners.setdefault(group_id, user_id)
+    created_at = config.end - timedelta(days=config.days)
+    for group_id in range(first_group_id, first_group_id + config.groups):
+        yield (group_id, f"Группа {group_id}", owners[group_id], 0, created_at)
+
+
+def generate_members(
+    config: DatasetConfig, first_member_id: int, membership: dict[int, int]
+) -> Iterator[tuple]:
+    created_at = config.end - timedelta(days=config.days)
+    for member_id, (user_id, group_id) in enumerate(membership.items(), start=first_member_id):
+        yield (member_id, group_id, user_id, created_at)
+
+
+def generate_transactions(
+    config: DatasetConfig, first_id: int, first_user_id: int, membership: dict[int, int]
+) -> Iterator[list[tuple]]:
+    """Транзакции пачками по batch_size строк"""
+    rng = random.Random(f"{config.seed}:transactions")
+    # Ранги активности перемешаны, чтобы самые активные не шли подряд по ID
+    user_ids = list(range(first_user_id, first_user_id + config.users))
+    random.Random(f"{config.seed}:activity").shuffle(user_ids)
+    user_weights = zipf_cum_weights(len(user_ids), config.user_skew)
+    expense_names = list(EXPENSE_CATEGORIES)
+    expense_weights = zipf_cum_weights(len(expense_names), config.category_skew)
+    income_names = list(INCOME_CATEGORIES)
+    income_weights = zipf_cum_weights(len(income_names), config.category_skew)
+    mu = {
+        name: math.log(median) for name, median in (EXPENSE_CATEGORIES | INCOME_CATEGORIES).items()
+    }
+    span = config.days * 86400
+
+    tx_id = first_id
+    remaining = config.transactions
+    while remaining:
+        size = min(config.batch_size, remaining)
+        batch = []
+        for user_id in rng.choices(user_ids, cum_weights=user_weights, k=size):
+            if rng.random() < config.income_share:
+                kind = "INCOME"
+                category = rng.choices(income_names, cum_weights=income_weights)[0]
+                group_id = None
+            else:
+                kind = "EXPENSE"
+                category = rng.choices(expense_names, cum_weights=expense_weights)[0]
+                group_id = membership.get(user_id)
+                if group_id is not None and rng.random() >= config.group_share:
+                    group_id = None
+            amount = round(rng.lognormvariate(mu[category], config.amount_sigma), 2)
+            created_at = config.end - timedelta(seconds=rng.uniform(0, span))
+            title = f"{category} #{tx_id}"
+            batch.append(
+                (tx_id, title, amount, None, category, kind, group_id, user_id, created_at)
+            )
+            tx_id += 1
+        remaining -= size
+        yield batch
+
+
+async def next_id(conn: asyncpg.Connection, table: str) -> int:
+    return int(await conn.fetchval(f"SELECT coalesce(max(id), 0) + 1 FROM {table}"))
+
+
+async def load_dataset(conn: asyncpg.Connection, config: DatasetConfig) -> dict[str, int]:
+    """
+    Загрузить набор данных одной транзакцией и обновить статистику планировщика.
+
+    Returns:
+        dict[str, int]: строк загружено по таблицам
+    """
+    counts: dict[str, int] = {}
+    async with conn.transaction():
+        first_user_id = await next_id(conn, "users")
+        first_group_id = await next_id(conn, "groups")
+        first_member_id = await next_id(conn, "group_members")
+        first_tx_id = await next_id(conn, "transactions")
+        membership = assign_groups(config, first_user_id, first_group_id)
+
+        await conn.copy_records_to_table(
+            "users",
+            records=generate_users(config, first_user_id),
+            columns=[
+                "id",
+                "username",
+                "email",
+                "full_name",
+                "hashed_password",
+                "is_active",
+                "data_version",
+                "created_at",
+            ],
+        )
+        counts["users"] = config.users
+        await conn.copy_records_to_table(
+            "groups",
+            records=generate_groups(config, first_group_id, membership),
+            columns=["id", "name", "owner_id", "data_version", "created_at"],
+        )
+        counts["groups"] = config.groups
+        await conn.copy_records_to_table(
+            "group_members",
+            records=generate_members(config, first_member_id, membership),
+            columns=["id", "group_id", "user_id", "created_at"],
+        )
+        counts["group_members"] = len(membership)
+
+        for batch in generate_transactions(config, first_tx_id, first_user_id, membership):
+            await conn.copy_records_to_table(
+                "transactions",
+                records=batch,
+                columns=[
+                    "id",
+                    "title",
+                    "amount",
+                    "description",
+                    "category",
+                    "type",
+                    "transaction_to_group",
+                    "user_id",
+                    "created_at",
+                ],
+            )
+        counts["transactions"] = config.transactions
+
+        # Суммы, заплаченные за группу, - как при создании транзакций через API
+        result = await conn.execute(
+            """
+            INSERT INTO group_balances (group_id, user_id, paid)
+            SELECT transaction_to_group, user_id, sum(round(amount::numeric, 2))
+            FROM transactions
+            WHERE id >= $1 AND type = 'EXPENSE' AND transaction_to_group IS NOT NULL
+            GROUP BY transaction_to_group, user_id
+            """,
+            first_tx_id,
+        )
+        counts["group_balances"] = int(result.split()[-1])
+
+        # ID заданы явно - последовательности нужно сдвинуть за них
+        for table in ("users", "groups", "group_members", "transactions"):
+            await conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), max(id)) FROM {table}"
+            )
+
+    await conn.execute(f"ANALYZE {', '.join(TABLES)}")
+    return counts
+
+
+async def truncate(conn: asyncpg.Connection) -> None:
+    """Очистить таблицы набора данных (вместе с зависящими от пользователей)"""
+    await conn.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """DSN для asyncpg из URL SQLAlchemy (postgresql+asyncpg://...)"""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def main(config: DatasetConfig, reset: bool) -> None:
+    conn = await asyncpg.connect(asyncpg_dsn(settings.DATABASE_URL))
+    try:
+        if reset:
+            await truncate(conn)
+        started = time.perf_counter()
+        counts = await load_dataset(conn, config)
+        elapsed = time.perf_counter() - started
+    finally:
+        await conn.close()
+
+    summary = {
+        "config": {**asdict(config), "end": config.end.isoformat()},
+        "rows": counts,
+        "seconds": round(elapsed, 1),
+        "transactions_per_second": round(config.transactions / elapsed),
+    }
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    defaults = DatasetConfig()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--groups", type=int, default=defaults.groups)
+    parser.add_argument("--group-size", type=int, default=defaults.group_size)
+    parser.add_argument("--transactions", type=int, default=defaults.transactions)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--user-skew", type=float, default=defaults.user_skew)
+    parser.add_argument("--category-skew", type=float, default=defaults.category_skew)
+    parser.add_argument("--amount-sigma", type=float, default=defaults.amount_sigma)
+    parser.add_argument("--income-share", type=float, default=defaults.income_share)
+    parser.add_argument("--group-share", type=float, default=defaults.group_share)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=defaults.end,
+        help="Дата последней транзакции (ISO 8601), по умолчанию - начало текущих суток UTC",
+    )
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    parser.add_argument("--truncate", action="store_true", help="Очистить таблицы перед загрузкой")
+    args = vars(parser.parse_args())
+    reset = args.pop("truncate")
+    config = DatasetConfig(**args)
+    if config.end.tzinfo is None:
+        config.end = config.end.replace(tzinfo=timezone.utc)
+    asyncio.run(main(config, reset))
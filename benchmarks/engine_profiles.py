@@ -0,0 +1,73 @@
+"""
+Пропускная способность запросов к PostgreSQL для профилей движка dev, prod и benchmark.
+
+Нужна запущенная БД с применёнными миграциями (alembic upgrade head), URL берётся
+из DATABASE_URL. Нагрузка - страница транзакций пользователя, как в GET /transactions.
+
+Запуск: python -m benchmarks.engine_profiles [--concurrency 20] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+from app.core.db_profiles import ENGINE_PROFILES
+
+QUERY = text(
+    "SELECT id, title, amount, category, type, created_at FROM transactions "
+    "WHERE user_id = :user_id ORDER BY created_at DESC LIMIT 20"
+)
+
+
+async def run_profile(engine: AsyncEngine, concurrency: int, seconds: float) -> dict[str, float]:
+    deadline = time.perf_counter() + seconds
+    latencies: list[float] = []
+
+    async def worker(user_id: int) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with engine.connect() as conn:
+                await conn.execute(QUERY, {"user_id": user_id})
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i % 10 + 1) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "queries_per_second": round(len(latencies) / elapsed),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2),
+    }
+
+
+async def main(concurrency: int, seconds: float) -> None:
+    results = {}
+    # Лог SQL профиля dev пишется в /dev/null: замеряем его стоимость, а не скорость терминала.
+    # Обработчик лога sqlalchemy.engine запоминает sys.stdout при создании движка,
+    # поэтому /dev/null остаётся открытым до конца замеров
+    with open(os.devnull, "w") as devnull:
+        for name, profile in ENGINE_PROFILES.items():
+            with contextlib.redirect_stdout(devnull):
+                engine = create_async_engine(settings.DATABASE_URL, **profile.engine_kwargs())
+            try:
+                await run_profile(engine, concurrency, min(seconds, 2))  # прогрев пула и кэшей
+                results[name] = await run_profile(engine, concurrency, seconds)
+            finally:
+                await engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.seconds))
@@ -0,0 +1,108 @@
+"""
+Время импорта app.main по данным python -X importtime и проверка бюджета холодного старта.
+
+Импорт app.main выполняется в отдельных процессах (первый - прогрев кэша байткода),
+результат - лучший из прогонов. Выводятся время импорта, самые дорогие пакеты
+по собственному времени импорта и тяжёлые зависимости, которые должны загружаться
+лениво, но оказались импортированы.
+
+Код выхода 1, если время превышает бюджет или ленивый модуль импортирован при старте.
+
+Запуск: python -m benchmarks.import_time [--runs 5] [--budget-ms 2000] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+# Фиктивные DATABASE_URL и SECRET_KEY для дочерних процессов
+import benchmarks.common  # noqa: F401
+
+# Бюджет импорта app.main, мс; на машине разработчика импорт занимает ~1.3 с
+DEFAULT_BUDGET_MS = 2000
+# Зависимости, которые импортируются при первом использовании, а не при старте
+LAZY_MODULES = ("matplotlib", "jose", "passlib")
+
+
+class ImportEntry(NamedTuple):
+    """Строка вывода -X importtime: собственное и накопленное время импорта модуля (мкс)"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportEntry]:
+    """Разобрать вывод -X importtime (строки "import time: self | cumulative | module")"""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        entries.append(ImportEntry(name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def import_app() -> list[ImportEntry]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        env=os.environ,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize(entries: list[ImportEntry], top: int) -> dict:
+    """Время импорта app.main, самые дорогие пакеты и загруженные ленивые модули"""
+    app_main = next(entry for entry in entries if entry.module == "app.main")
+    by_package: dict[str, int] = defaultdict(int)
+    for entry in entries:
+        by_package[entry.module.split(".")[0]] += entry.self_us
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    loaded = {entry.module.split(".")[0] for entry in entries}
+    return {
+        "app_main_ms": round(app_main.cumulative_us / 1000, 1),
+        "modules": len(entries),
+        "top_packages_ms": {name: round(us / 1000, 1) for name, us in packages},
+        "eager_lazy_modules": [name for name in LAZY_MODULES if name in loaded],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="Сколько пакетов вывести")
+    args = parser.parse_args()
+
+    import_app()  # прогрев кэша байткода
+    runs = [summarize(import_app(), args.top) for _ in range(args.runs)]
+    best = min(runs, key=lambda run: run["app_main_ms"])
+    best["runs_ms"] = [run["app_main_ms"] for run in runs]
+    best["budget_ms"] = args.budget_ms
+    print(json.dumps(best, indent=2))
+
+    failed = False
+    if best["app_main_ms"] > args.budget_ms:
+        print(
+            f"Импорт app.main {best['app_main_ms']} мс превышает бюджет {args.budget_ms} мс",
+            file=sys.stderr,
+        )
+        failed = True
+    if best["eager_lazy_modules"]:
+        print(
+            f"При старте импортированы ленивые модули: {', '.join(best['eager_lazy_modules'])}",
+            file=sys.stderr,
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Нагрузочный тест запущенного приложения: смесь сценариев от виртуальных пользователей.
+
+Каждый виртуальный пользователь регистрируется, создаёт несколько транзакций и в цикле
+выполняет сценарии, выбранные случайно с весами смеси (вход, страницы списка
+транзакций, создание, аналитика, диаграмма, экспорт). Результат - JSON с RPS,
+долей ошибок и перцентилями задержки p50/p95/p99 по каждому endpoint'у
+и коммитом, на котором он получен, - для сравнения коммитов между собой.
+
+Нужны запущенное приложение и PostgreSQL с применёнными миграциями. Ограничения
+попыток входа по IP и по имени пользователя (по умолчанию 5 в минуту) рассчитаны
+на людей: виртуальный пользователь входит чаще, и без их повышения смеси со входом
+меряют ответы 429. Поэтому оба ограничения нужно поднять:
+
+    DB_PROFILE=benchmark \\
+        LOGIN_RATE_LIMIT_IP_PER_MINUTE=1000000 LOGIN_RATE_LIMIT_IP_BURST=100000 \\
+        LOGIN_RATE_LIMIT_USERNAME_PER_MINUTE=1000000 LOGIN_RATE_LIMIT_USERNAME_BURST=100000 \\
+        uvicorn app.main:app --port 8000
+
+Запуск: python -m benchmarks.loadtest [--users 20] [--seconds 30] [--mix default]
+                                      [--output reports/loadtest.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+import httpx
+
+API_PREFIX = "/api/v1"
+PASSWORD = "loadtest-password"
+CATEGORIES = ["Продукты", "Транспорт", "Кафе", "Дом", "Развлечения"]
+# Транзакций у каждого пользователя перед началом замера
+SEED_TRANSACTIONS = 30
+
+
+@dataclass
+class VirtualUser:
+    """Виртуальный пользователь со своим токеном и генератором случайных чисел"""
+
+    username: str
+    rng: random.Random
+    access_token: str = ""
+    transaction_ids: list[int] = field(default_factory=list)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+@dataclass
+class Recorder:
+    """Задержки и коды ответов по endpoint'ам (метка - метод и шаблон пути)"""
+
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, dict[str, int]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(int))
+    )
+    enabled: bool = True
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        label: str,
+        method: str,
+        url: str,
+        **kwargs: object,
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)  # type: ignore[arg-type]
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        if self.enabled:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.statuses[label][status] += 1
+        return response
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, VirtualUser], Awaitable[None]]
+
+
+def _new_transaction(rng: random.Random) -> dict:
+    return {
+        "title": f"Покупка {rng.randint(1, 10_000)}",
+        "amount": round(rng.uniform(50, 5000), 2),
+        "category": rng.choice(CATEGORIES),
+        "type": "expense" if rng.random() < 0.85 else "income",
+    }
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser) -> None:
+    response = await recorder.request(
+        client,
+        "POST /auth/login",
+        "POST",
+        f"{API_PREFIX}/auth/login",
+        json={"username": user.username, "password": PASSWORD},
+    )
+    if response is not None and response.status_code == 200:
+        user.access_token = response.json()["data"]["access_token"]
+
+
+async def list_first_page(client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser) -> None:
+    await recorder.request(
+        client,
+        "GET /transactions",
+        "GET",
+        f"{API_PREFIX}/transactions",
+        params={"page": 1, "page_size": 20},
+        headers=user.headers,
+    )
+
+
+async def list_deep_page(client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser) -> None:
+    await recorder.request(
+        client,
+        "GET /transactions?page=N",
+        "GET",
+        f"{API_PREFIX}/transactions",
+        params={"page": user.rng.randint(2, 5), "page_size": 20},
+        headers=user.headers,
+    )
+
+
+async def create_transaction(
+    client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser
+) -> None:
+    response = await recorder.request(
+        client,
+        "POST /transactions",
+        "POST",
+        f"{API_PREFIX}/transactions",
+        json=_new_transaction(user.rng),
+        headers=user.headers,
+    )
+    if response is not None and response.status_code == 201:
+        user.transaction_ids.append(response.json()["data"]["id"])
+
+
+async def analytics(client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser) -> None:
+    await recorder.request(
+        client, "GET /analytics", "GET", f"{API_PREFIX}/analytics", headers=user.headers
+    )
+
+
+async def chart(client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser) -> None:
+    await recorder.request(
+        client,
+        "GET /analytics/chart",
+        "GET",
+        f"{API_PREFIX}/analytics/chart",
+        headers=user.headers,
+    )
+
+
+async def export(client: httpx.AsyncClient, recorder: Recorder, user: VirtualUser) -> None:
+    await recorder.request(
+        client,
+        "GET /transactions/export",
+        "GET",
+        f"{API_PREFIX}/transactions/export",
+        headers=user.headers,
+    )
+
+
+# Смеси сценариев: вес - относительная частота выбора сценария
+MIXES: dict[str, dict[Scenario, int]] = {
+    # Типичный день: в основном просмотр списка, изредка тяжёлые отчёты
+    "default": {
+        login: 5,
+        list_first_page: 35,
+        list_deep_page: 10,
+        create_transaction: 20,
+        analytics: 20,
+        chart: 5,
+        export: 5,
+    },
+    # Только чтение без входа и отчётов - предельная пропускная способность API
+    "read": {list_first_page: 70, list_deep_page: 30},
+    # Запись - нагрузка на пул соединений и COMMIT
+    "write": {create_transaction: 80, list_first_page: 20},
+    # Тяжёлые отчёты: аналитика, диаграммы (пул потоков matplotlib) и экспорт
+    "reports": {analytics: 50, chart: 30, export: 20},
+}
+
+
+async def prepare_user(client: httpx.AsyncClient, index: int, run_id: str) -> VirtualUser:
+    """Зарегистрировать пользователя и создать ему транзакции (вне замера)"""
+    user = VirtualUser(username=f"lt_{run_id}_{index}", rng=random.Random(index))
+    response = await client.post(
+        f"{API_PREFIX}/auth/register",
+        json={
+            "username": user.username,
+            "email": f"{user.username}@loadtest.example.com",
+            "password": PASSWORD,
+        },
+    )
+    response.raise_for_status()
+    user.access_token = response.json()["data"]["access_token"]
+
+    seed = Recorder(enabled=False)
+    for _ in range(SEED_TRANSACTIONS):
+        await create_transaction(client, seed, user)
+    return user
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль q (0..100) отсортированного списка методом ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    """Сводка по endpoint'ам и в целом: запросы, RPS, ошибки, перцентили задержки (мс)"""
+
+    def stats(latencies: list[float], statuses: dict[str, int]) -> dict:
+        latencies = sorted(latencies)
+        # Ошибка - код 4xx/5xx или сбой соединения (вместо кода - имя исключения)
+        errors = sum(
+            count for status, count in statuses.items() if not status.startswith(("2", "3"))
+        )
+        return {
+            "requests": len(latencies),
+            "rps": round(len(latencies) / elapsed, 1),
+            "errors": errors,
+            "error_rate": round(errors / len(latencies), 4) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "statuses": dict(sorted(statuses.items())),
+        }
+
+    endpoints = {
+        label: stats(recorder.latencies[label], recorder.statuses[label])
+        for label in sorted(recorder.latencies)
+    }
+    total_statuses: dict[str, int] = defaultdict(int)
+    for statuses in recorder.statuses.values():
+        for status, count in statuses.items():
+            total_statuses[status] += count
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    return {"total": stats(all_latencies, total_statuses), "endpoints": endpoints}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(
+    base_url: str, users: int, seconds: float, warmup: float, mix_name: str, think_ms: float
+) -> dict:
+    mix = MIXES[mix_name]
+    scenarios, weights = list(mix), list(mix.values())
+    recorder = Recorder(enabled=False)
+    run_id = uuid.uuid4().hex[:8]
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        virtual_users = []
+        for start in range(0, users, 10):
+            virtual_users += await asyncio.gather(
+                *(prepare_user(client, i, run_id) for i in range(start, min(start + 10, users)))
+            )
+
+        async def worker(user: VirtualUser, deadline: float) -> None:
+            while time.perf_counter() < deadline:
+                scenario = user.rng.choices(scenarios, weights)[0]
+                await scenario(client, recorder, user)
+                if think_ms:
+                    await asyncio.sleep(think_ms / 1000)
+
+        # Прогрев: пул соединений, кэши приложения и PostgreSQL
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(user, deadline) for user in virtual_users))
+
+        recorder.enabled = True
+        started = time.perf_counter()
+        deadline = started + seconds
+        await asyncio.gather(*(worker(user, deadline) for user in virtual_users))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "config": {
+            "base_url": base_url,
+            "users": users,
+            "seconds": seconds,
+            "warmup_seconds": warmup,
+            "mix": mix_name,
+            "think_ms": think_ms,
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        **summarize(recorder, elapsed),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20, help="Виртуальные пользователи")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    parser.add_argument("--think-ms", type=float, default=0, help="Пауза между запросами")
+    parser.add_argument("--output", help="Файл для JSON результата (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run(args.base_url, args.users, args.seconds, args.warmup, args.mix, args.think_ms)
+    )
+    report = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
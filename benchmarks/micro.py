@@ -0,0 +1,257 @@
+"""
+Микробенчмарки горячих путей сервисного слоя без БД, со сравнением с сохранённым baseline.
+
+Замеры: обёртка ответа StandardResponseMiddleware, TransactionResponse.model_validate
+для страницы из 100 транзакций, форматирование строк CSV экспорта, отрисовка пустой
+диаграммы и диаграммы группы, создание и проверка JWT, проверка пароля argon2.
+Результат замера - лучшее из нескольких прогонов время одного вызова (мкс).
+
+Запуск:
+    python -m benchmarks.micro --save        # записать baseline (benchmarks/baseline.json)
+    python -m benchmarks.micro               # сравнить с baseline, код 1 при регрессии
+    python -m benchmarks.micro --threshold 0.1 --only jwt_create jwt_decode
+
+Сравнение с baseline имеет смысл на той же машине и версии Python:
+отличия окружения выводятся предупреждением.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from benchmarks.common import measure, measure_async
+
+from app.core.middleware import StandardResponseMiddleware
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    verify_password,
+)
+from app.modules.analytics.schemas import GroupAnalyticsResponse
+from app.modules.analytics.service import analytics_service
+from app.modules.auth.models import RefreshToken  # noqa: F401 - связи User для ORM
+from app.modules.transactions.models import Transaction, TransactionType
+from app.modules.transactions.schemas import TransactionResponse
+from app.modules.transactions.service import transaction_service
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+# Допустимое замедление относительно baseline (доля): разброс быстрых замеров
+# между запусками на одной машине - до 15%
+DEFAULT_THRESHOLD = 0.2
+CATEGORIES = ["Продукты", "Транспорт", "Кафе", "Дом", "Развлечения", "Здоровье", "Одежда"]
+
+
+class Case(NamedTuple):
+    """Замер: функция, асинхронная ли она, вызовов в прогоне и число прогонов"""
+
+    fn: Callable[[], Any]
+    is_async: bool
+    number: int
+    repeat: int
+
+
+def build_transactions(count: int) -> list[Transaction]:
+    """ORM-объекты транзакций, не привязанные к сессии"""
+    now = datetime.now(timezone.utc)
+    return [
+        Transaction(
+            id=i,
+            user_id=1,
+            title=f"Покупка {i}",
+            amount=100.0 + i,
+            description="Описание транзакции",
+            category=CATEGORIES[i % len(CATEGORIES)],
+            type=TransactionType.EXPENSE,
+            transaction_to_group=None,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def build_group_analytics() -> GroupAnalyticsResponse:
+    return GroupAnalyticsResponse(
+        period="2026-10",
+        group_id=1,
+        group_name="Семья",
+        total_expense=52_000,
+        by_category={category: 4000.0 + i * 1500 for i, category in enumerate(CATEGORIES)},
+        member_expenses={f"user_id: {i}": 5000.0 + i * 700 for i in range(1, 7)},
+    )
+
+
+def middleware_envelope() -> Callable[[], Any]:
+    """Обёртка JSON-ответа из 100 элементов в конверт StandardResponse"""
+    body = json.dumps(
+        {"items": [{"id": i, "title": f"Transaction {i}", "amount": 100.5} for i in range(100)]}
+    ).encode()
+
+    async def endpoint(scope: dict, receive: Any, send: Any) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: dict) -> None:
+        pass
+
+    middleware = StandardResponseMiddleware(endpoint)  # type: ignore[arg-type]
+    scope = {"type": "http", "path": "/api/v1/transactions", "method": "GET", "headers": []}
+    return lambda: middleware(scope, receive, send)  # type: ignore[arg-type]
+
+
+def build_cases(stack: ExitStack) -> dict[str, Case]:
+    """Замеры; чтение из БД в экспорте и аналитике группы подменяется готовыми данными"""
+    page = build_transactions(100)
+    stack.enter_context(
+        patch(
+            "app.modules.transactions.service.transaction_repository.list_all",
+            AsyncMock(return_value=build_transactions(1000)),
+        )
+    )
+    stack.enter_context(
+        patch.object(
+            analytics_service,
+            "get_group_analytics",
+            AsyncMock(return_value=build_group_analytics()),
+        )
+    )
+    token = create_access_token({"sub": "1"})
+    password_hash = get_password_hash("benchmark-password")
+
+    return {
+        "middleware_envelope": Case(middleware_envelope(), True, 5000, 5),
+        "transaction_page_validate": Case(
+            lambda: [TransactionResponse.model_validate(tx) for tx in page], False, 200, 5
+        ),
+        "export_csv_1000_rows": Case(
+            lambda: transaction_service.export_transactions_to_csv(MagicMock(), user_id=1),
+            True,
+            20,
+            5,
+        ),
+        "empty_chart": Case(
+            lambda: analytics_service._create_empty_chart("Нет данных"), False, 5, 3
+        ),
+        "group_chart_category": Case(
+            lambda: analytics_service.get_group_chart(MagicMock(), user_id=1, group_id=1),
+            True,
+            5,
+            3,
+        ),
+        "jwt_create": Case(lambda: create_access_token({"sub": "1"}), False, 2000, 5),
+        "jwt_decode": Case(lambda: decode_access_token(token), False, 2000, 5),
+        "argon2_verify": Case(
+            lambda: verify_password("benchmark-password", password_hash), False, 10, 3
+        ),
+    }
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def run(only: list[str] | None) -> dict[str, float]:
+    """Выполнить замеры, мкс на вызов (лучший прогон)"""
+    results = {}
+    with ExitStack() as stack:
+        for name, case in build_cases(stack).items():
+            if only and name not in only:
+                continue
+            timing = (measure_async if case.is_async else measure)(
+                case.fn, number=case.number, repeat=case.repeat
+            )
+            results[name] = round(timing["best_us"], 2)
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> dict[str, dict[str, Any]]:
+    """Сравнить с baseline: отношение времени и признак регрессии для каждого замера"""
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            comparison[name] = {"current_us": current, "baseline_us": None, "status": "new"}
+            continue
+        ratio = current / previous
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[name] = {
+            "current_us": current,
+            "baseline_us": previous,
+            "ratio": round(ratio, 3),
+            "status": status,
+        }
+    return comparison
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Записать результат как baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--only", nargs="+", help="Выполнить только указанные замеры")
+    args = parser.parse_args()
+
+    results = run(args.only)
+
+    if args.save:
+        saved = {"environment": environment(), "results": results}
+        if args.only and args.baseline.exists():
+            # Частичный прогон обновляет только свои замеры
+            previous = json.loads(args.baseline.read_text(encoding="utf-8"))
+            saved["results"] = {**previous["results"], **results}
+        args.baseline.write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(json.dumps(results, indent=2))
+        return 0
+
+    if not args.baseline.exists():
+        print(json.dumps(results, indent=2))
+        print(f"Baseline {args.baseline} не найден, сохраните его: --save", file=sys.stderr)
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline["environment"] != environment():
+        print(
+            f"Baseline снят в другом окружении: {baseline['environment']}, "
+            f"текущее: {environment()}",
+            file=sys.stderr,
+        )
+    comparison = compare(results, baseline["results"], args.threshold)
+    print(json.dumps(comparison, indent=2))
+
+    regressions = [name for name, item in comparison.items() if item["status"] == "regression"]
+    if regressions:
+        print(f"Замедление больше {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Накладные расходы StandardResponseMiddleware на один запрос.
+
+Запуск: python -m benchmarks.middleware
+"""
+
+import asyncio
+import json
+
+from benchmarks.common import asgi_get, measure_async
+
+from fastapi import FastAPI
+
+from app.core.dto.response import StandardResponse, success_response
+from app.core.middleware import StandardResponseMiddleware, mark_enveloped_routes
+
+PAYLOAD = {"items": [{"id": i, "title": f"Transaction {i}", "amount": 100.5} for i in range(100)]}
+
+
+def build_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/enveloped", response_model=StandardResponse[dict])
+    async def enveloped() -> StandardResponse[dict]:
+        return success_response(data=PAYLOAD)
+
+    @app.get("/plain")
+    async def plain() -> dict:
+        return PAYLOAD
+
+    if with_middleware:
+        mark_enveloped_routes(app.routes)
+        app.add_middleware(StandardResponseMiddleware)
+    return app
+
+
+def main() -> None:
+    bare = build_app(with_middleware=False)
+    wrapped = build_app(with_middleware=True)
+
+    # Проверяем, что middleware действительно оборачивает "плоский" ответ
+    _, body = asyncio.run(asgi_get(wrapped, "/plain"))
+    assert json.loads(body)["data"] == PAYLOAD
+
+    results = {}
+    for path in ("/enveloped", "/plain"):
+        base = measure_async(lambda: asgi_get(bare, path))
+        with_mw = measure_async(lambda: asgi_get(wrapped, path))
+        results[path] = {
+            "bare_us": round(base["best_us"], 1),
+            "middleware_us": round(with_mw["best_us"], 1),
+            "overhead_us": round(with_mw["best_us"] - base["best_us"], 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
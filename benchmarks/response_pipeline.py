@@ -0,0 +1,119 @@
+"""
+Пропускная способность GET /transactions при page_size=100:
+стандартный APIRoute (повторная валидация и jsonable_encoder) против
+StandardResponseRoute (однократная сериализация через TypeAdapter.dump_json).
+
+Запуск: python -m benchmarks.response_pipeline
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from benchmarks.common import asgi_get, measure_async
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+
+from app.core.db import get_db
+from app.core.dependencies import get_current_user
+from app.core.middleware import StandardResponseMiddleware, mark_enveloped_routes
+from app.modules.transactions.models import TransactionType
+from app.modules.transactions.router import router as transactions_router
+from app.modules.transactions.schemas import (
+    PaginatedTransactionResponse,
+    TransactionResponse,
+)
+
+PAGE_SIZE = 100
+
+
+def build_page() -> PaginatedTransactionResponse:
+    now = datetime.now(timezone.utc)
+    items = [
+        TransactionResponse(
+            id=i,
+            user_id=1,
+            title=f"Покупка {i}",
+            amount=100.0 + i,
+            description="Описание транзакции",
+            category="Продукты",
+            type=TransactionType.EXPENSE,
+            transaction_to_group=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(PAGE_SIZE)
+    ]
+    return PaginatedTransactionResponse(
+        items=items, total=1000, page=1, page_size=PAGE_SIZE, pages=10
+    )
+
+
+def plain_router() -> APIRouter:
+    """Те же endpoint'ы, но со стандартным APIRoute"""
+    router = APIRouter(prefix=transactions_router.prefix)
+    for route in transactions_router.routes:
+        assert isinstance(route, APIRoute)
+        router.add_api_route(
+            route.path_format.removeprefix(transactions_router.prefix),
+            route.endpoint,
+            methods=list(route.methods),
+            response_model=route.response_model,
+            response_class=route.response_class,
+            status_code=route.status_code,
+        )
+    return router
+
+
+def build_app(router: APIRouter) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+
+    async def override_get_db() -> Any:
+        yield MagicMock()
+
+    user = MagicMock()
+    user.id = 1
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    mark_enveloped_routes(app.routes)
+    app.add_middleware(StandardResponseMiddleware)
+    return app
+
+
+def main() -> None:
+    page = build_page()
+    apps = {
+        "APIRoute": build_app(plain_router()),
+        "StandardResponseRoute": build_app(transactions_router),
+    }
+    query = b"page_size=%d" % PAGE_SIZE
+
+    results: dict[str, Any] = {}
+    with patch(
+        "app.modules.transactions.router.transaction_service.list_transactions",
+        AsyncMock(return_value=page),
+    ):
+        bodies = {}
+        for name, app in apps.items():
+            _, body = asyncio.run(asgi_get(app, "/api/v1/transactions", query))
+            bodies[name] = json.loads(body)
+            timing = measure_async(lambda: asgi_get(app, "/api/v1/transactions", query), number=500)
+            results[name] = {
+                "us_per_request": round(timing["best_us"], 1),
+                "requests_per_second": round(1e6 / timing["best_us"]),
+            }
+
+    for body in bodies.values():
+        body.pop("timestamp")
+    assert bodies["APIRoute"] == bodies["StandardResponseRoute"]
+    baseline = results["APIRoute"]["us_per_request"]
+    results["speedup"] = round(baseline / results["StandardResponseRoute"]["us_per_request"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Production запуск: gunicorn с воркерами uvicorn (gunicorn app.main:app).
+
+Приложение импортируется в мастере до fork (preload_app): ошибка импорта
+останавливает запуск до создания воркеров. Лениво загружаемые приложением
+python-jose и passlib (и matplotlib при CHART_WARMUP_ON_STARTUP) мастер
+импортирует в when_ready, и воркеры получают их копированием при записи,
+а не импортируют каждый заново.
+Параметры задаются переменными окружения WEB_* (см. app/core/config.py).
+"""
+
+import os
+from typing import Any
+
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    """Число воркеров по умолчанию - по числу CPU, доступных процессу"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # нет на macOS
+        return os.cpu_count() or 1
+
+
+bind = settings.WEB_BIND
+workers = settings.WEB_CONCURRENCY or default_workers()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+max_requests = settings.WEB_MAX_REQUESTS
+max_requests_jitter = settings.WEB_MAX_REQUESTS_JITTER
+# По SIGTERM воркеры перестают принимать соединения и дорабатывают текущие запросы
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT_SECONDS
+accesslog = "-"
+
+
+def when_ready(server: Any) -> None:
+    """
+    Импортировать тяжёлые модули до fork и записать в лог число воркеров.
+
+    Только импорт: event loop, потоки и соединения с БД в мастере не создаются,
+    иначе воркеры унаследовали бы их после fork.
+    """
+    import jose.jwt  # type: ignore[import-untyped]  # noqa: F401
+
+    from app.core.security import pwd_context
+
+    pwd_context()
+    if settings.CHART_WARMUP_ON_STARTUP:
+        from app.modules.analytics.service import pyplot
+
+        pyplot()
+    server.log.info(f"Воркеров: {workers}, перезапуск после {max_requests} запросов")
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """
+    Сбросить пулы соединений, унаследованные от мастера: соединение нельзя делить
+    между процессами. Воркер откроет свои при старте (warm_up_pool).
+    """
+    from app.core.db import all_engines
+
+    for engine in all_engines():
+        engine.sync_engine.dispose(close=False)
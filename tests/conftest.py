@@ -1,14 +1,35 @@
 """Общие фикстуры для тестов"""
 
+import os
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
+from typing import AsyncIterator, Awaitable, Callable, ContextManager, Iterator
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 
+from app.core.db import Base
 from app.modules.users.models import User
 from app.modules.auth.models import RefreshToken
+from app.modules.groups.models import Group, GroupBalance  # noqa: F401
+from app.modules.group_members.models import GroupMember  # noqa: F401
+from app.modules.transactions.models import Transaction  # noqa: F401
+from app.modules.jobs.models import Job  # noqa: F401
 from app.core.config import settings
+from app.core.query_counter import QueryStats, instrument_engine, track_queries
+from app.modules.group_members.cache import membership_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_membership_cache() -> Iterator[None]:
+    """Кэш членства общий для процесса - не переносим записи между тестами"""
+    membership_cache.clear()
+    yield
+    membership_cache.clear()
 
 
 @pytest.fixture
@@ -25,6 +46,117 @@ def mock_db_session() -> AsyncMock:
     return session
 
 
+@pytest.fixture
+async def pg_session() -> AsyncIterator[AsyncSession]:
+    """
+    Сессия настоящего PostgreSQL из TEST_DATABASE_URL; без него тест пропускается.
+
+    Схема создаётся в транзакции, которая откатывается после теста. commit и rollback
+    сессии работают через SAVEPOINT внутри этой транзакции. SQL запросы движка
+    учитываются в query_budget.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("нужен PostgreSQL (TEST_DATABASE_URL)")
+
+    engine = create_async_engine(url, poolclass=NullPool)
+    instrument_engine(engine.sync_engine)
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            await conn.run_sync(Base.metadata.create_all)
+            session = AsyncSession(
+                bind=conn,
+                join_transaction_mode="create_savepoint",
+                autoflush=False,
+                expire_on_commit=False,
+            )
+            try:
+                yield session
+            finally:
+                await session.close()
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def pg_engine() -> AsyncIterator[AsyncEngine]:
+    """
+    Движок PostgreSQL из TEST_DATABASE_URL с отдельной схемой на время теста.
+
+    В отличие от pg_session, данные фиксируются и видны всем соединениям -
+    для тестов одновременных транзакций. Схема удаляется после теста.
+    """
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("нужен PostgreSQL (TEST_DATABASE_URL)")
+
+    schema = f"test_{uuid.uuid4().hex}"
+    admin = create_async_engine(url, poolclass=NullPool)
+    engine = create_async_engine(
+        url, poolclass=NullPool, connect_args={"server_settings": {"search_path": schema}}
+    )
+    try:
+        async with admin.begin() as conn:
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield engine
+    finally:
+        await engine.dispose()
+        async with admin.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await admin.dispose()
+
+
+@pytest.fixture
+def create_user(pg_session: AsyncSession) -> Callable[[str], Awaitable[User]]:
+    """Создать пользователя в pg_session"""
+
+    async def create(username: str) -> User:
+        user = User(username=username, email=f"{username}@example.com", hashed_password="hash")
+        pg_session.add(user)
+        await pg_session.flush()
+        return user
+
+    return create
+
+
+# Управление SAVEPOINT фикстуры pg_session: в рабочей сессии этих запросов нет
+_SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], ContextManager[QueryStats]]:
+    """
+    Проверка бюджета SQL запросов для блока кода.
+
+    Учитываются запросы, действительно выполненные через движок с подсчётом
+    запросов (например, через pg_session), включая ленивую загрузку связей.
+
+    Пример:
+        with query_budget(5):
+            await group_member_service.add(pg_session, ...)
+    """
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        statements = {
+            statement: count
+            for statement, count in stats.statements.items()
+            if not statement.startswith(_SAVEPOINT_STATEMENTS)
+        }
+        executed = sum(statements.values())
+        assert (
+            executed <= max_queries
+        ), f"Превышен бюджет запросов: {executed} > {max_queries}: {statements}"
+
+    return budget
+
+
 @pytest.fixture
 def mock_user():
     """Фикстура для создания тестового пользователя"""
@@ -36,6 +168,7 @@ def mock_user():
     user.full_name = "Test User"
     user.hashed_password = "$argon2id$v=19$m=65536,t=3,p=4$test_hash"
     user.is_active = True
+    user.data_version = 0
     user.created_at = datetime.now(timezone.utc)
     user.updated_at = None
     return user
@@ -0,0 +1,34 @@
+"""Общие моки для тестов"""
+
+from typing import Any, Iterable
+from unittest.mock import MagicMock
+
+_UNSET: Any = object()
+
+
+def db_result(
+    *,
+    scalar: Any = _UNSET,
+    scalars: Iterable[Any] = (),
+    rows: Iterable[Any] = (),
+    one: Any = _UNSET,
+    one_or_none: Any = _UNSET,
+) -> MagicMock:
+    """
+    Мок результата AsyncSession.execute.
+
+    scalar возвращают scalar_one() и scalar_one_or_none(), scalars - scalars().all(),
+    rows - all(), one и one_or_none - одноимённые методы. Незаданные методы
+    возвращают MagicMock.
+    """
+    result = MagicMock()
+    if scalar is not _UNSET:
+        result.scalar_one.return_value = scalar
+        result.scalar_one_or_none.return_value = scalar
+    result.scalars.return_value.all.return_value = list(scalars)
+    result.all.return_value = list(rows)
+    if one is not _UNSET:
+        result.one.return_value = one
+    if one_or_none is not _UNSET:
+        result.one_or_none.return_value = one_or_none
+    return result
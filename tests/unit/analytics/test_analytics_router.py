@@ -90,8 +90,11 @@ class TestGetGroupAnalytics:
             response = client.get(f"/analytics/groups/{group_id}?period=2024-01")
 
             assert response.status_code == status.HTTP_200_OK
-            data = response.json()
+            body = response.json()
+            data = body["data"]
 
+            assert body["success"] is True
+            assert body["code"] == status.HTTP_200_OK
             assert data["period"] == "2024-01"
             assert data["group_id"] == group_id
             assert data["group_name"] == "Test Group"
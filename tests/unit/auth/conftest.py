@@ -10,6 +10,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.auth.router import router
 from app.core.db import get_db
 from app.core.dependencies import get_current_user
+from app.core.rate_limit import login_rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def reset_login_rate_limiter() -> Any:
+    """Сбрасывает лимитер попыток входа между тестами"""
+    login_rate_limiter.reset()
+    yield
+    login_rate_limiter.reset()
 
 
 @pytest.fixture
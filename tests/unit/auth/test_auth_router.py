@@ -84,6 +84,22 @@ class TestLogin:
             mock_auth_service.authenticate_user.assert_called_once()
             mock_auth_service.generate_tokens.assert_not_called()
 
+    def test_login_rate_limited(self, client: Any) -> None:
+        """Превышение лимита попыток входа отклоняется до проверки пароля"""
+        login_data = Login(username="testuser", password="wrong_password")
+
+        with patch("app.modules.auth.router.auth_service") as mock_auth_service:
+            mock_auth_service.authenticate_user = AsyncMock(return_value=None)
+
+            responses = [
+                client.post("/auth/login", json=login_data.model_dump()) for _ in range(10)
+            ]
+
+            assert responses[-1].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+            assert "retry-after" in responses[-1].headers
+            calls = sum(r.status_code == status.HTTP_401_UNAUTHORIZED for r in responses)
+            assert mock_auth_service.authenticate_user.call_count == calls
+
 
 class TestRefreshToken:
     """Тесты для POST /auth/refresh"""
@@ -155,3 +171,25 @@ class TestChangePassword:
                 old_password="old_password_123",
                 new_password="new_password_123",
             )
+
+
+class TestLogout:
+    """Тесты для POST /auth/logout"""
+
+    def test_logout_success(self, client: Any, mock_user: Any) -> None:
+        """Успешный выход с отзывом access токена"""
+        with patch("app.modules.auth.router.auth_service") as mock_auth_service:
+            mock_auth_service.logout = AsyncMock(return_value=None)
+
+            response = client.post(
+                "/auth/logout",
+                json={"refresh_token": "refresh"},
+                headers={"Authorization": "Bearer access"},
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()
+            assert data["success"] is True
+            mock_auth_service.logout.assert_called_once_with(
+                db=ANY, user=mock_user, access_token="access", refresh_token="refresh"
+            )
@@ -0,0 +1,191 @@
+"""Тесты для app/modules/auth/revocation.py"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import CredentialsException
+from app.core.security import create_access_token
+from app.modules.auth.models import RevokedAccessToken
+from app.modules.auth.repository import revoked_access_token_repository
+from app.modules.auth.revocation import AccessTokenRevocationList, BloomFilter
+from app.modules.auth.service import AuthService
+
+
+class TestBloomFilter:
+    """Тесты для BloomFilter"""
+
+    def test_added_keys_are_found(self) -> None:
+        """Добавленные ключи всегда находятся (нет ложноотрицательных ответов)"""
+        bloom = BloomFilter(capacity=1000)
+        keys = [f"jti-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate_is_bounded(self) -> None:
+        """Доля ложноположительных ответов близка к заданной"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestAccessTokenRevocationList:
+    """Тесты для AccessTokenRevocationList"""
+
+    def test_add_and_check(self) -> None:
+        """Отозванный jti распознаётся, остальные - нет"""
+        revocation_list = AccessTokenRevocationList(capacity=10)
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+        revocation_list.add("revoked-jti", expires_at)
+
+        assert revocation_list.is_revoked("revoked-jti") is True
+        assert revocation_list.is_revoked("active-jti") is False
+
+    def test_prune_removes_expired(self) -> None:
+        """Истекшие записи удаляются и больше не считаются отозванными"""
+        revocation_list = AccessTokenRevocationList(capacity=10)
+        now = datetime.now(timezone.utc)
+        revocation_list.add("expired-jti", now - timedelta(seconds=1))
+        revocation_list.add("revoked-jti", now + timedelta(minutes=30))
+
+        assert revocation_list.prune(now) == 1
+        assert revocation_list.is_revoked("expired-jti") is False
+        assert revocation_list.is_revoked("revoked-jti") is True
+
+    def test_prune_rebuilds_filter_past_threshold(self) -> None:
+        """Фильтр Блума пересобирается, только когда удалённых записей много"""
+        revocation_list = AccessTokenRevocationList(capacity=100)
+        now = datetime.now(timezone.utc)
+        for i in range(10):
+            revocation_list.add(f"expired-{i}", now - timedelta(seconds=1))
+        for i in range(90):
+            revocation_list.add(f"jti-{i}", now + timedelta(minutes=30))
+
+        with patch.object(revocation_list, "_rebuild", wraps=revocation_list._rebuild) as rebuild:
+            # 10 из 100 ключей фильтра - ниже порога
+            assert revocation_list.prune(now) == 10
+            rebuild.assert_not_called()
+            assert revocation_list.is_revoked("expired-0") is False
+
+            for i in range(5):
+                revocation_list.add(f"late-{i}", now - timedelta(seconds=1))
+            # ещё 5 удалённых - вместе с живыми ключей больше ёмкости фильтра
+            assert revocation_list.prune(now) == 5
+            rebuild.assert_called_once()
+
+        assert all(revocation_list.is_revoked(f"jti-{i}") for i in range(90))
+
+    def test_grows_beyond_capacity(self) -> None:
+        """При переполнении фильтр пересобирается без потери записей"""
+        revocation_list = AccessTokenRevocationList(capacity=4)
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+        for i in range(20):
+            revocation_list.add(f"jti-{i}", expires_at)
+
+        assert len(revocation_list) == 20
+        assert all(revocation_list.is_revoked(f"jti-{i}") for i in range(20))
+
+    @pytest.mark.asyncio
+    async def test_sync_loads_rows(self, mock_db_session: AsyncMock) -> None:
+        """Синхронизация добавляет записи из БД"""
+        revocation_list = AccessTokenRevocationList(capacity=10)
+        row = MagicMock()
+        row.token_jti = "db-jti"
+        row.expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+
+        with patch("app.modules.auth.revocation.revoked_access_token_repository") as mock_repo:
+            mock_repo.list_active_since = AsyncMock(return_value=[row])
+
+            added = await revocation_list.sync(mock_db_session)
+
+            assert added == 1
+            assert revocation_list.is_revoked("db-jti") is True
+            assert mock_repo.list_active_since.call_args.kwargs["created_after"] is None
+
+            await revocation_list.sync(mock_db_session)
+            assert mock_repo.list_active_since.call_args.kwargs["created_after"] is not None
+
+
+class TestRevokedTokenRejected:
+    """Отозванный access токен не принимается get_user_from_token"""
+
+    @pytest.mark.asyncio
+    async def test_get_user_from_revoked_token(
+        self, mock_db_session: AsyncMock, mock_user: MagicMock
+    ) -> None:
+        access_token = create_access_token({"sub": mock_user.username}, jti="revoked-jti")
+        revocation_list = AccessTokenRevocationList(capacity=10)
+        revocation_list.add("revoked-jti", datetime.now(timezone.utc) + timedelta(minutes=30))
+
+        with (
+            patch("app.modules.auth.service.access_token_revocation_list", revocation_list),
+            patch("app.modules.auth.service.user_service") as mock_user_service,
+        ):
+            mock_user_service.get_user_by_username = AsyncMock(return_value=mock_user)
+
+            with pytest.raises(CredentialsException) as exc_info:
+                await AuthService.get_user_from_token(mock_db_session, access_token)
+
+            assert "отозван" in exc_info.value.detail.lower()
+            mock_user_service.get_user_by_username.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_revoke_access_token(
+        self, mock_db_session: AsyncMock, mock_user: MagicMock
+    ) -> None:
+        access_token = create_access_token({"sub": mock_user.username}, jti="logout-jti")
+        revocation_list = AccessTokenRevocationList(capacity=10)
+
+        with (
+            patch("app.modules.auth.service.access_token_revocation_list", revocation_list),
+            patch("app.modules.auth.service.revoked_access_token_repository") as mock_repo,
+        ):
+            mock_repo.create = AsyncMock()
+
+            await AuthService.revoke_access_token(mock_db_session, mock_user, access_token)
+
+            mock_repo.create.assert_called_once()
+            mock_db_session.commit.assert_awaited_once()
+            assert revocation_list.is_revoked("logout-jti") is True
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_keeps_token_valid(
+        self, mock_db_session: AsyncMock, mock_user: MagicMock
+    ) -> None:
+        """Если commit не прошёл, токен не попадает в локальный список отозванных"""
+        access_token = create_access_token({"sub": mock_user.username}, jti="logout-jti")
+        revocation_list = AccessTokenRevocationList(capacity=10)
+        mock_db_session.commit = AsyncMock(side_effect=RuntimeError("commit failed"))
+
+        with (
+            patch("app.modules.auth.service.access_token_revocation_list", revocation_list),
+            patch("app.modules.auth.service.revoked_access_token_repository") as mock_repo,
+        ):
+            mock_repo.create = AsyncMock()
+
+            with pytest.raises(RuntimeError):
+                await AuthService.revoke_access_token(mock_db_session, mock_user, access_token)
+
+            assert revocation_list.is_revoked("logout-jti") is False
+
+
+@pytest.mark.asyncio
+async def test_repeated_revocation_is_ignored(pg_session: AsyncSession, create_user: Any) -> None:
+    """Повторный выход с тем же токеном не падает на уникальности token_jti (PostgreSQL)"""
+    user = await create_user("alice")
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=30)
+
+    for _ in range(2):
+        await revoked_access_token_repository.create(
+            pg_session, token_jti="logout-jti", user_id=int(user.id), expires_at=expires_at
+        )
+
+    count = await pg_session.scalar(select(func.count()).select_from(RevokedAccessToken))
+    assert count == 1
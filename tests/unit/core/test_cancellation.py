@@ -0,0 +1,144 @@
+"""Тесты для app/core/cancellation.py"""
+
+import time
+from typing import Any
+
+import anyio
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import DBAPIError
+
+from app.core import cancellation
+from app.core.cancellation import CLIENT_CLOSED_REQUEST, request_timeout, route_timeout
+from app.core.exceptions import AppException
+from app.core.exceptions_handler import app_exception_handler, http_exception_handler
+from app.core.routing import StandardResponseRoute
+
+events: list[str] = []
+
+
+class _QueryCanceled(Exception):
+    """Ошибка asyncpg, переведённая SQLAlchemy: запрос отменён по statement_timeout"""
+
+    sqlstate = "57014"
+
+
+def _create_app() -> FastAPI:
+    router = APIRouter(route_class=StandardResponseRoute)
+
+    @router.get("/fast")
+    @request_timeout("report")
+    async def fast() -> dict:
+        return {"status": "ok"}
+
+    @router.get("/slow")
+    @request_timeout("report")
+    async def slow() -> dict:
+        try:
+            await anyio.sleep(5)
+        except anyio.get_cancelled_exc_class():
+            events.append("cancelled")
+            raise
+        return {"status": "ok"}
+
+    @router.get("/statement-timeout")
+    @request_timeout("report")
+    async def statement_timeout() -> dict:
+        raise DBAPIError("SELECT pg_sleep(60)", {}, _QueryCanceled())
+
+    @router.get("/timeout")
+    @request_timeout("export")
+    async def timeout(request: Request) -> dict:
+        return {"timeout": route_timeout(request)}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_exception_handler(AppException, app_exception_handler)
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    return app
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts(monkeypatch: pytest.MonkeyPatch) -> None:
+    events.clear()
+    monkeypatch.setattr(cancellation, "request_timeouts", lambda: {"report": 0.2, "export": 0.3})
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(_create_app())
+
+
+class TestRequestTimeout:
+    """Тесты для прерывания обработчиков по таймауту и при отключении клиента"""
+
+    def test_unknown_route_class(self) -> None:
+        with pytest.raises(ValueError):
+            request_timeout("unknown")
+
+    def test_route_timeout(self, client: TestClient) -> None:
+        """Таймаут маршрута определяется по классу endpoint'а запроса"""
+        assert client.get("/timeout").json() == {"timeout": 0.3}
+
+    def test_fast_request_completes(self, client: TestClient) -> None:
+        response = client.get("/fast")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_timeout_cancels_handler(self, client: TestClient) -> None:
+        """По истечении таймаута класса маршрута обработчик отменяется, клиент получает 504"""
+        started = time.perf_counter()
+        response = client.get("/slow")
+
+        assert response.status_code == 504
+        assert response.json()["error"]["code"] == "REQUEST_TIMEOUT"
+        assert events == ["cancelled"]
+        assert time.perf_counter() - started < 2
+
+    def test_statement_timeout_is_request_timeout(self, client: TestClient) -> None:
+        """Запрос, прерванный сервером по statement_timeout, - тоже 504, а не 500"""
+        response = client.get("/statement-timeout")
+
+        assert response.status_code == 504
+        assert response.json()["error"]["code"] == "REQUEST_TIMEOUT"
+
+    async def test_client_disconnect_cancels_handler(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Отключение клиента отменяет обработчик, не дожидаясь таймаута"""
+        monkeypatch.setattr(cancellation, "request_timeouts", lambda: {"report": 10, "export": 10})
+        app = _create_app()
+        messages = iter(
+            [{"type": "http.request", "body": b"", "more_body": False}, {"type": "http.disconnect"}]
+        )
+        sent: list[dict[str, Any]] = []
+
+        async def receive() -> dict[str, Any]:
+            message = next(messages)
+            if message["type"] == "http.disconnect":
+                await anyio.sleep(0.05)
+            return message
+
+        async def send(message: dict[str, Any]) -> None:
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/slow",
+            "raw_path": b"/slow",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        started = time.perf_counter()
+        await app(scope, receive, send)
+
+        assert events == ["cancelled"]
+        assert sent[0]["status"] == CLIENT_CLOSED_REQUEST
+        assert time.perf_counter() - started < 2
@@ -0,0 +1,148 @@
+"""Тесты для app/core/compression.py"""
+
+import gzip
+import json
+from typing import AsyncIterator
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, parse_accept_encoding, skip_compression
+from app.core.middleware import StandardResponseMiddleware
+
+LARGE_PAYLOAD = {"items": [{"id": i, "title": f"Покупка {i}"} for i in range(200)]}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large() -> dict:
+        return LARGE_PAYLOAD
+
+    @app.get("/small")
+    async def small() -> dict:
+        return {"value": 1}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            for i in range(100):
+                yield f"{i},Покупка,100.0\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    @app.get("/png")
+    async def png() -> Response:
+        return Response(content=b"\x89PNG" + b"0" * 4096, media_type="image/png")
+
+    @app.get("/opt-out")
+    @skip_compression
+    async def opt_out() -> Response:
+        return Response(content=b"a" * 4096, media_type="text/plain")
+
+    app.add_middleware(StandardResponseMiddleware)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+def _raw_get(client: TestClient, path: str, accept_encoding: str) -> tuple[int, dict, bytes]:
+    """Получить ответ без автоматической распаковки клиентом"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response.status_code, dict(response.headers), b"".join(response.iter_raw())
+
+
+class TestParseAcceptEncoding:
+    """Тесты для parse_accept_encoding"""
+
+    def test_quality_values(self) -> None:
+        """Разбираются кодировки и значения q"""
+        assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {
+            "gzip": 0.5,
+            "br": 1.0,
+            "identity": 0.0,
+        }
+
+    def test_invalid_quality(self) -> None:
+        """Некорректное значение q считается нулевым"""
+        assert parse_accept_encoding("gzip;q=abc") == {"gzip": 0.0}
+
+
+class TestCompressionMiddleware:
+    """Тесты для CompressionMiddleware"""
+
+    def test_large_response_is_gzipped(self, client: TestClient) -> None:
+        """Большой ответ сжимается и остаётся в стандартном формате"""
+        status, headers, body = _raw_get(client, "/large", "gzip")
+
+        assert status == 200
+        assert headers["content-encoding"] == "gzip"
+        assert headers["vary"] == "Accept-Encoding"
+        assert headers["content-length"] == str(len(body))
+        data = json.loads(gzip.decompress(body))
+        assert data["success"] is True
+        assert data["data"] == LARGE_PAYLOAD
+
+    def test_small_response_is_not_compressed(self, client: TestClient) -> None:
+        """Ответ меньше порога отдаётся как есть"""
+        _, headers, body = _raw_get(client, "/small", "gzip")
+
+        assert "content-encoding" not in headers
+        assert json.loads(body)["data"] == {"value": 1}
+
+    def test_no_accept_encoding(self, client: TestClient) -> None:
+        """Без Accept-Encoding ответ не сжимается"""
+        _, headers, body = _raw_get(client, "/large", "identity")
+
+        assert "content-encoding" not in headers
+        assert json.loads(body)["data"] == LARGE_PAYLOAD
+
+    def test_gzip_rejected_by_quality(self, client: TestClient) -> None:
+        """gzip;q=0 означает, что кодировка не принимается"""
+        _, headers, _ = _raw_get(client, "/large", "gzip;q=0")
+
+        assert "content-encoding" not in headers
+
+    def test_streaming_response(self, client: TestClient) -> None:
+        """Потоковый ответ сжимается без Content-Length"""
+        _, headers, body = _raw_get(client, "/stream", "gzip")
+
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        lines = gzip.decompress(body).decode().splitlines()
+        assert len(lines) == 100
+        assert lines[0] == "0,Покупка,100.0"
+
+    @pytest.mark.parametrize("path", ["/png", "/opt-out"])
+    def test_skipped_responses(self, client: TestClient, path: str) -> None:
+        """Изображения и маршруты с skip_compression не сжимаются"""
+        _, headers, body = _raw_get(client, path, "gzip")
+
+        assert "content-encoding" not in headers
+        assert len(body) > 4096 - 1
+
+    def test_brotli_preferred_when_available(self, client: TestClient) -> None:
+        """При наличии brotli он выбирается вместо gzip"""
+
+        class FakeBrotliCompressor:
+            def __init__(self, quality: int) -> None:
+                self.chunks: list[bytes] = []
+
+            def process(self, data: bytes) -> bytes:
+                self.chunks.append(data)
+                return b""
+
+            def finish(self) -> bytes:
+                return b"BR:" + b"".join(self.chunks)
+
+        fake_brotli = type("FakeBrotli", (), {"Compressor": FakeBrotliCompressor})
+        with patch.object(compression, "brotli", fake_brotli):
+            _, headers, body = _raw_get(client, "/large", "gzip, br")
+
+        assert headers["content-encoding"] == "br"
+        assert body.startswith(b'BR:{"success":true')
@@ -0,0 +1,169 @@
+"""Тесты для сессий app/core/db.py"""
+
+import os
+import time
+from typing import Any, Iterator
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine, event, insert, select, text
+from sqlalchemy.exc import DBAPIError, InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from app.core.cancellation import request_timeout
+from app.core.config import settings
+from app.core.metrics import DB_POOL_WAIT
+from app.core.db import (
+    STATEMENT_TIMEOUT_INFO,
+    ReadOnlySession,
+    TimedAsyncAdaptedQueuePool,
+    ReadOnlySessionLocal,
+    _read_only,
+    _read_only_sessionmaker,
+    all_engines,
+    engine,
+    get_db,
+    read_only_engine,
+)
+
+_Base = declarative_base()
+
+
+class Item(_Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+@pytest.fixture
+def read_only_session() -> Iterator[ReadOnlySession]:
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with ReadOnlySession(engine) as session:
+        yield session
+
+
+class TestReadOnlySession:
+    """Тесты для ReadOnlySession"""
+
+    def test_select_allowed(self, read_only_session: ReadOnlySession) -> None:
+        assert read_only_session.execute(text("SELECT 1")).scalar() == 1
+        assert read_only_session.execute(select(Item)).all() == []
+
+    def test_dml_rejected(self, read_only_session: ReadOnlySession) -> None:
+        with pytest.raises(InvalidRequestError):
+            read_only_session.execute(insert(Item).values(name="coffee"))
+
+    def test_flush_rejected(self, read_only_session: ReadOnlySession) -> None:
+        read_only_session.add(Item(name="coffee"))
+        with pytest.raises(InvalidRequestError):
+            read_only_session.flush()
+
+    def test_statement_timeout_set_for_transaction(self) -> None:
+        """statement_timeout из Session.info задаётся в начале транзакции (SET LOCAL)"""
+        engine = create_engine("sqlite://")
+        calls: list[tuple[str, str, int]] = []
+
+        @event.listens_for(engine, "connect")
+        def _register_set_config(dbapi_connection: Any, record: Any) -> None:
+            # Аналог функции PostgreSQL set_config(name, value, is_local)
+            dbapi_connection.create_function(
+                "set_config", 3, lambda *args: calls.append(args) or args[1]
+            )
+
+        with ReadOnlySession(engine, info={STATEMENT_TIMEOUT_INFO: 15000}) as session:
+            session.execute(text("SELECT 1"))
+            session.execute(text("SELECT 2"))
+        with ReadOnlySession(engine) as session:
+            session.execute(text("SELECT 1"))
+
+        assert calls == [("statement_timeout", "15000", 1)]
+
+
+class TestGetDb:
+    """Тесты для выбора сессии в get_db"""
+
+    @pytest.fixture
+    def client(self) -> TestClient:
+        app = FastAPI()
+
+        async def session_kind(db: AsyncSession = Depends(get_db)) -> dict:
+            return {"kind": type(db.sync_session).__name__}
+
+        app.add_api_route("/session", session_kind, methods=["GET", "POST"])
+
+        @request_timeout("report")
+        async def report_session(db: AsyncSession = Depends(get_db)) -> dict:
+            return {"timeout_ms": db.info.get(STATEMENT_TIMEOUT_INFO)}
+
+        app.add_api_route("/report", report_session, methods=["GET"])
+        return TestClient(app)
+
+    def test_get_uses_read_only_session(self, client: TestClient) -> None:
+        assert client.get("/session").json() == {"kind": "ReadOnlySession"}
+
+    def test_post_uses_regular_session(self, client: TestClient) -> None:
+        assert client.post("/session").json() == {"kind": "Session"}
+
+    def test_report_route_limits_statement_time(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Сессия маршрута с классом таймаута получает statement_timeout того же класса"""
+        monkeypatch.setattr(settings, "REQUEST_TIMEOUT_REPORT_SECONDS", 15.0)
+
+        assert client.get("/report").json() == {"timeout_ms": 15000}
+        assert client.get("/session").status_code == 200
+
+
+class TestReadOnlyEngine:
+    """Запись в сессии только на чтение отклоняет сервер, а не только ORM"""
+
+    def test_sessions_share_primary_pool(self) -> None:
+        """Сессии чтения не открывают второй пул соединений к основной БД"""
+        assert ReadOnlySessionLocal.kw["bind"] is read_only_engine
+        assert read_only_engine.sync_engine.pool is engine.sync_engine.pool
+        assert all_engines() == [engine]
+
+    @pytest.mark.skipif(
+        not os.getenv("TEST_DATABASE_URL"), reason="нужен PostgreSQL (TEST_DATABASE_URL)"
+    )
+    async def test_textual_dml_rejected_by_server(self) -> None:
+        """READ ONLY действует только на сессию чтения, а не на соединение в пуле"""
+        url = os.environ["TEST_DATABASE_URL"]
+        writable = create_async_engine(url, pool_size=1, max_overflow=0)
+        try:
+            async with writable.begin() as conn:
+                await conn.execute(text("CREATE TABLE IF NOT EXISTS read_only_check (id int)"))
+
+            async with _read_only_sessionmaker(_read_only(writable))() as session:
+                with pytest.raises(DBAPIError, match="read-only transaction"):
+                    await session.execute(text("UPDATE read_only_check SET id = 1"))
+
+            # То же соединение из пула снова принимает запись
+            async with writable.begin() as conn:
+                await conn.execute(text("INSERT INTO read_only_check VALUES (1)"))
+        finally:
+            async with writable.begin() as conn:
+                await conn.execute(text("DROP TABLE IF EXISTS read_only_check"))
+            await writable.dispose()
+
+
+def test_pool_wait_excludes_connection_setup() -> None:
+    """В db_pool_wait_seconds попадает ожидание в очереди пула, а не установка соединения"""
+
+    def slow_connect() -> MagicMock:
+        time.sleep(0.2)
+        return MagicMock()
+
+    pool = TimedAsyncAdaptedQueuePool(slow_connect, pool_size=1, max_overflow=1)
+    wait = DB_POOL_WAIT._default()
+    count, total = wait.count, wait.sum
+
+    pool.connect().close()
+
+    assert wait.count == count + 1
+    assert wait.sum - total < 0.1
@@ -0,0 +1,44 @@
+"""Тесты для app/core/db_profiles.py"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.db_profiles import ENGINE_PROFILES, resolve_engine_profile
+
+
+class TestEngineProfiles:
+    """Тесты для профилей движка БД"""
+
+    def test_prod_profile_disables_echo(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Профиль prod не логирует SQL и ограничивает время запросов"""
+        monkeypatch.setattr(settings, "DB_PROFILE", "prod")
+
+        kwargs = resolve_engine_profile(settings).engine_kwargs()
+
+        assert kwargs["echo"] is False
+        assert kwargs["connect_args"]["server_settings"] == {
+            "statement_timeout": "30000",
+            "jit": "off",
+        }
+        assert kwargs["connect_args"]["prepared_statement_cache_size"] == 500
+
+    def test_overrides_take_precedence(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Заданные DB_* переопределяют значения профиля, остальные остаются"""
+        monkeypatch.setattr(settings, "DB_PROFILE", "dev")
+        monkeypatch.setattr(settings, "DB_ECHO", False)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 42)
+
+        profile = resolve_engine_profile(settings)
+
+        assert profile.echo is False
+        assert profile.pool_size == 42
+        assert profile.max_overflow == ENGINE_PROFILES["dev"].max_overflow
+        assert "pool_size=42" in profile.describe()
+
+    def test_pool_warmup_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Прогрев пула задаётся профилем и переопределяется DB_POOL_WARMUP"""
+        monkeypatch.setattr(settings, "DB_PROFILE", "prod")
+        assert resolve_engine_profile(settings).pool_warmup == 5
+
+        monkeypatch.setattr(settings, "DB_POOL_WARMUP", 0)
+        assert resolve_engine_profile(settings).pool_warmup == 0
@@ -0,0 +1,33 @@
+"""Тесты для app/core/etag.py"""
+
+from app.core.etag import etag_matches, make_etag
+
+
+class TestEtag:
+    """Тесты для make_etag и etag_matches"""
+
+    def test_make_etag_is_weak(self) -> None:
+        """ETag слабый и зависит от всех частей ключа"""
+        etag = make_etag("user", 1, 5)
+
+        assert etag.startswith('W/"')
+        assert etag != make_etag("user", 1, 6)
+        assert etag != make_etag("user", 2, 5)
+
+    def test_matches_weak_and_strong(self) -> None:
+        """Сравнение слабое: W/ префикс не учитывается"""
+        etag = make_etag("user", 1, 5)
+        opaque = etag.removeprefix("W/")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(opaque, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+
+    def test_no_match(self) -> None:
+        """Отсутствующий или другой ETag не совпадает"""
+        etag = make_etag("user", 1, 5)
+
+        assert not etag_matches(None, etag)
+        assert not etag_matches("", etag)
+        assert not etag_matches(make_etag("user", 1, 4), etag)
@@ -0,0 +1,139 @@
+"""Тесты для app/core/files.py"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.files import ZERO_COPY_SEND, RangeFileResponse, RangeNotSatisfiable, parse_range
+
+CONTENT = b"0123456789"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("bytes=0-3", (0, 3)),
+        ("bytes=5-", (5, 9)),
+        ("bytes=-3", (7, 9)),
+        ("bytes=-100", (0, 9)),
+        ("bytes=8-100", (8, 9)),
+        # Несколько диапазонов, другие единицы и некорректный синтаксис игнорируются
+        ("bytes=0-1,4-5", None),
+        ("items=0-1", None),
+        ("bytes=a-b", None),
+        ("bytes=5-2", None),
+        ("bytes=-", None),
+    ],
+)
+def test_parse_range(value: str | None, expected: tuple[int, int] | None) -> None:
+    assert parse_range(value, len(CONTENT)) == expected
+
+
+@pytest.mark.parametrize("value", ["bytes=10-", "bytes=20-30", "bytes=-0"])
+def test_parse_range_not_satisfiable(value: str) -> None:
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(value, len(CONTENT))
+
+
+@pytest.mark.parametrize("value", ["bytes=-5", "bytes=0-", "bytes=0-0"])
+def test_parse_range_empty_file(value: str) -> None:
+    """У пустого файла нет ни одного байта - любой диапазон даёт 416"""
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(value, 0)
+
+
+@pytest.fixture
+def file_path(tmp_path: Path) -> Path:
+    path = tmp_path / "data.csv"
+    path.write_bytes(CONTENT)
+    return path
+
+
+@pytest.fixture
+def client(file_path: Path) -> TestClient:
+    async def endpoint(request: Request) -> RangeFileResponse:
+        return RangeFileResponse(
+            file_path,
+            stat_result=os.stat(file_path),
+            range_header=request.headers.get("range"),
+            if_range=request.headers.get("if-range"),
+            media_type="text/csv",
+        )
+
+    return TestClient(Starlette(routes=[Route("/file", endpoint)]))
+
+
+def test_full_file(client: TestClient) -> None:
+    response = client.get("/file")
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"].startswith('"')
+
+
+def test_partial_content(client: TestClient) -> None:
+    response = client.get("/file", headers={"Range": "bytes=2-5"})
+
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+    assert response.headers["content-length"] == "4"
+
+
+def test_not_satisfiable(client: TestClient) -> None:
+    response = client.get("/file", headers={"Range": "bytes=50-"})
+
+    assert response.status_code == 416
+    assert response.content == b""
+    assert response.headers["content-range"] == "bytes */10"
+
+
+def test_empty_file_suffix_range(client: TestClient, file_path: Path) -> None:
+    """Суффиксный диапазон пустого файла - 416, а не 206 с bytes 0--1/0"""
+    file_path.write_bytes(b"")
+
+    response = client.get("/file", headers={"Range": "bytes=-5"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */0"
+
+
+def test_if_range_resumes_unchanged_file(client: TestClient) -> None:
+    etag = client.get("/file").headers["etag"]
+
+    response = client.get("/file", headers={"Range": "bytes=7-", "If-Range": etag})
+
+    assert response.status_code == 206
+    assert response.content == b"789"
+
+
+def test_if_range_mismatch_sends_full_file(client: TestClient) -> None:
+    """Файл изменился после начала загрузки: докачка невозможна, отдаётся весь файл"""
+    response = client.get("/file", headers={"Range": "bytes=7-", "If-Range": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+async def test_zero_copy_send(file_path: Path) -> None:
+    """Если сервер поддерживает zerocopysend, тело отдаётся файловым дескриптором"""
+    messages: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    response = RangeFileResponse(file_path, stat_result=os.stat(file_path), range_header="bytes=4-")
+    scope = {"type": "http", "method": "GET", "extensions": {ZERO_COPY_SEND: {}}}
+    await response(scope, None, send)  # type: ignore[arg-type]
+
+    assert messages[0]["status"] == 206
+    assert messages[1]["type"] == ZERO_COPY_SEND
+    assert (messages[1]["offset"], messages[1]["count"]) == (4, 6)
@@ -0,0 +1,34 @@
+"""Тесты ленивого импорта тяжёлых зависимостей при старте приложения"""
+
+import os
+import subprocess
+import sys
+
+from benchmarks.import_time import LAZY_MODULES
+
+
+def test_app_import_skips_lazy_modules() -> None:
+    """Импорт app.main не загружает matplotlib, python-jose и passlib"""
+    code = (
+        "import sys, app.main; " f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=os.environ, check=True
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_gunicorn_master_imports_lazy_modules() -> None:
+    """when_ready импортирует ленивые модули в мастере, чтобы воркеры не делали это заново"""
+    code = (
+        "import sys, runpy; from unittest.mock import MagicMock; "
+        "runpy.run_path('gunicorn.conf.py')['when_ready'](MagicMock()); "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m not in sys.modules))"
+    )
+    env = {**os.environ, "CHART_WARMUP_ON_STARTUP": "true"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+
+    assert result.stdout.strip() == ""
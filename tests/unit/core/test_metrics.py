@@ -0,0 +1,157 @@
+"""Тесты для app/core/metrics.py"""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    MetricsMiddleware,
+    MetricsRegistry,
+    metrics_authorized,
+    register_pool_collector,
+    registry,
+)
+from app.core.security import get_password_hash_async, verify_password_async
+
+
+class TestMetricsRegistry:
+    """Тесты для MetricsRegistry"""
+
+    def test_counter_and_gauge(self) -> None:
+        """Счётчики и gauge с метками отрисовываются в формате Prometheus"""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Задачи", ("status",))
+        gauge = registry.gauge("queue_depth", "Очередь")
+        counter.labels("done").inc()
+        counter.labels("done").inc(2)
+        gauge.inc()
+        gauge.dec(0.5)
+
+        text = registry.render()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{status="done"} 3' in text
+        assert "queue_depth 0.5" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Корзины гистограммы накопительные, граница включается в корзину"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Задержка", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 3.65" in text
+
+    def test_label_values_are_escaped(self) -> None:
+        """Кавычки в значениях меток экранируются"""
+        registry = MetricsRegistry()
+        registry.counter("c", "c", ("name",)).labels('a"b').inc()
+
+        assert 'c{name="a\\"b"} 1' in registry.render()
+
+    def test_collectors_run_before_render(self) -> None:
+        """Коллекторы обновляют значения перед отрисовкой"""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("pool_checked_out", "Пул")
+        pool = MagicMock()
+        pool.checkedout.return_value = 7
+        registry.add_collector(lambda: gauge.set(pool.checkedout()))
+
+        assert "pool_checked_out 7" in registry.render()
+
+    def test_pool_collector_labels_each_pool(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Пулы основной БД и реплики отдаются отдельными рядами с меткой pool"""
+        monkeypatch.setattr(registry, "_collectors", [])
+        for name, checked_out in (("primary", 3), ("replica", 1)):
+            pool = MagicMock()
+            pool.size.return_value = 5
+            pool.checkedout.return_value = checked_out
+            pool.overflow.return_value = -2
+            register_pool_collector(pool, name)
+
+        text = registry.render()
+
+        assert 'db_pool_checked_out{pool="primary",worker=' in text
+        assert 'db_pool_checked_out{pool="replica",worker=' in text
+        assert f'db_pool_checked_out{{pool="replica",worker="{os.getpid()}"}} 1' in text
+        assert f'db_pool_overflow{{pool="primary",worker="{os.getpid()}"}} 0' in text
+
+    def test_const_labels(self) -> None:
+        """Постоянные метки (worker) добавляются ко всем рядам, включая корзины"""
+        registry = MetricsRegistry(const_labels=lambda: {"worker": "42"})
+        registry.counter("c", "c", ("name",)).labels("a").inc()
+        registry.histogram("h", "h", buckets=(1.0,)).observe(0.5)
+
+        text = registry.render()
+
+        assert 'c{name="a",worker="42"} 1' in text
+        assert 'h_bucket{worker="42",le="1"} 1' in text
+        assert 'h_count{worker="42"} 1' in text
+
+    def test_duplicate_name_rejected(self) -> None:
+        """Повторная регистрация метрики с тем же именем запрещена"""
+        registry = MetricsRegistry()
+        registry.counter("c", "c")
+
+        with pytest.raises(ValueError):
+            registry.gauge("c", "c")
+
+
+@pytest.mark.parametrize(
+    "authorization, token, allowed",
+    [
+        (None, None, True),
+        (None, "secret", False),
+        ("Bearer wrong", "secret", False),
+        ("Bearer secret", "secret", True),
+    ],
+)
+def test_metrics_authorized(authorization: str | None, token: str | None, allowed: bool) -> None:
+    assert metrics_authorized(authorization, token) is allowed
+
+
+class TestMetricsMiddleware:
+    """Тесты для MetricsMiddleware"""
+
+    def test_route_template_label(self) -> None:
+        """Метка route содержит шаблон пути, а не фактический путь"""
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int) -> dict:
+            assert HTTP_REQUESTS_IN_FLIGHT._default().value >= 1
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware)
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        assert HTTP_REQUEST_DURATION.labels("GET", "/items/{item_id}", 200).count == 2
+        assert HTTP_REQUEST_DURATION.labels("GET", "unmatched", 404).count >= 1
+        assert HTTP_REQUESTS_IN_FLIGHT._default().value == 0
+
+
+class TestPasswordHashing:
+    """Тесты для вынесения argon2 в пул потоков"""
+
+    async def test_hash_and_verify_in_threads(self) -> None:
+        """Хэширование и проверка работают, очередь после завершения пуста"""
+        hashed = await get_password_hash_async("secret_password")
+
+        assert await verify_password_async("secret_password", hashed) is True
+        assert await verify_password_async("wrong_password", hashed) is False
+        assert PASSWORD_HASH_QUEUE_DEPTH._default().value == 0
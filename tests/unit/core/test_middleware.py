@@ -0,0 +1,124 @@
+"""Тесты для app/core/middleware.py"""
+
+import json
+from typing import Any, AsyncIterator
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.dto.response import StandardResponse, success_response
+from app.core.middleware import StandardResponseMiddleware, mark_enveloped_routes
+from app.main import app as main_app
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/enveloped", response_model=StandardResponse[dict])
+    async def enveloped() -> Any:
+        return success_response(data={"value": 1})
+
+    @app.get("/plain")
+    async def plain() -> dict:
+        return {"value": "значение"}
+
+    @app.get("/created", status_code=201)
+    async def created() -> dict:
+        return {"id": 1}
+
+    @app.get("/csv")
+    async def csv() -> Response:
+        return Response(content=b"a,b\n1,2\n", media_type="text/csv")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b'{"items":['
+            yield b"1,2"
+            yield b"]}"
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/error")
+    async def error() -> dict:
+        raise HTTPException(status_code=404, detail="not found")
+
+    mark_enveloped_routes(app.routes)
+    app.add_middleware(StandardResponseMiddleware)
+    return TestClient(app)
+
+
+class TestStandardResponseMiddleware:
+    """Тесты для StandardResponseMiddleware"""
+
+    def test_plain_json_is_wrapped(self, client: TestClient) -> None:
+        """Обычный JSON-ответ оборачивается в StandardResponse"""
+        response = client.get("/plain")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["code"] == 200
+        assert data["data"] == {"value": "значение"}
+        assert data["timestamp"].endswith("Z")
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_status_code_is_preserved(self, client: TestClient) -> None:
+        """Код ответа попадает в поле code"""
+        response = client.get("/created")
+
+        assert response.status_code == 201
+        assert response.json()["code"] == 201
+
+    def test_enveloped_route_passes_through(self, client: TestClient) -> None:
+        """Ответ помеченного маршрута не оборачивается повторно"""
+        response = client.get("/enveloped")
+
+        data = response.json()
+        assert data["success"] is True
+        assert data["data"] == {"value": 1}
+
+    def test_non_json_passes_through(self, client: TestClient) -> None:
+        """Не-JSON ответы не изменяются"""
+        response = client.get("/csv")
+
+        assert response.content == b"a,b\n1,2\n"
+
+    def test_streaming_json_is_wrapped(self, client: TestClient) -> None:
+        """Потоковый JSON оборачивается без буферизации"""
+        response = client.get("/stream")
+
+        data = json.loads(response.content)
+        assert data["data"] == {"items": [1, 2]}
+
+    def test_error_passes_through(self, client: TestClient) -> None:
+        """Ошибки не оборачиваются"""
+        response = client.get("/error")
+
+        assert response.status_code == 404
+        assert response.json() == {"detail": "not found"}
+
+
+def test_api_json_routes_declare_standard_response() -> None:
+    """
+    JSON-маршруты API объявляют StandardResponse[...] и пропускаются middleware:
+    иначе схема OpenAPI расходится с телом ответа, обёрнутым middleware.
+    """
+    unwrapped = [
+        route.path
+        for route in main_app.routes
+        if isinstance(route, APIRoute)
+        and route.path.startswith(settings.API_V1_STR)
+        and route.response_model is not None
+        and not (
+            isinstance(route.response_model, type)
+            and issubclass(route.response_model, StandardResponse)
+        )
+    ]
+
+    assert unwrapped == []
@@ -0,0 +1,116 @@
+"""Тесты для app/core/query_counter.py"""
+
+import logging
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from app.core.query_counter import (
+    QueryCounterMiddleware,
+    QueryStats,
+    instrument_engine,
+    track_queries,
+)
+from app.core.timing import TimingRecorder, _recorder
+from app.core.timing import instrument_engine as instrument_timing
+
+
+@pytest.fixture
+def engine() -> Engine:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    return engine
+
+
+class TestQueryStats:
+    """Тесты для QueryStats и track_queries"""
+
+    def test_repeated_statements(self) -> None:
+        """Запросы, повторённые не меньше порога, считаются вероятным N+1"""
+        stats = QueryStats()
+        for _ in range(5):
+            stats.add("SELECT * FROM users WHERE id = $1", 0.001)
+        stats.add("SELECT 1", 0.001)
+
+        assert stats.count == 6
+        assert stats.repeated(5) == [("SELECT * FROM users WHERE id = $1", 5)]
+        assert stats.repeated(6) == []
+
+    def test_track_queries_counts_engine_statements(self, engine: Engine) -> None:
+        """События движка учитываются только внутри track_queries"""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with track_queries() as stats:
+                conn.execute(text("SELECT 2"))
+                conn.execute(text("SELECT 2"))
+            conn.execute(text("SELECT 3"))
+
+        assert stats.count == 2
+        assert stats.statements["SELECT 2"] == 2
+        assert stats.duration >= 0
+
+    def test_one_listener_for_counter_and_timing(self, engine: Engine) -> None:
+        """Подсчёт запросов и Server-Timing используют одну пару обработчиков событий"""
+        instrument_engine(engine)
+        instrument_timing(engine)
+        recorder = TimingRecorder()
+        token = _recorder.set(recorder)
+        try:
+            with engine.connect() as conn, track_queries() as stats:
+                conn.execute(text("SELECT 1"))
+        finally:
+            _recorder.reset(token)
+
+        assert len(engine.dispatch.before_cursor_execute) == 1
+        assert len(engine.dispatch.after_cursor_execute) == 1
+        assert stats.count == 1
+        assert recorder.spans["db"][1] == 1
+
+
+class TestQueryCounterMiddleware:
+    """Тесты для QueryCounterMiddleware"""
+
+    def test_headers_and_n_plus_one_warning(
+        self, engine: Engine, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """В ответ добавляются заголовки, повторяющиеся запросы попадают в лог"""
+        app = FastAPI()
+
+        @app.get("/items")
+        async def items() -> dict:
+            with engine.connect() as conn:
+                for i in range(3):
+                    conn.execute(text("SELECT :id"), {"id": i})
+            return {"ok": True}
+
+        app.add_middleware(QueryCounterMiddleware, n_plus_one_threshold=3)
+
+        with caplog.at_level(logging.INFO, logger="app.core.query_counter"):
+            response = TestClient(app).get("/items")
+
+        assert response.headers["x-db-query-count"] == "3"
+        assert float(response.headers["x-db-query-time-ms"]) >= 0
+        assert "GET /items: 3 SQL запросов" in caplog.text
+        assert "Возможный N+1 в GET /items: запрос выполнен 3 раз" in caplog.text
+
+
+class TestQueryBudgetFixture:
+    """Тесты для фикстуры query_budget"""
+
+    def test_counts_engine_statements(self, engine: Engine, query_budget: Any) -> None:
+        with query_budget(2) as stats, engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        assert stats.count == 2
+
+    def test_budget_exceeded(self, engine: Engine, query_budget: Any) -> None:
+        """Превышение бюджета приводит к падению теста"""
+        with pytest.raises(AssertionError, match="Превышен бюджет запросов: 3 > 2"):
+            with query_budget(2), engine.connect() as conn:
+                for _ in range(3):
+                    conn.execute(text("SELECT 1"))
@@ -0,0 +1,97 @@
+"""Тесты для app/core/rate_limit.py"""
+
+import pytest
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+from app.core.rate_limit import LoginRateLimiter, TokenBucketLimiter, client_ip
+
+
+def _request(peer: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+class TestTokenBucketLimiter:
+    """Тесты для TokenBucketLimiter"""
+
+    def test_burst_then_throttle(self) -> None:
+        """После исчерпания burst запросы отклоняются"""
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=3)
+        assert [limiter.consume("key", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.consume("key", now=0.0) == pytest.approx(1.0)
+
+    def test_refill_over_time(self) -> None:
+        """Токены восстанавливаются со временем"""
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1)
+        assert limiter.consume("key", now=0.0) == 0.0
+        assert limiter.consume("key", now=0.5) > 0
+        assert limiter.consume("key", now=2.0) == 0.0
+
+    def test_keys_are_independent(self) -> None:
+        """Лимиты разных ключей не влияют друг на друга"""
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1)
+        assert limiter.consume("a", now=0.0) == 0.0
+        assert limiter.consume("b", now=0.0) == 0.0
+
+    def test_retry_after_does_not_consume(self) -> None:
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1)
+        assert limiter.retry_after("key", now=0.0) == 0.0
+        assert limiter.consume("key", now=0.0) == 0.0
+        assert limiter.retry_after("key", now=0.0) == pytest.approx(1.0)
+
+    def test_lru_eviction_bounds_memory(self) -> None:
+        """Количество хранимых ключей ограничено max_keys"""
+        limiter = TokenBucketLimiter(rate_per_minute=60, burst=1, max_keys=16, shards=4)
+        for i in range(1000):
+            limiter.consume(f"key-{i}", now=0.0)
+        assert len(limiter) <= 16
+
+
+class TestLoginRateLimiter:
+    """Тесты для LoginRateLimiter"""
+
+    def test_username_limit(self) -> None:
+        """Перебор паролей одного пользователя с разных IP ограничивается"""
+        limiter = LoginRateLimiter()
+        limiter.by_username = TokenBucketLimiter(rate_per_minute=1, burst=2)
+        limiter.check("10.0.0.1", "victim")
+        limiter.check("10.0.0.2", "Victim")
+
+        with pytest.raises(TooManyRequestsException) as exc_info:
+            limiter.check("10.0.0.3", "victim")
+
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+    def test_rejected_attempt_consumes_no_tokens(self) -> None:
+        """Попытка, отклонённая по IP, не расходует лимит пользователя"""
+        limiter = LoginRateLimiter()
+        limiter.by_ip = TokenBucketLimiter(rate_per_minute=1, burst=1)
+        limiter.by_username = TokenBucketLimiter(rate_per_minute=1, burst=2)
+        limiter.check("10.0.0.1", "other")
+
+        for _ in range(3):
+            with pytest.raises(TooManyRequestsException):
+                limiter.check("10.0.0.1", "victim")
+
+        limiter.check("10.0.0.2", "victim")
+        limiter.check("10.0.0.3", "victim")
+
+
+class TestClientIp:
+    """Тесты для client_ip"""
+
+    def test_direct_client(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Без доверенного прокси X-Forwarded-For игнорируется"""
+        monkeypatch.setattr(settings, "TRUSTED_PROXIES", [])
+        assert client_ip(_request("203.0.113.5", "198.51.100.1")) == "203.0.113.5"
+
+    def test_forwarded_by_trusted_proxy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """За доверенным прокси - первый справа адрес не из прокси, подделка слева не влияет"""
+        monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.1", "10.0.0.2"])
+        request = _request("10.0.0.1", "1.2.3.4, 198.51.100.1, 10.0.0.2")
+
+        assert client_ip(request) == "198.51.100.1"
+        assert client_ip(_request("10.0.0.1")) == "10.0.0.1"
@@ -0,0 +1,207 @@
+"""Тесты для app/core/replica.py и маршрутизации чтения в get_read_db и get_group_read_db"""
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import Request
+from sqlalchemy.exc import OperationalError
+
+from app.core import dependencies
+from app.core.dependencies import get_group_read_db, get_read_db
+from app.core.replica import ReplicaMonitor
+from tests.mocks import db_result
+
+
+@pytest.fixture
+def monitor(monkeypatch: pytest.MonkeyPatch) -> ReplicaMonitor:
+    monitor = ReplicaMonitor(max_lag_seconds=5.0)
+    monkeypatch.setattr(dependencies, "replica_monitor", monitor)
+    return monitor
+
+
+@pytest.fixture
+def replica_session(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Сессия реплики, которую возвращает ReadSessionLocal"""
+    session = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    monkeypatch.setattr(dependencies, "ReadSessionLocal", factory)
+    return session
+
+
+def _versions(session: AsyncMock, *versions: int | None) -> None:
+    """Результаты запросов версий данных по порядку"""
+    session.execute = AsyncMock(side_effect=[db_result(scalar=version) for version in versions])
+
+
+def _replica_version(session: AsyncMock, version: int | None) -> None:
+    _versions(session, version)
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+async def _read_session(mock_user: MagicMock, mock_db_session: AsyncMock) -> Any:
+    generator = get_read_db(request=_request(), current_user=mock_user, db=mock_db_session)
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+
+async def _group_read_session(mock_user: MagicMock, mock_db_session: AsyncMock) -> Any:
+    generator = get_group_read_db(
+        group_id=10, request=_request(), current_user=mock_user, db=mock_db_session
+    )
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+
+class TestReplicaMonitor:
+    """Тесты для ReplicaMonitor"""
+
+    async def test_healthy_within_lag_tolerance(self, monitor: ReplicaMonitor) -> None:
+        """Отставание в пределах допустимого - реплика пригодна"""
+        session = AsyncMock()
+        session.scalar = AsyncMock(return_value=1.5)
+
+        await monitor.check(session)
+
+        assert monitor.healthy is True
+        assert monitor.lag_seconds == 1.5
+
+    async def test_unhealthy_when_lagging(self, monitor: ReplicaMonitor) -> None:
+        """Отставание больше допустимого - чтение уходит на основную БД"""
+        monitor.healthy = True
+        session = AsyncMock()
+        session.scalar = AsyncMock(return_value=30)
+
+        await monitor.check(session)
+
+        assert monitor.healthy is False
+
+    def test_mark_unhealthy(self, monitor: ReplicaMonitor) -> None:
+        monitor.healthy = True
+        monitor.mark_unhealthy("connection refused")
+        assert monitor.healthy is False
+
+
+class TestGetReadDb:
+    """Тесты для выбора сессии в get_read_db"""
+
+    async def test_primary_without_replica(
+        self, monkeypatch: pytest.MonkeyPatch, mock_user: MagicMock, mock_db_session: AsyncMock
+    ) -> None:
+        """Без DATABASE_READ_URL используется основная БД"""
+        monkeypatch.setattr(dependencies, "ReadSessionLocal", None)
+
+        assert await _read_session(mock_user, mock_db_session) is mock_db_session
+
+    async def test_primary_when_replica_unhealthy(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        monitor.healthy = False
+
+        assert await _read_session(mock_user, mock_db_session) is mock_db_session
+        replica_session.execute.assert_not_awaited()
+
+    async def test_replica_when_caught_up(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Реплика содержит последние изменения пользователя - читаем с неё"""
+        monitor.healthy = True
+        mock_user.data_version = 3
+        _replica_version(replica_session, 3)
+
+        assert await _read_session(mock_user, mock_db_session) is replica_session
+
+    async def test_primary_when_user_changes_not_replicated(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Свежая запись пользователя ещё не дошла до реплики - читаем с основной БД"""
+        monitor.healthy = True
+        mock_user.data_version = 4
+        _replica_version(replica_session, 3)
+
+        assert await _read_session(mock_user, mock_db_session) is mock_db_session
+        assert monitor.healthy is True
+
+    async def test_fallback_on_replica_error(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Ошибка соединения с репликой - основная БД и реплика помечается неисправной"""
+        monitor.healthy = True
+        replica_session.execute = AsyncMock(
+            side_effect=OperationalError("SELECT", {}, ConnectionRefusedError())
+        )
+
+        assert await _read_session(mock_user, mock_db_session) is mock_db_session
+        assert monitor.healthy is False
+
+
+class TestGetGroupReadDb:
+    """Тесты для выбора сессии в get_group_read_db"""
+
+    async def test_replica_when_group_caught_up(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        monitor.healthy = True
+        mock_user.data_version = 3
+        _versions(mock_db_session, 7)
+        _versions(replica_session, 3, 7)
+
+        assert await _group_read_session(mock_user, mock_db_session) is replica_session
+
+    async def test_primary_when_group_changes_not_replicated(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Другой участник только что изменил группу, реплика ещё не догнала - основная БД"""
+        monitor.healthy = True
+        mock_user.data_version = 3
+        _versions(mock_db_session, 8)
+        _versions(replica_session, 3, 7)
+
+        assert await _group_read_session(mock_user, mock_db_session) is mock_db_session
+        assert monitor.healthy is True
+
+    async def test_primary_when_not_member(
+        self,
+        monitor: ReplicaMonitor,
+        replica_session: AsyncMock,
+        mock_user: MagicMock,
+        mock_db_session: AsyncMock,
+    ) -> None:
+        """Нет доступа к группе на основной БД - реплику не спрашиваем"""
+        monitor.healthy = True
+        _versions(mock_db_session, None)
+        _versions(replica_session)
+
+        assert await _group_read_session(mock_user, mock_db_session) is mock_db_session
+        replica_session.execute.assert_not_awaited()
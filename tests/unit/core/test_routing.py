@@ -0,0 +1,121 @@
+"""Тесты для app/core/routing.py"""
+
+import json
+from typing import Any
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.dto.response import StandardResponse, success_response
+from app.core.routing import StandardResponseRoute
+
+
+class Item(BaseModel):
+    id: int
+    title: str
+    description: str | None = None
+
+
+def build_router(route_class: type[APIRoute]) -> APIRouter:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/item", response_model=StandardResponse[Item])
+    async def get_item() -> Any:
+        return success_response(data=Item(id=1, title="Покупка"))
+
+    @router.get("/item-dict", response_model=StandardResponse[Item])
+    async def get_item_dict() -> Any:
+        return success_response(data={"id": "2", "title": "Словарь", "extra": True})
+
+    @router.post("/item", response_model=StandardResponse[Item], status_code=201)
+    async def create_item() -> Any:
+        return success_response(data=Item(id=3, title="Создано"), code=201)
+
+    @router.get("/headers", response_model=StandardResponse[dict])
+    async def with_headers(response: Response) -> Any:
+        response.headers["X-Custom"] = "1"
+        response.status_code = 202
+        return success_response(data={"ok": True}, code=202)
+
+    @router.get("/raw", response_model=StandardResponse[dict])
+    async def raw() -> Any:
+        return PlainTextResponse("raw")
+
+    return router
+
+
+def build_client(route_class: type[APIRoute]) -> TestClient:
+    app = FastAPI()
+    app.include_router(build_router(route_class))
+    return TestClient(app)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return build_client(StandardResponseRoute)
+
+
+@pytest.fixture
+def reference_client() -> TestClient:
+    return build_client(APIRoute)
+
+
+def _without_timestamp(body: bytes) -> dict:
+    data = json.loads(body)
+    data.pop("timestamp")
+    return data
+
+
+class TestStandardResponseRoute:
+    """Тесты для StandardResponseRoute"""
+
+    @pytest.mark.parametrize("path", ["/item", "/item-dict", "/headers"])
+    def test_output_matches_default_route(
+        self, client: TestClient, reference_client: TestClient, path: str
+    ) -> None:
+        """Тело ответа совпадает с тем, что отдаёт стандартный APIRoute"""
+        response = client.get(path)
+        reference = reference_client.get(path)
+
+        assert response.status_code == reference.status_code
+        assert response.headers["content-type"] == reference.headers["content-type"]
+        assert _without_timestamp(response.content) == _without_timestamp(reference.content)
+
+    def test_none_fields_are_serialized(self, client: TestClient) -> None:
+        """Поля со значением None сериализуются так же, как раньше"""
+        data = client.get("/item").json()
+
+        assert data["data"] == {"id": 1, "title": "Покупка", "description": None}
+        assert data["success"] is True
+
+    def test_dict_data_is_validated(self, client: TestClient) -> None:
+        """Данные, не совпадающие с моделью, валидируются и фильтруются по схеме"""
+        data = client.get("/item-dict").json()
+
+        assert data["data"] == {"id": 2, "title": "Словарь", "description": None}
+
+    def test_status_code_from_decorator(self, client: TestClient) -> None:
+        """Используется status_code маршрута"""
+        response = client.post("/item")
+
+        assert response.status_code == 201
+        assert response.json()["code"] == 201
+
+    def test_sub_response_headers_and_status(self, client: TestClient) -> None:
+        """Заголовки и код, выставленные через параметр Response, сохраняются"""
+        response = client.get("/headers")
+
+        assert response.status_code == 202
+        assert response.headers["x-custom"] == "1"
+        assert response.headers["content-length"] == str(len(response.content))
+
+    def test_response_returned_as_is(self, client: TestClient) -> None:
+        """Готовый Response из endpoint'а отдаётся без изменений"""
+        response = client.get("/raw")
+
+        assert response.text == "raw"
+        assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,65 @@
+"""Тесты для app/core/timing.py"""
+
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.timing import ServerTimingMiddleware, TimingRecorder, instrument_engine, span
+
+
+def build_client(sample_rate: float) -> TestClient:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work() -> dict:
+        with span("auth"):
+            pass
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    app.add_middleware(ServerTimingMiddleware, sample_rate=sample_rate)
+    return TestClient(app)
+
+
+class TestServerTiming:
+    """Тесты для span и ServerTimingMiddleware"""
+
+    def test_span_outside_request_is_noop(self) -> None:
+        """Вне замеряемого запроса span ничего не записывает"""
+        with span("auth"):
+            pass
+
+    def test_recorder_header_value(self) -> None:
+        """Длительности одного этапа суммируются, для db выводится число запросов"""
+        recorder = TimingRecorder()
+        recorder.add("db", 0.001)
+        recorder.add("db", 0.002)
+        recorder.add("render", 0.5)
+
+        value = recorder.header_value().decode()
+
+        assert value.startswith('db;dur=3.00;desc="2 queries", render;dur=500.00, total;dur=')
+
+    def test_header_for_sampled_request(self) -> None:
+        """Для выбранного запроса заголовок содержит этапы auth, db и total"""
+        response = build_client(sample_rate=1.0).get("/work")
+
+        header = response.headers["server-timing"]
+        assert re.search(r"auth;dur=\d+\.\d+", header)
+        assert re.search(r'db;dur=\d+\.\d+;desc="2 queries"', header)
+        assert "total;dur=" in header
+
+    @pytest.mark.parametrize("sample_rate", [0.0, -1.0])
+    def test_no_header_when_disabled(self, sample_rate: float) -> None:
+        """При нулевой доле заголовок не добавляется"""
+        response = build_client(sample_rate=sample_rate).get("/work")
+
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
@@ -9,6 +9,8 @@ from app.modules.group_members.schemas import (
     GroupMemberCreate,
     GroupMemberDelete,
     GroupMemberResponse,
+    GroupMembersBatch,
+    GroupMembersBatchResponse,
 )
 
 
@@ -92,3 +94,38 @@ class TestRemoveMember:
                 user_id=2,
                 requester_id=mock_user.id,
             )
+
+
+class TestBatchMembers:
+    """Тесты для POST /group-members/batch"""
+
+    def test_batch_success(self, client: Any, mock_user: Any) -> None:
+        """Пакет передаётся в сервис целиком"""
+        expected_response = GroupMembersBatchResponse(
+            status="success",
+            message="Пользователи добавлены в группу: 2",
+            group_id=1,
+            user_ids=[2, 3],
+        )
+
+        with patch("app.modules.group_members.router.group_member_service") as mock_service:
+            mock_service.batch = AsyncMock(return_value=expected_response)
+
+            response = client.post(
+                "/group-members/batch", json={"group_id": 1, "action": "add", "user_ids": [2, 3]}
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["data"]["user_ids"] == [2, 3]
+            mock_service.batch.assert_called_once_with(
+                db=ANY,
+                data=GroupMembersBatch(group_id=1, action="add", user_ids=[2, 3]),
+                requester_id=mock_user.id,
+            )
+
+    def test_batch_rejects_empty_list(self, client: Any) -> None:
+        response = client.post(
+            "/group-members/batch", json={"group_id": 1, "action": "add", "user_ids": []}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
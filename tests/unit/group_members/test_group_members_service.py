@@ -0,0 +1,261 @@
+"""Тесты для app/modules/group_members/service.py"""
+
+from typing import Any, Literal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.group_members.schemas import GroupMembersBatch
+from app.modules.group_members.service import USER_IN_ANOTHER_GROUP, group_member_service
+from app.modules.groups.schemas import GroupCreate
+from app.modules.groups.service import group_service
+from app.modules.users.models import User
+from tests.mocks import db_result
+
+
+def _row(**values: Any) -> MagicMock:
+    return db_result(one=MagicMock(**values))
+
+
+def _add_row(
+    owner_id: int | None = 1,
+    user_exists: bool = True,
+    current_group_id: int | None = None,
+    added: bool = True,
+) -> MagicMock:
+    return _row(
+        owner_id=owner_id, user_exists=user_exists, current_group_id=current_group_id, added=added
+    )
+
+
+class TestAddRemoveMember:
+    """Добавление и удаление участника одним запросом"""
+
+    async def test_add_member(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.return_value = _add_row()
+
+        result = await group_member_service.add(
+            db=mock_db_session, group_id=10, user_id=2, requester_id=1
+        )
+
+        assert result.user_id == 2
+        assert mock_db_session.execute.await_count == 1
+        mock_db_session.commit.assert_awaited_once()
+
+    async def test_remove_member(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.return_value = _row(owner_id=1, removed=True)
+
+        result = await group_member_service.remove(
+            db=mock_db_session, group_id=10, user_id=2, requester_id=1
+        )
+
+        assert result.message == "Пользователь удален из группы"
+        assert mock_db_session.execute.await_count == 1
+
+
+class TestAddMemberErrors:
+    """Результат единого запроса сопоставляется с прежними ошибками"""
+
+    @pytest.mark.parametrize(
+        ("row", "status_code", "detail"),
+        [
+            (_add_row(owner_id=None, added=False), 404, "Группа не найдена"),
+            (
+                _add_row(owner_id=5, added=False),
+                403,
+                "Только владелец группы может добавлять участников",
+            ),
+            (_add_row(user_exists=False, added=False), 400, "Пользователь не существует"),
+            (_add_row(current_group_id=10, added=False), 400, "Пользователь уже в группе"),
+            (_add_row(current_group_id=20, added=False), 400, USER_IN_ANOTHER_GROUP),
+            # Конфликт ON CONFLICT с одновременным добавлением в другую группу
+            (_add_row(added=False), 400, USER_IN_ANOTHER_GROUP),
+        ],
+    )
+    async def test_add_errors(
+        self, mock_db_session: AsyncMock, row: MagicMock, status_code: int, detail: str
+    ) -> None:
+        mock_db_session.execute.return_value = row
+
+        with pytest.raises(HTTPException) as exc_info:
+            await group_member_service.add(
+                db=mock_db_session, group_id=10, user_id=2, requester_id=1
+            )
+
+        assert exc_info.value.status_code == status_code
+        assert exc_info.value.detail == detail
+        mock_db_session.commit.assert_not_awaited()
+        mock_db_session.rollback.assert_awaited_once()
+
+    async def test_remove_not_member(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.return_value = _row(owner_id=1, removed=False)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await group_member_service.remove(
+                db=mock_db_session, group_id=10, user_id=2, requester_id=1
+            )
+
+        assert exc_info.value.detail == "Пользователь не состоит в группе"
+
+
+def _memberships(groups: dict[int, int]) -> MagicMock:
+    """Текущие группы пользователей: {user_id: group_id}"""
+    return db_result(rows=groups.items())
+
+
+def _batch(
+    action: Literal["add", "remove"], user_ids: list[int], group_id: int = 10
+) -> GroupMembersBatch:
+    return GroupMembersBatch(group_id=group_id, action=action, user_ids=user_ids)
+
+
+class TestBatchMembers:
+    """Пакетное добавление и удаление участников"""
+
+    async def test_batch_add(self, mock_db_session: AsyncMock) -> None:
+        user_ids = list(range(2, 102))
+        mock_db_session.execute.side_effect = [
+            db_result(scalar=1),
+            db_result(scalars=user_ids),
+            _memberships({}),
+            db_result(scalar=len(user_ids)),
+        ]
+
+        result = await group_member_service.batch(
+            db=mock_db_session, data=_batch("add", user_ids), requester_id=1
+        )
+
+        assert result.user_ids == user_ids
+        mock_db_session.commit.assert_awaited_once()
+
+    async def test_batch_remove(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.side_effect = [db_result(scalar=1), db_result(scalars=[2, 3])]
+
+        result = await group_member_service.batch(
+            db=mock_db_session, data=_batch("remove", [2, 3]), requester_id=1
+        )
+
+        assert result.message == "Пользователи удалены из группы: 2"
+
+    @pytest.mark.parametrize(
+        ("responses", "detail"),
+        [
+            ([db_result(scalar=1), db_result(scalars=[2])], "Пользователи не существуют: 3"),
+            (
+                [db_result(scalar=1), db_result(scalars=[2, 3]), _memberships({3: 10})],
+                "Пользователи уже в группе: 3",
+            ),
+            (
+                [db_result(scalar=1), db_result(scalars=[2, 3]), _memberships({2: 20})],
+                f"{USER_IN_ANOTHER_GROUP} ID: 2",
+            ),
+            # Одновременное добавление в другую группу - вставлены не все строки
+            (
+                [
+                    db_result(scalar=1),
+                    db_result(scalars=[2, 3]),
+                    _memberships({}),
+                    db_result(scalar=1),
+                ],
+                USER_IN_ANOTHER_GROUP,
+            ),
+        ],
+    )
+    async def test_batch_add_errors(
+        self, mock_db_session: AsyncMock, responses: list[MagicMock], detail: str
+    ) -> None:
+        """Ошибка проверки любого пользователя отменяет весь пакет"""
+        mock_db_session.execute.side_effect = responses
+
+        with pytest.raises(HTTPException) as exc_info:
+            await group_member_service.batch(
+                db=mock_db_session, data=_batch("add", [2, 3]), requester_id=1
+            )
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == detail
+        mock_db_session.commit.assert_not_awaited()
+        mock_db_session.rollback.assert_awaited_once()
+
+    async def test_batch_remove_not_members(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.side_effect = [db_result(scalar=1), db_result(scalars=[2])]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await group_member_service.batch(
+                db=mock_db_session, data=_batch("remove", [2, 3]), requester_id=1
+            )
+
+        assert exc_info.value.detail == "Пользователи не состоят в группе: 3"
+        mock_db_session.rollback.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        ("owner_id", "user_ids", "status_code"), [(None, [2], 404), (5, [2], 403), (1, [1, 2], 400)]
+    )
+    async def test_batch_permissions(
+        self,
+        mock_db_session: AsyncMock,
+        owner_id: int | None,
+        user_ids: list[int],
+        status_code: int,
+    ) -> None:
+        mock_db_session.execute.return_value = db_result(scalar=owner_id)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await group_member_service.batch(
+                db=mock_db_session, data=_batch("add", user_ids), requester_id=1
+            )
+
+        assert exc_info.value.status_code == status_code
+        assert mock_db_session.execute.await_count == 1
+
+    def test_batch_deduplicates_user_ids(self) -> None:
+        assert _batch("add", [3, 2, 3]).user_ids == [3, 2]
+
+
+class TestQueryBudget:
+    """Бюджет запросов на PostgreSQL (TEST_DATABASE_URL): не зависит от размера пакета"""
+
+    async def _group(self, pg_session: AsyncSession, owner: User) -> int:
+        group = await group_service.create_group_service(
+            pg_session, GroupCreate(name="Семья"), owner_id=int(owner.id)
+        )
+        return group.id
+
+    async def test_add_and_remove_member(
+        self, pg_session: AsyncSession, create_user: Any, query_budget: Any
+    ) -> None:
+        owner, user = await create_user("owner"), await create_user("member")
+        group_id = await self._group(pg_session, owner)
+
+        with query_budget(1):
+            await group_member_service.add(
+                db=pg_session, group_id=group_id, user_id=int(user.id), requester_id=int(owner.id)
+            )
+        with query_budget(1):
+            await group_member_service.remove(
+                db=pg_session, group_id=group_id, user_id=int(user.id), requester_id=int(owner.id)
+            )
+
+    async def test_batch(
+        self, pg_session: AsyncSession, create_user: Any, query_budget: Any
+    ) -> None:
+        owner = await create_user("owner")
+        group_id = await self._group(pg_session, owner)
+        user_ids = [int((await create_user(f"user{i}")).id) for i in range(100)]
+
+        with query_budget(4):
+            result = await group_member_service.batch(
+                db=pg_session,
+                data=_batch("add", user_ids, group_id=group_id),
+                requester_id=int(owner.id),
+            )
+        with query_budget(2):
+            await group_member_service.batch(
+                db=pg_session,
+                data=_batch("remove", user_ids, group_id=group_id),
+                requester_id=int(owner.id),
+            )
+
+        assert result.user_ids == user_ids
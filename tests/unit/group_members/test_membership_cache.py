@@ -0,0 +1,103 @@
+"""Тесты для app/modules/group_members/cache.py"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.db import READ_ONLY_INFO, REPLICA_INFO
+from app.modules.group_members import cache
+from app.modules.group_members.cache import MembershipCache, membership_cache
+from app.modules.group_members.service import group_member_service
+from tests.mocks import db_result
+
+
+class TestMembershipCache:
+    """Тесты для MembershipCache"""
+
+    def test_lookup_miss_and_hit(self) -> None:
+        memberships = MembershipCache()
+        assert memberships.lookup(1) == (False, None)
+
+        memberships.set(1, 10)
+        memberships.set(2, None)
+
+        assert memberships.lookup(1) == (True, 10)
+        assert memberships.lookup(2) == (True, None)
+
+    def test_entries_expire(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        memberships = MembershipCache(ttl=10)
+        monkeypatch.setattr(cache.time, "monotonic", lambda: 100.0)
+        memberships.set(1, 10)
+
+        monkeypatch.setattr(cache.time, "monotonic", lambda: 111.0)
+
+        assert memberships.lookup(1) == (False, None)
+        assert len(memberships) == 0
+
+    def test_least_recently_used_evicted(self) -> None:
+        memberships = MembershipCache(capacity=2)
+        memberships.set(1, 10)
+        memberships.set(2, 10)
+        memberships.lookup(1)
+        memberships.set(3, 20)
+
+        assert memberships.lookup(2) == (False, None)
+        assert memberships.lookup(1) == (True, 10)
+
+    def test_invalidate_group(self) -> None:
+        memberships = MembershipCache()
+        memberships.set(1, 10)
+        memberships.set(2, 10)
+        memberships.set(3, 20)
+
+        memberships.invalidate_group(10)
+
+        assert len(memberships) == 1
+        assert memberships.lookup(3) == (True, 20)
+
+
+class TestIsMember:
+    """Проверка членства через кэш"""
+
+    async def test_cache_miss_then_hit(self, mock_db_session: AsyncMock) -> None:
+        """Промах - один запрос без загрузки участников, повторная проверка - без запросов"""
+        mock_db_session.info = {READ_ONLY_INFO: True, REPLICA_INFO: False}
+        mock_db_session.execute.return_value = db_result(scalar=10)
+
+        assert await group_member_service.is_member(mock_db_session, 10, 1) is True
+        assert await group_member_service.is_member(mock_db_session, 10, 1) is True
+        assert await group_member_service.is_member(mock_db_session, 20, 1) is False
+        assert mock_db_session.execute.await_count == 1
+
+    async def test_replica_bypasses_cache(self, mock_db_session: AsyncMock) -> None:
+        """Реплика может отставать: её ответ не кэшируется, а кэш не используется"""
+        mock_db_session.info = {READ_ONLY_INFO: True, REPLICA_INFO: True}
+        membership_cache.set(1, 10)
+        mock_db_session.execute.return_value = db_result(scalar=None)
+
+        assert await group_member_service.is_member(mock_db_session, 10, 1) is False
+        assert membership_cache.lookup(1) == (True, 10)
+
+        membership_cache.clear()
+        await group_member_service.is_member(mock_db_session, 10, 1)
+        assert membership_cache.lookup(1) == (False, None)
+
+    async def test_write_session_uses_cache(self, mock_db_session: AsyncMock) -> None:
+        """Запрос на запись (create/update транзакции) тоже проверяет членство по кэшу"""
+        mock_db_session.info = {}
+        membership_cache.set(2, 10)
+
+        assert await group_member_service.is_member(mock_db_session, 10, 2) is True
+        mock_db_session.execute.assert_not_called()
+
+    async def test_remove_invalidates(self, mock_db_session: AsyncMock) -> None:
+        """Удаление участника сбрасывает запись кэша"""
+        membership_cache.set(2, 10)
+        result = db_result(one=MagicMock(owner_id=1, removed=True))
+        mock_db_session.execute.return_value = result
+
+        await group_member_service.remove(
+            db=mock_db_session, group_id=10, user_id=2, requester_id=1
+        )
+
+        assert membership_cache.lookup(2) == (False, None)
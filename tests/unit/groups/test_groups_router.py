@@ -1,6 +1,7 @@
 # tests/test_groups.py
 """Тесты для app/modules/groups/router.py"""
 
+from datetime import date
 from typing import Any
 from unittest.mock import AsyncMock, patch, ANY
 
@@ -13,6 +14,7 @@ from app.modules.groups.schemas import (
     GroupsResponseCreate,
     GroupUpdate,
 )
+from app.modules.transactions.schemas import GroupTransactionFeedResponse
 
 
 class TestCreateGroup:
@@ -65,6 +67,7 @@ class TestGroupDetails:
 
         with patch("app.modules.groups.router.group_service") as mock_group_service:
             mock_group_service.get_group_service = AsyncMock(return_value=group_response)
+            mock_group_service.get_group_data_version = AsyncMock(return_value=3)
 
             response = client.get(f"/group/{group_id}")
 
@@ -84,6 +87,35 @@ class TestGroupDetails:
                 id_user=int(mock_user.id),
             )
 
+    def test_get_group_not_modified(self, client: Any, mock_user: Any) -> None:
+        """При совпадении If-None-Match возвращается 304 без загрузки группы"""
+        with patch("app.modules.groups.router.group_service") as mock_group_service:
+            mock_group_service.get_group_service = AsyncMock()
+            mock_group_service.get_group_data_version = AsyncMock(return_value=3)
+
+            etag = client.get("/group/1").headers["etag"]
+            response = client.get("/group/1", headers={"If-None-Match": etag})
+
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.headers["etag"] == etag
+            assert response.content == b""
+            mock_group_service.get_group_service.assert_called_once()
+
+    def test_get_group_etag_changes_with_version(self, client: Any, mock_user: Any) -> None:
+        """После изменения версии группы старый ETag не совпадает"""
+        with patch("app.modules.groups.router.group_service") as mock_group_service:
+            mock_group_service.get_group_service = AsyncMock(
+                return_value=GroupResponse(id=1, members=[])
+            )
+            mock_group_service.get_group_data_version = AsyncMock(return_value=3)
+            etag = client.get("/group/1").headers["etag"]
+
+            mock_group_service.get_group_data_version = AsyncMock(return_value=4)
+            response = client.get("/group/1", headers={"If-None-Match": etag})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["etag"] != etag
+
 
 class TestUpdateGroup:
     """Тесты для PUT /group/{group_id}/update (обновление группы)"""
@@ -143,3 +175,50 @@ class TestDeleteGroup:
                 group_id=group_id,
                 id_user=int(mock_user.id),
             )
+
+
+class TestGroupTransactions:
+    """Тесты для GET /group/{group_id}/transactions (лента транзакций группы)"""
+
+    def test_feed_passes_filters(self, client: Any) -> None:
+        feed = GroupTransactionFeedResponse(items=[], next_cursor=None)
+
+        with (
+            patch("app.modules.groups.router.group_service") as mock_group_service,
+            patch("app.modules.groups.router.transaction_service") as mock_tx_service,
+        ):
+            mock_group_service.get_group_data_version = AsyncMock(return_value=3)
+            mock_tx_service.list_group_transactions = AsyncMock(return_value=feed)
+
+            response = client.get(
+                "/group/1/transactions",
+                params={"member_id": 2, "date_from": "2026-01-01", "cursor": "abc", "limit": 5},
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["data"] == {"items": [], "next_cursor": None}
+            assert response.headers["etag"]
+            mock_tx_service.list_group_transactions.assert_called_once_with(
+                db=ANY,
+                group_id=1,
+                member_id=2,
+                category=None,
+                date_from=date(2026, 1, 1),
+                date_to=None,
+                cursor="abc",
+                limit=5,
+            )
+
+    def test_feed_not_member(self, client: Any) -> None:
+        """Не участник группы получает 404, лента не читается"""
+        with (
+            patch("app.modules.groups.router.group_service") as mock_group_service,
+            patch("app.modules.groups.router.transaction_service") as mock_tx_service,
+        ):
+            mock_group_service.get_group_data_version = AsyncMock(return_value=None)
+            mock_tx_service.list_group_transactions = AsyncMock()
+
+            response = client.get("/group/1/transactions")
+
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            mock_tx_service.list_group_transactions.assert_not_called()
@@ -0,0 +1,138 @@
+"""Тесты для app/modules/groups/service.py"""
+
+from decimal import Decimal
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.modules.groups.schemas import GroupCreate
+from app.modules.groups.service import USER_ALREADY_IN_GROUP, group_service
+from tests.mocks import db_result
+
+
+class TestCreateGroup:
+    """Создание группы одним запросом"""
+
+    async def test_create_group_single_statement(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.return_value = db_result(
+            one_or_none=MagicMock(group_id=10, owner_id=1, username="alice")
+        )
+
+        result = await group_service.create_group_service(
+            mock_db_session, GroupCreate(name="Семья"), owner_id=1
+        )
+
+        assert mock_db_session.execute.await_count == 1
+        assert result.id == 10
+        assert result.owner_id == 1
+        assert [member.username for member in result.members] == ["alice"]
+        mock_db_session.commit.assert_awaited_once()
+
+    async def test_owner_already_in_group(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.return_value = db_result(one_or_none=None)
+
+        with pytest.raises(ValidationException) as exc_info:
+            await group_service.create_group_service(
+                mock_db_session, GroupCreate(name="Семья"), owner_id=1
+            )
+
+        assert exc_info.value.detail == USER_ALREADY_IN_GROUP
+        mock_db_session.rollback.assert_awaited_once()
+
+    async def test_concurrent_create_maps_constraint(self, mock_db_session: AsyncMock) -> None:
+        """Нарушение uq_group_members_user_id - та же ошибка, что и при проверке"""
+        cause = Exception("duplicate key")
+        cause.constraint_name = "uq_group_members_user_id"  # type: ignore[attr-defined]
+        orig = Exception("IntegrityError")
+        orig.__cause__ = cause
+        mock_db_session.execute.side_effect = IntegrityError("INSERT", {}, orig)
+
+        with pytest.raises(ValidationException) as exc_info:
+            await group_service.create_group_service(
+                mock_db_session, GroupCreate(name="Семья"), owner_id=1
+            )
+
+        assert exc_info.value.detail == USER_ALREADY_IN_GROUP
+
+
+def _participants(*rows: tuple[int, str, bool]) -> MagicMock:
+    return db_result(
+        rows=[
+            MagicMock(
+                user_id=user_id, username=f"user{user_id}", paid=Decimal(paid), is_member=member
+            )
+            for user_id, paid, member in rows
+        ]
+    )
+
+
+class TestSettlement:
+    """Взаиморасчёт группы по суммам из group_balances"""
+
+    async def test_settlement_single_query(self, mock_db_session: AsyncMock) -> None:
+        mock_db_session.execute.return_value = _participants(
+            (1, "90.00", True), (2, "0", True), (3, "30.00", True)
+        )
+
+        result = await group_service.get_settlement_service(mock_db_session, group_id=10, id_user=1)
+
+        assert mock_db_session.execute.await_count == 1
+        assert result.total_expense == 120
+        assert [(b.user_id, b.share, b.balance) for b in result.balances] == [
+            (1, 40, 50),
+            (2, 40, -40),
+            (3, 40, -10),
+        ]
+        assert {(t.from_user_id, t.to_user_id, t.amount) for t in result.transfers} == {
+            (2, 1, 40),
+            (3, 1, 10),
+        }
+
+    async def test_former_member_gets_refund(self, mock_db_session: AsyncMock) -> None:
+        """Бывший участник доли не несёт - текущие участники возвращают ему заплаченное"""
+        mock_db_session.execute.return_value = _participants(
+            (1, "0", True), (2, "0", True), (3, "50.00", False)
+        )
+
+        result = await group_service.get_settlement_service(mock_db_session, group_id=10, id_user=1)
+
+        assert [(t.from_user_id, t.to_user_id, t.amount) for t in result.transfers] == [
+            (1, 3, 25),
+            (2, 3, 25),
+        ]
+
+    @pytest.mark.parametrize("rows", [(), ((2, "0", True), (1, "10.00", False))])
+    async def test_not_member(
+        self, mock_db_session: AsyncMock, rows: tuple[tuple[int, str, bool], ...]
+    ) -> None:
+        mock_db_session.execute.return_value = _participants(*rows)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await group_service.get_settlement_service(mock_db_session, group_id=10, id_user=1)
+
+        assert exc_info.value.status_code == 404
+
+
+class TestQueryBudget:
+    """Бюджет запросов на PostgreSQL (TEST_DATABASE_URL)"""
+
+    async def test_create_and_settle(
+        self, pg_session: AsyncSession, create_user: Any, query_budget: Any
+    ) -> None:
+        owner = await create_user("owner")
+
+        with query_budget(1):
+            group = await group_service.create_group_service(
+                pg_session, GroupCreate(name="Семья"), owner_id=int(owner.id)
+            )
+        with query_budget(1):
+            result = await group_service.get_settlement_service(
+                pg_session, group_id=group.id, id_user=int(owner.id)
+            )
+
+        assert result.total_expense == 0
@@ -0,0 +1,44 @@
+"""Тесты для app/modules/groups/settlement.py"""
+
+import random
+
+from app.modules.groups.settlement import net_balances, settle
+
+
+def _apply(balances: dict[int, int], transfers: list[tuple[int, int, int]]) -> dict[int, int]:
+    result = dict(balances)
+    for debtor, creditor, amount in transfers:
+        result[debtor] += amount
+        result[creditor] -= amount
+    return result
+
+
+def test_net_balances_distributes_remainder() -> None:
+    """Неделимые копейки достаются участникам с меньшими ID, сумма балансов - ноль"""
+    balances = net_balances({1: 1000}, [3, 1, 2])
+
+    assert balances == {1: 1000 - 334, 2: -333, 3: -333}
+    assert sum(balances.values()) == 0
+
+
+def test_net_balances_without_members() -> None:
+    assert net_balances({}, []) == {}
+
+
+def test_settle_single_debtor() -> None:
+    assert settle({1: 500, 2: -500, 3: 0}) == [(2, 1, 500)]
+
+
+def test_settle_closes_all_balances_with_few_transfers() -> None:
+    """Все балансы закрываются, переводов не больше n - 1"""
+    rng = random.Random(42)
+    for _ in range(50):
+        members = list(range(1, rng.randint(2, 40)))
+        paid = {user_id: rng.randint(0, 100_000) for user_id in members}
+        balances = net_balances(paid, members)
+
+        transfers = settle(balances)
+
+        assert set(_apply(balances, transfers).values()) <= {0}
+        assert len(transfers) <= len(members) - 1
+        assert all(amount > 0 for _, _, amount in transfers)
@@ -0,0 +1 @@
+# Jobs unit tests package
@@ -0,0 +1,120 @@
+"""Тесты для app/modules/jobs/router.py"""
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from fastapi import status
+
+from app.core.exceptions import ConflictException, NotFoundException
+from app.modules.jobs.models import Job, JobStatus
+
+
+def _job(**fields: Any) -> Job:
+    now = datetime.now(timezone.utc)
+    values = {
+        "id": 7,
+        "user_id": 1,
+        "kind": "transactions_export",
+        "payload": {},
+        "status": JobStatus.QUEUED,
+        "priority": 0,
+        "attempts": 0,
+        "max_attempts": 3,
+        "created_at": now,
+        "run_at": now,
+    }
+    return Job(**{**values, **fields})
+
+
+class TestCreateJob:
+    """Тесты для POST /jobs"""
+
+    def test_returns_202_with_location(self, client: Any, mock_user: Any) -> None:
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.enqueue = AsyncMock(return_value=_job())
+
+            response = client.post("/jobs", json={"kind": "transactions_export"})
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.headers["Location"] == "/jobs/7"
+        assert response.json()["data"]["status"] == "queued"
+        job_in = mock_service.enqueue.call_args.kwargs["job_in"]
+        assert job_in.kind == "transactions_export"
+        assert mock_service.enqueue.call_args.kwargs["user_id"] == mock_user.id
+
+    def test_invalid_period_rejected(self, client: Any) -> None:
+        """Неверный период отклоняется до постановки в очередь"""
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.enqueue = AsyncMock()
+
+            response = client.post("/jobs", json={"kind": "expenses_chart", "period": "2024/01"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_service.enqueue.assert_not_called()
+
+    def test_params_of_other_kind_rejected(self, client: Any) -> None:
+        """Период диаграммы не применим к выгрузке: 422 до постановки в очередь"""
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.enqueue = AsyncMock()
+
+            response = client.post("/jobs", json={"kind": "transactions_export", "period": "month"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_service.enqueue.assert_not_called()
+
+    def test_unknown_kind_rejected(self, client: Any) -> None:
+        response = client.post("/jobs", json={"kind": "unknown"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestGetJob:
+    """Тесты для GET /jobs/{job_id}"""
+
+    def test_pending_job_has_retry_after(self, client: Any) -> None:
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.get_job = AsyncMock(return_value=_job(status=JobStatus.RUNNING))
+
+            response = client.get("/jobs/7")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["status"] == "running"
+        assert "Retry-After" in response.headers
+
+    def test_not_found(self, client: Any) -> None:
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.get_job = AsyncMock(side_effect=NotFoundException())
+
+            response = client.get("/jobs/7")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestGetJobResult:
+    """Тесты для GET /jobs/{job_id}/result"""
+
+    def test_returns_content(self, client: Any) -> None:
+        job = _job(
+            status=JobStatus.SUCCEEDED,
+            result=b"ID,Title\n",
+            result_media_type="text/csv",
+            result_filename="transactions.csv",
+        )
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.get_result = AsyncMock(return_value=job)
+
+            response = client.get("/jobs/7/result")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b"ID,Title\n"
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "transactions.csv" in response.headers["content-disposition"]
+
+    def test_not_ready(self, client: Any) -> None:
+        with patch("app.modules.jobs.router.job_service") as mock_service:
+            mock_service.get_result = AsyncMock(side_effect=ConflictException())
+
+            response = client.get("/jobs/7/result")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
@@ -0,0 +1,108 @@
+"""Тесты для постановки задач без повторов (app/modules/jobs/service.py)"""
+
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.jobs.models import Job, JobStatus
+from app.modules.jobs.repository import job_repository
+from app.modules.jobs.schemas import JobCreate
+from app.modules.jobs.service import job_service
+
+JOB_IN = JobCreate(kind="transactions_export", category="Food")
+
+
+@pytest.fixture
+def repository(monkeypatch: pytest.MonkeyPatch) -> Any:
+    monkeypatch.setattr(job_repository, "find_reusable", AsyncMock(return_value=None))
+    monkeypatch.setattr(job_repository, "create_unique", AsyncMock(return_value=Job(id=8)))
+    return job_repository
+
+
+async def _enqueue(mock_db_session: Any, data_version: int = 3) -> tuple[Job, bool]:
+    return await job_service.enqueue_unique(
+        mock_db_session,
+        user_id=1,
+        job_in=JOB_IN,
+        data_version=data_version,
+        max_age=timedelta(hours=6),
+    )
+
+
+def test_dedup_key_depends_on_params_and_data_version() -> None:
+    key = JOB_IN.dedup_key(3)
+
+    assert key == JobCreate(kind="transactions_export", category="Food").dedup_key(3)
+    assert key != JOB_IN.dedup_key(4)
+    assert key != JobCreate(kind="transactions_export", category="Rent").dedup_key(3)
+
+
+async def test_enqueues_new_job(mock_db_session: Any, repository: Any) -> None:
+    job, created = await _enqueue(mock_db_session)
+
+    assert (job.id, created) == (8, True)
+    assert repository.create_unique.call_args.kwargs["dedup_key"] == JOB_IN.dedup_key(3)
+
+
+async def test_reuses_pending_job(mock_db_session: Any, repository: Any) -> None:
+    pending = Job(id=5, status=JobStatus.RUNNING)
+    repository.find_reusable.return_value = pending
+
+    job, created = await _enqueue(mock_db_session)
+
+    assert (job, created) == (pending, False)
+    repository.create_unique.assert_not_called()
+
+
+async def test_reuses_ready_job_while_file_exists(
+    mock_db_session: Any, repository: Any, tmp_path: Path
+) -> None:
+    path = tmp_path / "transactions-5.csv"
+    repository.find_reusable.return_value = Job(
+        id=5, status=JobStatus.SUCCEEDED, result_path=str(path)
+    )
+
+    _, created_without_file = await _enqueue(mock_db_session)
+    path.write_bytes(b"ID\n")
+    job, created = await _enqueue(mock_db_session)
+
+    assert created_without_file is True
+    assert (job.id, created) == (5, False)
+
+
+async def test_concurrent_duplicate_returns_existing_job(
+    mock_db_session: Any, repository: Any
+) -> None:
+    """Параллельный запрос успел поставить такую же задачу: INSERT ничего не вставил"""
+    pending = Job(id=5, status=JobStatus.QUEUED)
+    repository.find_reusable.side_effect = [None, pending]
+    repository.create_unique.return_value = None
+
+    job, created = await _enqueue(mock_db_session)
+
+    assert (job, created) == (pending, False)
+
+
+async def test_create_unique_inserts_on_conflict_do_nothing(mock_db_session: Any) -> None:
+    mock_db_session.execute.return_value = MagicMock()
+
+    await job_repository.create_unique(
+        mock_db_session,
+        user_id=1,
+        kind="transactions_export",
+        payload={},
+        priority=0,
+        max_attempts=3,
+        dedup_key="key",
+    )
+
+    statement = mock_db_session.execute.call_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert (
+        "ON CONFLICT (user_id, kind, dedup_key) "
+        "WHERE dedup_key IS NOT NULL AND status IN ('QUEUED', 'RUNNING') DO NOTHING"
+    ) in sql
@@ -0,0 +1,158 @@
+"""Тесты для app/modules/jobs/worker.py и захвата задач в repository.py"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.core.metrics import JOB_DURATION
+from app.modules.jobs import worker
+from app.modules.jobs.handlers import JobKindSpec, JobResult
+from app.modules.jobs.models import Job, JobStatus
+from app.modules.jobs.repository import job_repository
+from app.modules.jobs.worker import job_worker, retry_delay
+
+
+def _job(attempts: int = 1, max_attempts: int = 3) -> Job:
+    return Job(
+        id=7,
+        user_id=1,
+        kind="test",
+        payload={},
+        status=JobStatus.RUNNING,
+        attempts=attempts,
+        max_attempts=max_attempts,
+    )
+
+
+@pytest.fixture
+def session_factory(mock_db_session: AsyncMock) -> Any:
+    @asynccontextmanager
+    async def factory() -> AsyncIterator[AsyncMock]:
+        yield mock_db_session
+
+    return factory
+
+
+@pytest.fixture
+def repository(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    mock = MagicMock()
+    for name in ("complete", "fail", "release"):
+        setattr(mock, name, AsyncMock(return_value=True))
+        monkeypatch.setattr(job_repository, name, getattr(mock, name))
+    return mock
+
+
+def _register(monkeypatch: pytest.MonkeyPatch, handler: Any) -> None:
+    monkeypatch.setitem(worker.JOB_KINDS, "test", JobKindSpec(handler, priority=0))
+
+
+def test_retry_delay_is_exponential_and_capped() -> None:
+    assert retry_delay(1) == timedelta(seconds=5)
+    assert retry_delay(2) == timedelta(seconds=10)
+    assert retry_delay(20) == timedelta(seconds=300)
+
+
+async def test_success_stores_result(
+    monkeypatch: pytest.MonkeyPatch, session_factory: Any, repository: MagicMock
+) -> None:
+    _register(monkeypatch, AsyncMock(return_value=JobResult(b"png", "image/png", "chart.png")))
+    job = _job()
+
+    await job_worker.process(session_factory, job)
+
+    repository.complete.assert_awaited_once_with(
+        ANY, job, content=b"png", media_type="image/png", filename="chart.png", path=None
+    )
+    repository.fail.assert_not_called()
+
+
+async def test_failure_is_retried_with_backoff(
+    monkeypatch: pytest.MonkeyPatch, session_factory: Any, repository: MagicMock
+) -> None:
+    _register(monkeypatch, AsyncMock(side_effect=RuntimeError("connection reset")))
+    job = _job(attempts=2)
+
+    await job_worker.process(session_factory, job)
+
+    repository.fail.assert_awaited_once_with(
+        ANY, job, error="connection reset", retry_in=timedelta(seconds=10)
+    )
+
+
+@pytest.mark.parametrize(
+    ("error", "attempts"),
+    [
+        (HTTPException(404, "Группа не найдена"), 1),
+        (TypeError("unexpected keyword argument 'period'"), 1),
+        (RuntimeError("boom"), 3),
+    ],
+)
+async def test_permanent_failure(
+    monkeypatch: pytest.MonkeyPatch,
+    session_factory: Any,
+    repository: MagicMock,
+    error: Exception,
+    attempts: int,
+) -> None:
+    """Ошибка запроса (4xx) и исчерпанные попытки завершают задачу без повтора"""
+    _register(monkeypatch, AsyncMock(side_effect=error))
+
+    await job_worker.process(session_factory, _job(attempts=attempts))
+
+    assert repository.fail.call_args.kwargs["retry_in"] is None
+
+
+@pytest.mark.parametrize(
+    ("handler", "attempts", "outcome"),
+    [
+        (AsyncMock(return_value=JobResult(b"png", "image/png", "chart.png")), 1, "succeeded"),
+        (AsyncMock(side_effect=RuntimeError("connection reset")), 1, "retry"),
+        (AsyncMock(side_effect=RuntimeError("boom")), 3, "failed"),
+    ],
+)
+async def test_duration_observed_for_every_outcome(
+    monkeypatch: pytest.MonkeyPatch,
+    session_factory: Any,
+    repository: MagicMock,
+    handler: AsyncMock,
+    attempts: int,
+    outcome: str,
+) -> None:
+    _register(monkeypatch, handler)
+    duration = JOB_DURATION.labels("test", outcome)
+    count = duration.count
+
+    await job_worker.process(session_factory, _job(attempts=attempts))
+
+    assert duration.count == count + 1
+
+
+async def test_cancelled_job_is_released(
+    monkeypatch: pytest.MonkeyPatch, session_factory: Any, repository: MagicMock
+) -> None:
+    """При остановке процесса задача возвращается в очередь без учёта попытки"""
+    _register(monkeypatch, AsyncMock(side_effect=asyncio.CancelledError()))
+    job = _job()
+
+    with pytest.raises(asyncio.CancelledError):
+        await job_worker.process(session_factory, job)
+
+    repository.release.assert_awaited_once_with(ANY, job)
+    repository.fail.assert_not_called()
+
+
+async def test_claim_skips_locked_rows(mock_db_session: AsyncMock) -> None:
+    mock_db_session.execute.return_value = MagicMock()
+
+    await job_repository.claim(mock_db_session, limit=1, lease=timedelta(seconds=300))
+
+    statement = mock_db_session.execute.call_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "ORDER BY jobs.priority DESC, jobs.run_at, jobs.id" in sql
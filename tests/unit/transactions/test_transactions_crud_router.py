@@ -118,6 +118,43 @@ class TestTransactionsCRUD:
                 page_size=20,
             )
 
+    def test_list_transactions_not_modified(self, client, mock_user):
+        service_result = {"items": [], "total": 0, "page": 1, "page_size": 20, "pages": 0}
+
+        with patch(
+            "app.modules.transactions.router.transaction_service.list_transactions",
+            new_callable=AsyncMock,
+        ) as mock_list:
+            mock_list.return_value = service_result
+
+            first = client.get("/transactions")
+            etag = first.headers["etag"]
+            assert etag.startswith('W/"')
+            assert first.headers["cache-control"] == "private, no-cache"
+
+            response = client.get("/transactions", headers={"If-None-Match": etag})
+
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.content == b""
+            mock_list.assert_called_once()
+
+    def test_list_transactions_etag_changes_with_data_version(self, client, mock_user):
+        service_result = {"items": [], "total": 0, "page": 1, "page_size": 20, "pages": 0}
+
+        with patch(
+            "app.modules.transactions.router.transaction_service.list_transactions",
+            new_callable=AsyncMock,
+        ) as mock_list:
+            mock_list.return_value = service_result
+
+            etag = client.get("/transactions").headers["etag"]
+            mock_user.data_version = 1
+            response = client.get("/transactions", headers={"If-None-Match": etag})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["etag"] != etag
+            assert mock_list.call_count == 2
+
     def test_list_transactions_with_filters(self, client, mock_user):
         service_result = {"items": [], "total": 0, "page": 1, "page_size": 20, "pages": 0}
 
@@ -234,6 +271,7 @@ class TestTransactionsCRUD:
                 db=ANY,
                 transaction_id=5,
                 user_id=1,
+                for_update=True,
             )
             mock_update.assert_called_once_with(
                 db=ANY,
@@ -257,6 +295,7 @@ class TestTransactionsCRUD:
                 db=ANY,
                 transaction_id=404,
                 user_id=1,
+                for_update=True,
             )
 
     def test_delete_transaction_success(self, client, mock_user):
@@ -283,6 +322,7 @@ class TestTransactionsCRUD:
                 db=ANY,
                 transaction_id=6,
                 user_id=1,
+                for_update=True,
             )
             mock_delete.assert_called_once_with(
                 db=ANY,
@@ -303,4 +343,5 @@ class TestTransactionsCRUD:
                 db=ANY,
                 transaction_id=404,
                 user_id=1,
+                for_update=True,
             )
@@ -0,0 +1,155 @@
+"""Тесты для выгрузок транзакций: POST/GET /transactions/exports и exports.py"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.core.exceptions import ConflictException
+from app.modules.jobs.models import Job, JobStatus
+from app.modules.transactions.exports import export_path, purge_expired_exports, write_export
+
+CSV = b"ID,Title\n1,Coffee\n"
+
+
+@pytest.fixture(autouse=True)
+def spool_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "EXPORT_SPOOL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _job(**fields: Any) -> Job:
+    now = datetime.now(timezone.utc)
+    values = {
+        "id": 7,
+        "user_id": 1,
+        "kind": "transactions_export",
+        "payload": {},
+        "status": JobStatus.QUEUED,
+        "priority": 0,
+        "attempts": 0,
+        "max_attempts": 3,
+        "created_at": now,
+        "run_at": now,
+    }
+    return Job(**{**values, **fields})
+
+
+async def _ready_job() -> Job:
+    path = export_path(7)
+    await write_export(path, CSV)
+    return _job(
+        status=JobStatus.SUCCEEDED,
+        result_path=str(path),
+        result_media_type="text/csv",
+        result_filename="transactions.csv",
+    )
+
+
+class TestCreateExport:
+    """Тесты для POST /transactions/exports"""
+
+    def test_enqueues_export(self, client: Any, mock_user: Any) -> None:
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.enqueue_unique = AsyncMock(return_value=(_job(), True))
+
+            response = client.post(
+                "/transactions/exports", json={"category": "Food", "date_from": "2024-01-01"}
+            )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.headers["Location"] == "/transactions/exports/7"
+        assert "Retry-After" in response.headers
+        kwargs = mock_service.enqueue_unique.call_args.kwargs
+        assert kwargs["job_in"].kind == "transactions_export"
+        assert kwargs["job_in"].payload() == {"category": "Food", "date_from": "2024-01-01"}
+        assert kwargs["data_version"] == mock_user.data_version
+        assert kwargs["max_age"] == timedelta(hours=settings.EXPORT_TTL_HOURS)
+
+    def test_without_body(self, client: Any) -> None:
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.enqueue_unique = AsyncMock(return_value=(_job(), True))
+
+            response = client.post("/transactions/exports")
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert mock_service.enqueue_unique.call_args.kwargs["job_in"].payload() == {}
+
+    def test_ready_duplicate_returns_200(self, client: Any) -> None:
+        """Такая же выгрузка уже готова: новая задача не ставится"""
+        job = _job(status=JobStatus.SUCCEEDED)
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.enqueue_unique = AsyncMock(return_value=(job, False))
+
+            response = client.post("/transactions/exports")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Location"] == "/transactions/exports/7"
+        assert response.json()["data"]["status"] == "succeeded"
+
+
+class TestDownloadExport:
+    """Тесты для GET /transactions/exports/{export_id}"""
+
+    async def test_download_and_resume(self, client: Any) -> None:
+        job = await _ready_job()
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.get_result = AsyncMock(return_value=job)
+
+            full = client.get("/transactions/exports/7")
+            part = client.get(
+                "/transactions/exports/7",
+                headers={"Range": "bytes=9-", "If-Range": full.headers["etag"]},
+            )
+
+        assert full.status_code == status.HTTP_200_OK
+        assert full.content == CSV
+        assert full.headers["accept-ranges"] == "bytes"
+        assert "transactions.csv" in full.headers["content-disposition"]
+        assert part.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert part.content == CSV[9:]
+
+    def test_not_ready(self, client: Any) -> None:
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.get_result = AsyncMock(
+                side_effect=ConflictException(error_code="JOB_NOT_READY")
+            )
+
+            response = client.get("/transactions/exports/7")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_expired_file(self, client: Any) -> None:
+        job = _job(status=JobStatus.SUCCEEDED, result_path=str(export_path(7)))
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.get_result = AsyncMock(return_value=job)
+
+            response = client.get("/transactions/exports/7")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["error"]["code"] == "RESULT_EXPIRED"
+
+    def test_other_job_kind_not_found(self, client: Any) -> None:
+        job = _job(status=JobStatus.SUCCEEDED, kind="expenses_chart", result=b"png")
+        with patch("app.modules.transactions.router.job_service") as mock_service:
+            mock_service.get_result = AsyncMock(return_value=job)
+
+            response = client.get("/transactions/exports/7")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_purge_expired_exports(spool_dir: Path) -> None:
+    await write_export(export_path(1), CSV)
+    await write_export(export_path(2), CSV)
+    expired = time.time() - settings.EXPORT_TTL_HOURS * 3600 - 60
+    os.utime(export_path(1), (expired, expired))
+
+    assert purge_expired_exports() == 1
+    assert [path.name for path in spool_dir.iterdir()] == ["transactions-2.csv"]
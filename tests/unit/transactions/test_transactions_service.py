@@ -0,0 +1,195 @@
+"""Тесты для app/modules/transactions/service.py"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.core.exceptions import ValidationException
+from app.modules.groups.models import GroupBalance
+from app.modules.groups.schemas import GroupCreate
+from app.modules.groups.service import group_service
+from app.modules.transactions import service
+from app.modules.transactions.models import Transaction, TransactionType
+from app.modules.transactions.schemas import TransactionCreate, TransactionUpdate
+from app.modules.transactions.service import transaction_service
+from app.modules.users.models import User
+
+
+def _tx(
+    group_id: int | None = 10,
+    amount: float = 12.5,
+    tx_type: TransactionType = TransactionType.EXPENSE,
+) -> Transaction:
+    return Transaction(
+        id=1, user_id=1, title="t", amount=amount, type=tx_type, transaction_to_group=group_id
+    )
+
+
+@pytest.fixture
+def apply_deltas(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    apply = AsyncMock()
+    monkeypatch.setattr(service.group_balance_repository, "apply_deltas", apply)
+    monkeypatch.setattr(service.user_repository, "bump_data_version", AsyncMock())
+    monkeypatch.setattr(service.group_repository, "bump_data_version", AsyncMock())
+    monkeypatch.setattr(service.group_member_service, "is_member", AsyncMock(return_value=True))
+    return apply
+
+
+async def _update(db: AsyncMock, tx: Transaction, **changes: Any) -> None:
+    async def update(
+        db: AsyncMock, *, db_obj: Transaction, obj_in: TransactionUpdate
+    ) -> Transaction:
+        for field, value in obj_in.model_dump(exclude_unset=True).items():
+            setattr(db_obj, field, value)
+        return db_obj
+
+    with patch.object(service.transaction_repository, "update", side_effect=update):
+        await transaction_service.update_transaction(
+            db, db_obj=tx, transaction_in=TransactionUpdate(**changes)
+        )
+
+
+async def test_delete_subtracts_expense(
+    mock_db_session: AsyncMock, apply_deltas: AsyncMock
+) -> None:
+    with patch.object(service.transaction_repository, "delete", AsyncMock()):
+        await transaction_service.delete_transaction(mock_db_session, db_obj=_tx())
+
+    apply_deltas.assert_awaited_once_with(mock_db_session, {(10, 1): Decimal("-12.50")})
+
+
+async def test_update_amount_applies_difference(
+    mock_db_session: AsyncMock, apply_deltas: AsyncMock
+) -> None:
+    await _update(mock_db_session, _tx(), amount=20)
+
+    apply_deltas.assert_awaited_once_with(mock_db_session, {(10, 1): Decimal("7.50")})
+
+
+async def test_update_moves_expense_between_groups(
+    mock_db_session: AsyncMock, apply_deltas: AsyncMock
+) -> None:
+    await _update(mock_db_session, _tx(), transaction_to_group=20)
+
+    apply_deltas.assert_awaited_once_with(
+        mock_db_session, {(10, 1): Decimal("-12.50"), (20, 1): Decimal("12.50")}
+    )
+
+
+async def test_income_and_unchanged_expense_skip_balances(
+    mock_db_session: AsyncMock, apply_deltas: AsyncMock
+) -> None:
+    """Доходы и изменения, не затрагивающие сумму расхода, не трогают group_balances"""
+    await _update(mock_db_session, _tx(tx_type=TransactionType.INCOME), amount=30)
+    await _update(mock_db_session, _tx(), title="новое название")
+
+    apply_deltas.assert_not_awaited()
+
+
+class TestGroupFeed:
+    """Лента транзакций группы с keyset-пагинацией"""
+
+    @staticmethod
+    def _page(count: int) -> list[Transaction]:
+        created_at = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+        return [
+            Transaction(
+                id=100 - i,
+                user_id=1,
+                title="t",
+                amount=1.0,
+                type=TransactionType.EXPENSE,
+                transaction_to_group=10,
+                created_at=created_at - timedelta(minutes=i),
+            )
+            for i in range(count)
+        ]
+
+    async def test_next_cursor_continues_after_last_item(self, mock_db_session: AsyncMock) -> None:
+        list_feed = AsyncMock(return_value=self._page(3))
+        with patch.object(service.transaction_repository, "list_group_feed", list_feed):
+            page = await transaction_service.list_group_transactions(
+                mock_db_session, group_id=10, limit=2
+            )
+            assert [item.id for item in page.items] == [100, 99]
+            assert list_feed.call_args.kwargs["limit"] == 3
+
+            await transaction_service.list_group_transactions(
+                mock_db_session, group_id=10, cursor=page.next_cursor, limit=2
+            )
+
+        assert list_feed.call_args.kwargs["after"] == (
+            datetime(2026, 10, 1, 11, 59, tzinfo=timezone.utc),
+            99,
+        )
+
+    async def test_last_page_has_no_cursor(self, mock_db_session: AsyncMock) -> None:
+        with patch.object(
+            service.transaction_repository, "list_group_feed", AsyncMock(return_value=self._page(2))
+        ):
+            page = await transaction_service.list_group_transactions(
+                mock_db_session, group_id=10, limit=2
+            )
+
+        assert page.next_cursor is None
+
+    async def test_invalid_cursor(self, mock_db_session: AsyncMock) -> None:
+        with pytest.raises(ValidationException):
+            await transaction_service.list_group_transactions(
+                mock_db_session, group_id=10, cursor="not-a-cursor"
+            )
+
+
+async def test_concurrent_updates_keep_balances(pg_engine: AsyncEngine) -> None:
+    """
+    Два одновременных изменения одной транзакции (PostgreSQL, TEST_DATABASE_URL):
+    второе ждёт блокировку строки, и group_balances совпадает с суммой транзакций.
+    """
+    session_factory = async_sessionmaker(pg_engine, expire_on_commit=False)
+    async with session_factory() as db:
+        user = User(username="alice", email="alice@example.com", hashed_password="hash")
+        db.add(user)
+        await db.flush()
+        user_id = int(user.id)
+        group = await group_service.create_group_service(
+            db, GroupCreate(name="Семья"), owner_id=user_id
+        )
+        tx = await transaction_service.create_transaction(
+            db,
+            user_id=user_id,
+            transaction_in=TransactionCreate(
+                title="t", amount=10, type=TransactionType.EXPENSE, transaction_to_group=group.id
+            ),
+        )
+        await db.commit()
+
+    async def update(amount: float) -> None:
+        async with session_factory() as db:
+            locked = await transaction_service.get_transaction(
+                db, transaction_id=int(tx.id), user_id=user_id, for_update=True
+            )
+            assert locked is not None
+            # Оба запроса прочитали бы старую сумму, если бы строка не блокировалась
+            await asyncio.sleep(0.1)
+            await transaction_service.update_transaction(
+                db, db_obj=locked, transaction_in=TransactionUpdate(amount=amount)
+            )
+            await db.commit()
+
+    await asyncio.gather(update(20), update(35))
+
+    async with session_factory() as db:
+        paid = await db.scalar(
+            select(GroupBalance.paid).where(
+                GroupBalance.group_id == group.id, GroupBalance.user_id == user_id
+            )
+        )
+        amount = await db.scalar(select(Transaction.amount).where(Transaction.id == tx.id))
+    assert amount in (20, 35)
+    assert paid == Decimal(str(amount))